@@ -61,6 +61,11 @@ class Error(namedtuple('Error', ['severity', 'message'])):
     def __eq__(self, other):
         return repr(self) == repr(other)
 
+    def __reduce__(self):
+        # The message is already cleaned: do not clean it again when this
+        # Error is unpickled (such as when returned from a worker process)
+        return tuple.__new__, (Error, tuple(self))
+
     def _get_values(self):
         sev = severities[self.severity]
         msg = self._clean_string(repr(self.message))
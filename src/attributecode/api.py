@@ -15,7 +15,8 @@
 # ============================================================================
 
 import json
-from requests import get
+
+from requests.exceptions import RequestException
 
 from urllib.parse import quote
 from urllib.parse import urlencode
@@ -23,11 +24,16 @@ from urllib.error import HTTPError
 
 from attributecode import ERROR
 from attributecode import Error
+from attributecode.fetch import get
+from attributecode.fetch import get_fetcher
 
 """
 API call helpers
 """
 
+# maximum number of license keys requested in a single bulk API request
+BULK_SIZE = 100
+
 
 # FIXME: args should start with license_key
 def request_license_data(api_url, api_key, license_key):
@@ -55,12 +61,24 @@ def request_license_data(api_url, api_key, license_key):
     errors = []
     try:
         response = get(quoted_url, headers=headers)
+        if response.status_code >= 500:
+            # a server error that persisted after retries
+            msg = (u"Server error %d while fetching license: %s" %
+                   (response.status_code, license_key))
+            errors.append(Error(ERROR, msg))
+            return {}, errors
         response_content = response.text
         # FIXME: this should be an ordered dict
         license_data = json.loads(response_content)
         if not license_data.get('results', []):
             msg = u"Invalid 'license': %s" % license_key
             errors.append(Error(ERROR, msg))
+    except RequestException as e:
+        # a network error that persisted after retries: the error message is
+        # not reported as it contains the URL with the API key
+        msg = (u"An error occurred while fetching license: %s: %s" %
+               (license_key, e.__class__.__name__))
+        errors.append(Error(ERROR, msg))
     except HTTPError as http_e:
         msg = (u"Authorization denied. Invalid '--api_key'. "
                u"License generation is skipped.")
@@ -92,3 +110,69 @@ def get_license_details_from_api(api_url, api_key, license_key):
     """
     license_data, errors = request_license_data(api_url, api_key, license_key)
     return license_data, errors
+
+
+def request_licenses_data(api_url, api_key, license_keys):
+    """
+    Return a dictionary of {license key: license data} for the `license_keys`
+    found with bulk requests to `api_url` authenticating with `api_key`.
+    Each request filters on up to BULK_SIZE keys and the paginated results
+    are followed.
+
+    Errors are not reported: the keys that are not returned should be
+    requested one at a time with `request_license_data`.
+    """
+    license_keys = list(dict.fromkeys(license_keys))
+    chunks = [
+        license_keys[i:i + BULK_SIZE]
+        for i in range(0, len(license_keys), BULK_SIZE)
+    ]
+
+    def request_chunk(keys):
+        return request_licenses_chunk(api_url, api_key, keys)
+
+    licenses_data = {}
+    for chunk_data in get_fetcher().map(request_chunk, chunks):
+        licenses_data.update(chunk_data)
+    return licenses_data
+
+
+def request_licenses_chunk(api_url, api_key, license_keys):
+    """
+    Return a dictionary of {license key: license data} for the `license_keys`
+    found with a single filtered and paginated query.
+    """
+    headers = {
+        'Authorization': 'Token %s' % api_key,
+    }
+    payload = [
+        ('api_key', api_key),
+        ('format', 'json'),
+        ('page_size', len(license_keys)),
+    ]
+    payload.extend(('key', key) for key in license_keys)
+
+    api_url = api_url.rstrip('/')
+    payload = urlencode(payload)
+
+    next_url = '%(api_url)s/?%(payload)s' % locals()
+    keys = set(license_keys)
+    licenses_data = {}
+    try:
+        while next_url:
+            # handle special characters in URL such as space etc.
+            quoted_url = quote(next_url, safe="%/:=&?~#+!$,;'@()*[]")
+            response = get(quoted_url, headers=headers)
+            data = json.loads(response.text)
+            for license_data in data.get('results', []):
+                key = license_data.get('key')
+                if key in keys:
+                    licenses_data[key] = license_data
+            if data.get('count', 0) > len(keys):
+                # the multi-key filter is not supported: do not page through
+                # the whole license library
+                break
+            next_url = data.get('next')
+    except Exception:
+        pass
+    return licenses_data
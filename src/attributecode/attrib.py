@@ -16,6 +16,11 @@
 
 import datetime
 import os
+import pickle
+import uuid
+from collections import namedtuple
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
 
 import jinja2
 
@@ -25,9 +30,11 @@ from attributecode import ERROR
 from attributecode import Error
 from attributecode.licenses import COMMON_LICENSES
 from attributecode.model import parse_license_expression
-from attributecode.model import License, StringField
+from attributecode.model import FileTexts
+from attributecode.model import License, LicenseRegistry, StringField
 from attributecode.util import add_unc
-from attributecode.attrib_util import multi_sort
+from attributecode.attrib_util import get_environment
+from attributecode.attrib_util import load_template
 
 DEFAULT_TEMPLATE_FILE = os.path.join(
     os.path.dirname(os.path.realpath(__file__)), 'templates', 'default_html.template')
@@ -35,69 +42,90 @@ DEFAULT_TEMPLATE_FILE = os.path.join(
 DEFAULT_TEMPLATE_SCANCODE_FILE = os.path.join(
     os.path.dirname(os.path.realpath(__file__)), 'templates', 'scancode_html.template')
 
+DEFAULT_PAGE_TEMPLATE_FILE = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), 'templates', 'default_html_page.template')
+
+DEFAULT_INDEX_TEMPLATE_FILE = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), 'templates', 'default_html_index.template')
+
+DEFAULT_LICENSES_TEMPLATE_FILE = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), 'templates', 'default_html_licenses.template')
+
 DEFAULT_LICENSE_SCORE = 100
 
+# estimated size in bytes of the markup of a component in an attribution page
+COMPONENT_MARKUP_SIZE = 1000
+
+# number of rendered chunks buffered before a write when saving an attribution
+STREAM_BUFFER_SIZE = 100
+
 
 def generate(abouts, is_about_input, license_dict, scancode, min_license_score, template=None, vartext=None):
     """
     Generate an attribution text from an `abouts` list of About objects, a
-    `template` template text and a `vartext` optional dict of extra
-    variables.
+    `template` template text or compiled Template and a `vartext` optional
+    dict of extra variables.
 
     Return a tuple of (error, attribution text) where error is an Error object
     or None and attribution text is the generated text or None.
     """
-    rendered = None
     errors = []
-    template_error = check_template(template)
-    if template_error:
-        lineno, message = template_error
-        error = Error(
-            CRITICAL,
-            'Template validation error at line: {lineno}: "{message}"'.format(
-                **locals())
-        )
-        errors.append(error)
-        return error, None
+    if not isinstance(template, jinja2.Template):
+        error, template = compile_template(template_text=template)
+        if error:
+            errors.append(error)
+            return error, None
+
+    context_errors, context = get_template_context(
+        abouts, is_about_input, license_dict, scancode, min_license_score, vartext)
+    errors.extend(context_errors)
+    rendered = template.render(**context)
+    return errors, rendered
+
 
-    template = jinja2.Template(template)
+def get_template_context(abouts, is_about_input, license_dict, scancode, min_license_score, vartext=None):
+    """
+    Return a tuple of (list of errors, mapping of the variables available to an
+    attribution template) for an `abouts` list of About objects and a
+    `vartext` optional dict of extra variables.
+
+    The template variables are:
+    - abouts: the About objects sorted by name.
+    - licenses_list: the License objects sorted by key.
+    - licenses_by_key: a LicenseRegistry mapping of {license key: License}.
+    - common_licenses: the keys of the common licenses.
+    - utcnow, tkversion and vartext.
+    """
+    errors = []
     # Get the current UTC time
     utcnow = datetime.datetime.utcnow()
 
-    licenses_list = []
-    lic_name_expression_list = []
+    registry = LicenseRegistry()
     if is_about_input:
         for about in abouts:
             # about.license_file.value is a OrderDict with license_file_name as
             # the key and the license text as the value
-            index = 0
-            for lic_name in about.license_name.value:
+            for index, lic_name in enumerate(about.license_name.value):
                 if about.license_key.value:
                     key = about.license_key.value[index]
                 else:
                     key = lic_name
-                captured = False
-                for lic in licenses_list:
-                    if key in lic.key:
-                        captured = True
-                        break
-                if not captured or not licenses_list:
-                    name = lic_name
-                    if about.license_file.value.keys():
-                        filename = list(about.license_file.value.keys())[index]
-                        text = list(about.license_file.value.values())[index]
-                    else:
-                        error = Error(
-                            CRITICAL, 'No license file found for ' + name)
-                        errors.append(error)
-                        break
-                    if about.license_url.value:
-                        url = about.license_url.value[index]
-                    else:
-                        url = ''
-                    license_object = License(key, name, filename, url, text)
-                    licenses_list.append(license_object)
-                index = index + 1
+                if key in registry:
+                    continue
+                name = lic_name
+                if about.license_file.value.keys():
+                    filename = list(about.license_file.value.keys())[index]
+                    text = list(about.license_file.value.values())[index]
+                else:
+                    error = Error(
+                        CRITICAL, 'No license file found for ' + name)
+                    errors.append(error)
+                    break
+                if about.license_url.value:
+                    url = about.license_url.value[index]
+                else:
+                    url = ''
+                registry.add(License(key, name, filename, url, text))
     else:
         # Create license object
         for key in license_dict:
@@ -105,8 +133,7 @@ def generate(abouts, is_about_input, license_dict, scancode, min_license_score,
             filename = license_dict[key][1]
             text = license_dict[key][2]
             url = license_dict[key][3]
-            license_object = License(key, name, filename, url, text)
-            licenses_list.append(license_object)
+            registry.add(License(key, name, filename, url, text))
 
     # We need special treatment for scancode input.
     # Each about_object may have duplicated license key and same/different license score
@@ -116,31 +143,13 @@ def generate(abouts, is_about_input, license_dict, scancode, min_license_score,
         abouts, meet_score_licenses_list = generate_sctk_input(
             abouts, min_license_score, license_dict)
         # Remove the license object
-        remove_list = []
-        for lic in licenses_list:
-            if lic.key not in meet_score_licenses_list:
-                remove_list.append(lic)
-
-        for lic in remove_list:
-            licenses_list.remove(lic)
+        registry.keep(set(meet_score_licenses_list))
 
     for about in abouts:
-        # Create a license expression with license name
-        lic_name_expression = ''
-        lic_name_expression_list = []
         if about.license_expression.value:
-            for segment in about.license_expression.value.split():
-                not_lic = True
-                for lic in licenses_list:
-                    if segment == lic.key:
-                        lic_name_expression_list.append(lic.name)
-                        not_lic = False
-                        break
-                if not_lic:
-                    lic_name_expression_list.append(segment)
-            # Join the license name expression into a single string
-            lic_name_expression = ' '.join(lic_name_expression_list)
-
+            # Create a license expression with license name
+            lic_name_expression = registry.get_name_expression(
+                about.license_expression.value)
             # Add the license name expression string into the about object as a custom field
             custom_field = StringField(
                 name='license_name_expression', value=lic_name_expression, present=True)
@@ -149,107 +158,172 @@ def generate(abouts, is_about_input, license_dict, scancode, min_license_score,
     # Sort the about objects by name
     abouts = sorted(abouts, key=lambda x: x.name.value.lower())
 
-    # Sort the license object by key
-    licenses_list = sorted(licenses_list, key=lambda x: x.key)
-
-    rendered = template.render(
+    context = dict(
         abouts=abouts,
         common_licenses=COMMON_LICENSES,
-        licenses_list=licenses_list,
+        # Sort the license object by key
+        licenses_list=registry.sorted(),
+        licenses_by_key=registry,
         utcnow=utcnow,
         tkversion=__version__,
         vartext=vartext
     )
+    context.update(get_groupings(abouts))
+    return errors, context
 
-    return errors, rendered
+
+def get_license_keys(about):
+    """
+    Return a list of the unique license keys of an `about` About object. The
+    license keys of ScanCode input are lists of keys.
+    """
+    keys = {}
+    for key in about.license_key.value or []:
+        if isinstance(key, list):
+            keys.update(dict.fromkeys(key))
+        else:
+            keys[key] = None
+    return list(keys)
 
 
-def generate_sctk_input(abouts, min_license_score, license_dict):
-    meet_score_licenses_list = []
+def get_copyrights(about):
+    """
+    Return a list of the copyright statements of an `about` About object from
+    its copyright field or the copyrights of ScanCode input.
+    """
+    copyrights = []
+    if about.copyright.value:
+        copyrights.append(about.copyright.value)
+    scanned = getattr(about, 'copyrights', None)
+    if scanned and isinstance(scanned.value, list):
+        for copyright in scanned.value:
+            if isinstance(copyright, dict):
+                copyright = copyright.get('copyright')
+            if copyright:
+                copyrights.append(copyright)
+    return copyrights
+
+
+def group_by(abouts, get_values):
+    """
+    Return a mapping of {value: list of abouts} sorted by value ignoring case,
+    where `get_values` returns the list of the values of an About object.
+    """
+    groups = {}
     for about in abouts:
-        # We will use a dictionary to keep the unique license key
-        # which the dictionary key is the license key and the dictionary value
-        # is (lic_score, lic_name)
-        if about.license_key.value:
-            updated_dict = {}
-            lic_key = about.license_key.value
-            lic_name = []
-            if about.license_name.value:
-                lic_name = about.license_name.value
-            else:
-                lic_name = []
-                for key_list in lic_key:
-                    lic_name_list = []
-                    for k in key_list:
-                        try:
-                            lic_name_list.append(license_dict[k][0])
-                        except:
-                            lic_name_list.append(k)
-                    lic_name.append(lic_name_list)
-                about.license_name.value = lic_name
-
-            if not lic_name:
-                lic_name = []
-                for key in lic_key:
-                    lic_name.append(license_dict[key][0])
-            lic_score = about.license_score.value
-            assert len(lic_key) == len(lic_name)
-            assert len(lic_key) == len(lic_score)
-
-            lic_key_expression = about.license_key_expression.value
-            if lic_key_expression:
-                updated_lic_key_expression = []
-                removed_index = []
-                for index, key in enumerate(lic_key_expression):
-                    if key in updated_dict:
-                        previous_score, _name = updated_dict[key]
-                        current_score = lic_score[index]
-                        if current_score > previous_score:
-                            updated_dict[key] = (
-                                lic_score[index], lic_name[index])
-                        # Track the duplicated index
-                        removed_index.append(index)
-                    else:
-                        updated_dict[key] = (
-                            lic_score[index], lic_name[index])
-                        updated_lic_key_expression.append(key)
-                # Remove the duplication
-                for index, key in enumerate(about.license_key.value):
-                    if index in removed_index:
-                        del about.license_key.value[index]
-                        del about.license_name.value[index]
-                        del about.license_score.value[index]
-
-            lic_key_expression = updated_lic_key_expression
-            updated_lic_key = []
-            updated_lic_name = []
-            updated_lic_score = []
-            for index, lic in enumerate(updated_dict):
-                _sp_char, lic_keys, _invalid_lic_exp = parse_license_expression(
-                    lic)
-                score, name = updated_dict[lic]
-                if score >= min_license_score:
-                    for lic_key in lic_keys:
-                        if not lic_key in meet_score_licenses_list:
-                            meet_score_licenses_list.append(lic_key)
-
-                updated_lic_key.append(lic_keys)
-                updated_lic_name.append(name)
-                updated_lic_score.append(score)
-
-            # Remove items that don't meet to score
-            for index, score in enumerate(updated_lic_score):
-                if score < min_license_score:
-                    del updated_lic_key[index]
-                    del updated_lic_name[index]
-                    del updated_lic_score[index]
-                    del lic_key_expression[index]
-
-            about.license_key.value = updated_lic_key
-            about.license_name.value = updated_lic_name
-            about.license_score.value = updated_lic_score
-            about.license_key_expression.value = lic_key_expression
-    return abouts, meet_score_licenses_list
+        for value in get_values(about):
+            groups.setdefault(value, []).append(about)
+    return dict(sorted(groups.items(), key=lambda item: (item[0].lower(), item[0])))
+
+
+def get_groupings(abouts):
+    """
+    Return a mapping of the groupings of an `abouts` list of About objects
+    available to the attribution templates, computed once before rendering.
+    The abouts without a value are not grouped:
+    - abouts_by_license_key: {license key: list of abouts}
+    - abouts_by_owner: {owner: list of abouts}
+    - abouts_by_license_expression: {license expression: list of abouts}
+    - unique_copyrights: the list of unique copyright statements
+    """
+    unique_copyrights = {}
+    for about in abouts:
+        unique_copyrights.update(dict.fromkeys(get_copyrights(about)))
+
+    return dict(
+        abouts_by_license_key=group_by(abouts, get_license_keys),
+        abouts_by_owner=group_by(
+            abouts, lambda a: [a.owner.value] if a.owner.value else []),
+        abouts_by_license_expression=group_by(
+            abouts,
+            lambda a: [a.license_expression.value] if a.license_expression.value else []),
+        unique_copyrights=list(unique_copyrights),
+    )
+
+
+def get_sctk_detections(abouts, license_dict):
+    """
+    Return a tuple of columns of the same length for the license detections
+    of the scancode `abouts`: (about indexes, license key expressions, license
+    scores, license names). Set the license names of the abouts from the
+    `license_dict` if they are missing.
+    """
+    about_indexes = []
+    expressions = []
+    scores = []
+    names = []
+    for about_index, about in enumerate(abouts):
+        lic_key = about.license_key.value
+        if not lic_key:
+            continue
+        lic_name = about.license_name.value
+        if not lic_name:
+            lic_name = [
+                [license_dict[key][0] if key in license_dict else key for key in key_list]
+                for key_list in lic_key
+            ]
+            about.license_name.value = lic_name
+        lic_score = about.license_score.value
+        assert len(lic_key) == len(lic_name)
+        assert len(lic_key) == len(lic_score)
+
+        lic_key_expression = about.license_key_expression.value or []
+        about_indexes.extend([about_index] * len(lic_key_expression))
+        expressions.extend(lic_key_expression)
+        scores.extend(lic_score[:len(lic_key_expression)])
+        names.extend(lic_name[:len(lic_key_expression)])
+    return about_indexes, expressions, scores, names
+
+
+def generate_sctk_input(abouts, min_license_score, license_dict):
+    """
+    Update the license fields of the scancode `abouts` to keep each license key
+    expression once with its highest score, and only if this score is greater
+    than or equal to `min_license_score`.
+
+    Return a tuple of (abouts, list of the license keys that meet the
+    `min_license_score`).
+    """
+    about_indexes, expressions, scores, names = get_sctk_detections(
+        abouts, license_dict)
+
+    # mapping of {(about index, license key expression): row of the highest
+    # score} in the order of first occurrence
+    best_rows = {}
+    for row, detection in enumerate(zip(about_indexes, expressions)):
+        best_row = best_rows.get(detection)
+        if best_row is None or scores[row] > scores[best_row]:
+            best_rows[detection] = row
+
+    # mapping of {about index: (keys, names, scores, expressions)}
+    updated = {
+        about_index: ([], [], [], [])
+        for about_index, about in enumerate(abouts)
+        if about.license_key.value
+    }
+    # ordered set of the license keys that meet the score
+    meet_score_licenses = {}
+    for (about_index, expression), row in best_rows.items():
+        score = scores[row]
+        if score < min_license_score:
+            continue
+        _sp_char, lic_keys, _invalid_lic_exp = parse_license_expression(
+            expression)
+        meet_score_licenses.update(dict.fromkeys(lic_keys))
+
+        updated_keys, updated_names, updated_scores, updated_expressions = updated[about_index]
+        updated_keys.append(lic_keys)
+        updated_names.append(names[row])
+        updated_scores.append(score)
+        updated_expressions.append(expression)
+
+    for about_index, (lic_keys, lic_names, lic_scores, lic_expressions) in updated.items():
+        about = abouts[about_index]
+        about.license_key.value = lic_keys
+        about.license_name.value = lic_names
+        about.license_score.value = lic_scores
+        about.license_key_expression.value = lic_expressions
+    return abouts, list(meet_score_licenses)
 
 
 def get_license_file_key(license_text_name):
@@ -261,18 +335,44 @@ def get_license_file_key(license_text_name):
         return license_text_name
 
 
-def check_template(template_string):
+def check_template(template_string=None, template_loc=None):
     """
-    Check the syntax of a template. Return an error tuple (line number,
-    message) if the template is invalid or None if it is valid.
+    Check the syntax of a template text or of the template file at
+    `template_loc`. Return an error tuple (line number, message) if the
+    template is invalid or None if it is valid.
     """
     try:
-        jinja2.filters.FILTERS['multi_sort'] = multi_sort
-        jinja2.Template(template_string)
+        if template_loc:
+            load_template(template_loc)
+        else:
+            get_environment().from_string(template_string)
     except (jinja2.TemplateSyntaxError, jinja2.TemplateAssertionError) as e:
         return e.lineno, e.message
 
 
+def compile_template(template_text=None, template_loc=None):
+    """
+    Return a tuple of (error, template) where error is an Error object or None
+    and template is the Template compiled from a `template_text` or loaded
+    from the template file at `template_loc`, or None.
+    """
+    try:
+        if template_loc:
+            template = load_template(template_loc)
+        else:
+            template = get_environment().from_string(template_text)
+    except (jinja2.TemplateSyntaxError, jinja2.TemplateAssertionError) as e:
+        lineno = e.lineno
+        message = e.message
+        error = Error(
+            CRITICAL,
+            'Template validation error at line: {lineno}: "{message}"'.format(
+                **locals())
+        )
+        return error, None
+    return None, template
+
+
 def generate_from_file(abouts, is_about_input, license_dict, scancode, min_license_score, template_loc=None, vartext=None):
     """
     Generate an attribution text from an `abouts` list of About objects, a
@@ -282,25 +382,183 @@ def generate_from_file(abouts, is_about_input, license_dict, scancode, min_licen
     Return a tuple of (error, attribution text) where error is an Error object
     or None and attribution text is the generated text or None.
     """
+    template_loc = get_template_location(template_loc, scancode)
+    error, template = compile_template(template_loc=template_loc)
+    if error:
+        return error, None
+    return generate(abouts, is_about_input, license_dict, scancode, min_license_score, template=template, vartext=vartext)
+
+
+def get_template_location(template_loc=None, scancode=False):
+    """
+    Return the location of the `template_loc` template file or of the default
+    template.
+    """
     if not template_loc:
         if scancode:
-            template_loc = add_unc(DEFAULT_TEMPLATE_SCANCODE_FILE)
+            template_loc = DEFAULT_TEMPLATE_SCANCODE_FILE
         else:
-            template_loc = add_unc(DEFAULT_TEMPLATE_FILE)
-    else:
-        template_loc = add_unc(template_loc)
-    with open(template_loc, encoding='utf-8', errors='replace') as tplf:
-        tpls = tplf.read()
-    return generate(abouts, is_about_input, license_dict, scancode, min_license_score, template=tpls, vartext=vartext)
+            template_loc = DEFAULT_TEMPLATE_FILE
+    return add_unc(template_loc)
 
 
-def generate_and_save(abouts, is_about_input, license_dict, output_location, scancode=False, min_license_score=0, template_loc=None, vartext=None):
+def save_stream(stream, output_location):
+    """
+    Write the rendered chunks of a jinja2 TemplateStream `stream` to the
+    `output_location` file. The file is only replaced once it is complete and
+    is not written if the rendered text is empty. Return True if the file was
+    written.
+    """
+    stream.enable_buffering(STREAM_BUFFER_SIZE)
+    output_dir, output_name = os.path.split(output_location)
+    # a new file created with the same permissions as a plain open()
+    temp_location = os.path.join(
+        output_dir, '.{}.{}.tmp'.format(output_name, uuid.uuid4().hex))
+    try:
+        with open(temp_location, 'x', encoding='utf-8', errors='replace') as of:
+            stream.dump(of)
+            empty = not of.tell()
+        if empty:
+            os.remove(temp_location)
+            return False
+        os.replace(temp_location, output_location)
+        return True
+    except BaseException:
+        if os.path.exists(temp_location):
+            os.remove(temp_location)
+        raise
+
+
+class AttributionPage(namedtuple('AttributionPage', ['number', 'filename', 'start', 'abouts'])):
+    """
+    A page of a paginated attribution: the page `number` starting at 1, the
+    `filename` of the page, the index of its first component in the whole
+    attribution and its list of `abouts` About objects.
+    """
+
+
+def get_about_size(about):
+    """
+    Return the estimated size in bytes of an `about` About object rendered in
+    an attribution page: the size of its texts and of their markup. The
+    license texts of its license keys are not included as they are rendered
+    once in the licenses page.
+    """
+    texts = [about.name.value, about.version.value, about.license_expression.value]
+    texts.extend(get_copyrights(about))
+    if about.notice_file.value:
+        texts.extend(about.notice_file.value.values())
+    if not about.license_key.value and about.license_file.value:
+        texts.extend(about.license_file.value.values())
+    size = COMPONENT_MARKUP_SIZE
+    for text in texts:
+        if text and isinstance(text, str):
+            size += len(text.encode('utf-8'))
+    return size
+
+
+def paginate(abouts, max_components=0, max_bytes=0):
+    """
+    Yield lists of About objects from an `abouts` list, each with at most
+    `max_components` About objects and an estimated size of at most
+    `max_bytes`. A zero limit means no limit. An About object larger than
+    `max_bytes` is alone in its list.
+    """
+    page = []
+    size = 0
+    for about in abouts:
+        about_size = get_about_size(about) if max_bytes else 0
+        if page and ((max_components and len(page) >= max_components)
+                     or (max_bytes and size + about_size > max_bytes)):
+            yield page
+            page = []
+            size = 0
+        page.append(about)
+        size += about_size
+    if page:
+        yield page
+
+
+def get_page_outputs(context, page_template, output_location, scancode=False, page_size=0, page_max_bytes=0):
+    """
+    Return a tuple of (list of Error objects, list of (template, output
+    location, template context) tuples) for a paginated attribution of the
+    abouts of a template `context`.
+
+    The `output_location` is the index page with the table of contents. The
+    components are split in pages of at most `page_size` components and of
+    about `page_max_bytes` rendered with the `page_template` Template, and
+    saved next to the index page as <name>-<number><extension>. The license
+    texts are rendered once for all the pages in the <name>-licenses<extension>
+    page.
+    """
+    outputs = []
+    templates = []
+    for template_loc in (DEFAULT_INDEX_TEMPLATE_FILE, DEFAULT_LICENSES_TEMPLATE_FILE):
+        error, template = compile_template(template_loc=template_loc)
+        if error:
+            return [error], outputs
+        templates.append(template)
+    index_template, licenses_template = templates
+
+    abouts = context['abouts']
+    if scancode:
+        # only the scancode files with a license are attributed
+        abouts = [about for about in abouts if about.license_key.value]
+
+    base, extension = os.path.splitext(output_location)
+    pages = []
+    start = 0
+    for number, page_abouts in enumerate(paginate(abouts, page_size, page_max_bytes), 1):
+        filename = '{}-{}{}'.format(os.path.basename(base), number, extension)
+        pages.append(AttributionPage(number, filename, start, page_abouts))
+        start += len(page_abouts)
+
+    licenses_location = base + '-licenses' + extension
+    shared_context = dict(
+        context,
+        pages=pages,
+        index_page=os.path.basename(output_location),
+        licenses_page=os.path.basename(licenses_location),
+    )
+    outputs.append((index_template, output_location, shared_context))
+    outputs.append((licenses_template, licenses_location, shared_context))
+    output_dir = os.path.dirname(output_location)
+    for page in pages:
+        page_context = dict(shared_context, page=page, abouts=page.abouts)
+        outputs.append(
+            (page_template, os.path.join(output_dir, page.filename), page_context))
+    return [], outputs
+
+
+def generate_and_save(abouts, is_about_input, license_dict, output_location, scancode=False, min_license_score=0, template_loc=None, vartext=None, stream=False,
+                      renders=(), workers=1, page_size=0, page_max_bytes=0, context_location=None):
     """
     Generate an attribution text from an `abouts` list of About objects, a
     `template_loc` template file location and a `vartext` optional
     dict of extra variables. Save the generated attribution text in the
-    `output_location` file.
-    Return a list of Error objects if any.
+    `output_location` file, unless the generated text is empty. If `stream`
+    is True, the text is written to the file as it is rendered rather than
+    rendered at once in memory.
+
+    Also save an attribution for each of the `renders` list of (template
+    location, output location) tuples. The template context is built once
+    for all the outputs that are rendered with up to `workers` threads.
+
+    If `page_size` or `page_max_bytes` is set, save a paginated attribution
+    instead: `output_location` is an index page that links to pages of at
+    most `page_size` components or of about `page_max_bytes` each and to a
+    page with the license texts. Each page is rendered and saved on its own
+    and the `template_loc` template, if any, is used for the pages of
+    components. A paginated attribution is always streamed.
+
+    If `context_location` is set, also save the template context to this file
+    to generate attributions again with render_and_save().
+
+    Return a tuple of (list of Error objects, rendered) where rendered is the
+    attribution text, or None if the attribution cannot be generated. If the
+    attribution is streamed, rendered is the `output_location` instead, or an
+    empty string if the generated text is empty.
     """
     errors = []
     # Parse license_expression and save to the license list
@@ -318,22 +576,153 @@ def generate_and_save(abouts, is_about_input, license_dict, output_location, sca
                        str(invalid_lic_exp))
             errors.append(Error(ERROR, msg))
 
-    rendering_error, rendered = generate_from_file(
-        abouts,
-        is_about_input,
-        license_dict,
-        scancode=scancode,
-        min_license_score=min_license_score,
-        template_loc=template_loc,
-        vartext=vartext,
-    )
-
+    paginated = bool(page_size or page_max_bytes)
+    rendering_error, outputs = get_outputs(
+        output_location, scancode, template_loc, renders, paginated)
     if rendering_error:
         errors.append(rendering_error)
+        return errors, None
 
-    if rendered:
-        output_location = add_unc(output_location)
-        with open(output_location, 'w', encoding='utf-8', errors='replace') as of:
-            of.write(rendered)
+    context_errors, context = get_template_context(
+        abouts, is_about_input, license_dict, scancode, min_license_score, vartext)
+    errors.extend(context_errors)
+    if context_location:
+        save_context(context_location, context, scancode, errors)
 
+    save_errors, rendered = save_outputs(
+        outputs, context, scancode, stream, workers, page_size, page_max_bytes)
+    errors.extend(save_errors)
     return errors, rendered
+
+
+def render_and_save(context, output_location, scancode=False, template_loc=None, stream=False,
+                    renders=(), workers=1, page_size=0, page_max_bytes=0):
+    """
+    Generate and save attributions from a template `context` such as loaded
+    with load_context(). The other arguments are the same as for
+    generate_and_save().
+
+    Return a tuple of (list of Error objects, rendered) as generate_and_save().
+    """
+    paginated = bool(page_size or page_max_bytes)
+    rendering_error, outputs = get_outputs(
+        output_location, scancode, template_loc, renders, paginated)
+    if rendering_error:
+        return [rendering_error], None
+    return save_outputs(
+        outputs, context, scancode, stream, workers, page_size, page_max_bytes)
+
+
+def get_outputs(output_location, scancode=False, template_loc=None, renders=(), paginated=False):
+    """
+    Return a tuple of (error, outputs) where error is an Error object or None
+    and outputs is a list of (Template, output location) tuples with the
+    attribution at `output_location` first, followed by the `renders` list of
+    (template location, output location) tuples.
+    """
+    if paginated and not template_loc:
+        template_loc = DEFAULT_PAGE_TEMPLATE_FILE
+
+    outputs = []
+    for tpl_loc, out_loc in [(template_loc, output_location)] + list(renders):
+        tpl_loc = get_template_location(tpl_loc, scancode)
+        error, template = compile_template(template_loc=tpl_loc)
+        if error:
+            return error, None
+        outputs.append((template, add_unc(out_loc)))
+    return None, outputs
+
+
+def save_outputs(outputs, context, scancode=False, stream=False, workers=1, page_size=0, page_max_bytes=0):
+    """
+    Render and save an `outputs` list of (Template, output location) tuples
+    from get_outputs() with a template `context`. The other arguments are the
+    same as for generate_and_save().
+
+    Return a tuple of (list of Error objects, rendered) as generate_and_save().
+    """
+    (template, output_location), others = outputs[0], outputs[1:]
+    others = [(tpl, location, context) for tpl, location in others]
+    # True if the main output is streamed as the first of the others
+    stream_main = False
+    if page_size or page_max_bytes:
+        page_errors, page_outputs = get_page_outputs(
+            context, template, output_location, scancode, page_size, page_max_bytes)
+        if page_errors:
+            return page_errors, None
+        rendered = output_location
+        others = page_outputs + others
+    elif stream:
+        stream_main = True
+        others = [(template, output_location, context)] + others
+    else:
+        rendered = template.render(**context)
+        if rendered:
+            with open(output_location, 'w', encoding='utf-8', errors='replace') as of:
+                of.write(rendered)
+
+    def save(output):
+        template, location, template_context = output
+        return save_stream(template.stream(**template_context), location)
+
+    if workers > 1 and len(others) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            saved = list(executor.map(save, others))
+    else:
+        saved = [save(output) for output in others]
+
+    if stream_main:
+        rendered = output_location if saved[0] else ''
+    return [], rendered
+
+
+def save_context(location, context, scancode=False, errors=()):
+    """
+    Save a template `context` and the `errors` list of Error objects reported
+    when it was built to the file at `location`, to generate attributions
+    again from this context with load_context() and render_and_save()
+    without loading and processing the inventory again.
+
+    The texts of the license and notice files of the abouts are read and
+    saved in the context such that it does not depend on these files.
+    """
+    for about in context.get('abouts') or []:
+        for field in chain(about.fields.values(), about.custom_fields.values()):
+            if isinstance(field.value, FileTexts):
+                field.value.load()
+
+    snapshot = dict(
+        version=__version__,
+        scancode=scancode,
+        errors=list(errors),
+        context=context,
+    )
+    with open(add_unc(location), 'wb') as of:
+        pickle.dump(snapshot, of, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_context(location):
+    """
+    Return a tuple of (list of Error objects, scancode, template context) loaded
+    from a context file at `location` saved with save_context(), or a tuple of
+    ([CRITICAL Error], False, None) if the context cannot be loaded.
+
+    Note: a context file is a pickle and must only be loaded from trusted
+    locations.
+    """
+    try:
+        with open(add_unc(location), 'rb') as cf:
+            snapshot = pickle.load(cf)
+    except Exception as e:
+        msg = 'Cannot load the attribution context from: {}: {}'.format(location, e)
+        return [Error(CRITICAL, msg)], False, None
+
+    if not isinstance(snapshot, dict) or snapshot.get('version') != __version__:
+        msg = ('The attribution context at: {} was not saved by this version '
+               'of the tool and must be saved again.').format(location)
+        return [Error(CRITICAL, msg)], False, None
+
+    context = snapshot['context']
+    # the attribution is generated now
+    context['utcnow'] = datetime.datetime.utcnow()
+    return list(snapshot['errors']), snapshot['scancode'], context
@@ -14,7 +14,13 @@
 #  limitations under the License.
 # ============================================================================
 
+import os
+from functools import lru_cache
+
+from jinja2 import BaseLoader
 from jinja2 import Environment
+from jinja2 import FileSystemBytecodeCache
+from jinja2 import TemplateNotFound
 try:
     from jinja2.filters import pass_environment
 except ImportError:
@@ -25,20 +31,144 @@ from jinja2.filters import FilterArgumentError
 
 """
 Extra JINJA2 custom filters and other template utilities.
+
+The templates are compiled with a shared Environment that has the custom
+filters and caches the compiled templates in memory. The compiled templates
+can also be cached as bytecode on disk such that an unchanged template file
+is not compiled again on later runs: there is no such cache by default and
+its directory is set with set_bytecode_cache_dir() or with the
+ABOUTCODE_TEMPLATE_CACHE_DIR environment variable.
 """
 
 
-def get_template(template_text):
+def get_bytecode_cache_dir():
+    """
+    Return the template bytecode cache directory set in the environment or
+    None if caching is disabled, which is the default.
+    """
+    return os.environ.get('ABOUTCODE_TEMPLATE_CACHE_DIR') or None
+
+
+def get_bytecode_cache(location=None):
+    """
+    Return a FileSystemBytecodeCache in the `location` directory or None if
+    there is no `location` or the cache directory cannot be created.
+    """
+    if not location:
+        return None
+    try:
+        os.makedirs(location, exist_ok=True)
+    except OSError:
+        return None
+    return FileSystemBytecodeCache(location)
+
+
+class TemplateFileLoader(BaseLoader):
     """
-    Return a template built from a text string.
-    Register custom templates as needed.
+    Load templates using their file location as a name. A loaded template is
+    loaded again when the modification time of its file changes.
     """
-    env = Environment(autoescape=True)
+
+    def get_source(self, environment, template):
+        try:
+            mtime = os.path.getmtime(template)
+            with open(template, encoding='utf-8', errors='replace') as tplf:
+                source = tplf.read()
+        except OSError:
+            raise TemplateNotFound(template)
+
+        def uptodate():
+            try:
+                return os.path.getmtime(template) == mtime
+            except OSError:
+                return False
+
+        return source, template, uptodate
+
+
+@lru_cache(maxsize=1)
+def get_environment():
+    """
+    Return the shared Environment with our custom filters.
+    """
+    env = Environment(
+        loader=TemplateFileLoader(),
+        bytecode_cache=get_bytecode_cache(get_bytecode_cache_dir()),
+        auto_reload=True,
+    )
     # register our custom filters
     env.filters.update(dict(
         unique_together=unique_together,
         multi_sort=multi_sort))
-    return env.from_string(template_text)
+    return env
+
+
+def set_bytecode_cache_dir(location=None):
+    """
+    Cache the templates compiled from now on as bytecode in the `location`
+    directory, or disable this cache if `location` is None.
+    """
+    get_environment().bytecode_cache = get_bytecode_cache(location)
+
+
+def load_template(location):
+    """
+    Return a template loaded from the file at `location`.
+    """
+    return get_environment().get_template(location)
+
+
+def get_template(template_text):
+    """
+    Return a template built from a text string with autoescaping.
+    """
+    return get_environment().overlay(autoescape=True).from_string(template_text)
+
+
+def make_fast_attrgetter(environment, attribute, postprocess=None):
+    """
+    Return a callable that looks up a dotted `attribute` name on an object like
+    the jinja2 make_attrgetter. Use plain attribute access along the way for the
+    objects that do not support item access, such as About objects and fields,
+    as jinja2 then falls back to attribute access after a costly exception.
+    """
+    getter = make_attrgetter(environment, attribute, postprocess=postprocess)
+    if not isinstance(attribute, str):
+        return getter
+    parts = attribute.split('.')
+    if not all(part.isidentifier() for part in parts):
+        return getter
+
+    def fast_getter(item):
+        value = item
+        for part in parts:
+            if hasattr(type(value), '__getitem__'):
+                return getter(item)
+            try:
+                value = getattr(value, part)
+            except AttributeError:
+                return getter(item)
+        if postprocess is not None:
+            value = postprocess(value)
+        return value
+
+    return fast_getter
+
+
+def make_key_getter(environment, attributes, case_sensitive=False):
+    """
+    Return a callable that returns a tuple of the values of the `attributes`
+    names of an item.
+    """
+    do_ignore_case = ignore_case if not case_sensitive else None
+    attribute_getters = tuple(
+        make_fast_attrgetter(environment, attribute, postprocess=do_ignore_case)
+        for attribute in attributes)
+
+    def key(v):
+        return tuple(a(v) for a in attribute_getters)
+
+    return key
 
 
 @pass_environment
@@ -61,17 +191,8 @@ def multi_sort(environment, value, reverse=False, case_sensitive=False,
             'such as in: '
             "for item in iterable|multi_sort(attributes=['date', 'name'])")
 
-    # build a list of attribute getters, one for each attribute
-    do_ignore_case = ignore_case if not case_sensitive else None
-    attribute_getters = []
-    for attribute in attributes:
-        ag = make_attrgetter(environment, attribute, postprocess=do_ignore_case)
-        attribute_getters.append(ag)
-
-    # build a key function that has runs all attribute getters
-    def key(v):
-        return [a(v) for a in attribute_getters]
-
+    # the tuple sort key of each item is computed once
+    key = make_key_getter(environment, attributes, case_sensitive)
     return sorted(value, key=key, reverse=reverse)
 
 
@@ -95,23 +216,24 @@ def unique_together(environment, value, case_sensitive=False, attributes=None):
             'such as in: '
             "{% for item in iterable|unique_together(attributes=['date', 'name']) %} ")
 
-    # build a list of attribute getters, one for each attribute
-    do_ignore_case = ignore_case if not case_sensitive else None
-    attribute_getters = []
-    for attribute in attributes:
-        ag = make_attrgetter(environment, attribute, postprocess=do_ignore_case)
-        attribute_getters.append(ag)
+    key = make_key_getter(environment, attributes, case_sensitive)
 
-    # build a unique_key function that has runs all attribute getters
-    # and returns a hashable tuple
+    # build a hashable key of typed values, or of their repr for unhashable
+    # values
     def unique_key(v):
-        return tuple(repr(a(v)) for a in attribute_getters)
+        values = key(v)
+        try:
+            unique = tuple((type(value), value) for value in values)
+            hash(unique)
+            return unique
+        except TypeError:
+            return tuple(repr(value) for value in values)
 
     unique = []
     seen = set()
     for item in value:
-        key = unique_key(item)
-        if key not in seen:
-            seen.add(key)
+        item_key = unique_key(item)
+        if item_key not in seen:
+            seen.add(item_key)
             unique.append(item)
     return unique
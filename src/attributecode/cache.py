@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+# -*- coding: utf8 -*-
+# ============================================================================
+#  Copyright (c) nexB Inc. http://www.nexb.com/ - All rights reserved.
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#      http://www.apache.org/licenses/LICENSE-2.0
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ============================================================================
+
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import stat
+
+from attributecode import __version__
+from attributecode.util import add_unc
+from attributecode.util import create_dir
+
+"""
+Persistent on-disk cache of loaded and validated About objects.
+"""
+
+INVENTORY_CACHE_FILE = 'inventory.sqlite'
+
+
+def file_signature(location):
+    """
+    Return a (mtime_ns, size) tuple for the file at `location` or (None, None)
+    if the file does not exist. Directories have a -1 mtime_ns and size as only
+    their existence matters.
+    """
+    try:
+        st = os.stat(add_unc(location))
+    except OSError:
+        return None, None
+    if stat.S_ISDIR(st.st_mode):
+        return -1, -1
+    return st.st_mtime_ns, st.st_size
+
+
+def file_sha1(location):
+    """
+    Return the SHA1 hex digest of the content of the file at `location`.
+    """
+    sha1 = hashlib.sha1()
+    with open(add_unc(location), 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+
+def get_referenced_locations(about):
+    """
+    Return a list of the file locations referenced by an `about` About object
+    in its path fields (such as about_resource, license_file, notice_file,
+    etc.) and checked for existence when the About was validated.
+    """
+    locations = []
+    for field in about.fields.values():
+        for location in getattr(field, 'checked_locations', None) or []:
+            if location not in locations:
+                locations.append(location)
+    return locations
+
+
+class InventoryCache(object):
+    """
+    A cache of About objects loaded from ABOUT files stored in an SQLite
+    database in a `cache_dir` directory.
+
+    Each entry is keyed by the ABOUT file location and its about_file_path and
+    is valid as long as the ABOUT file content is unchanged (based on its
+    modification time, size and SHA1) and as long as the files it references
+    are unchanged too.
+    """
+
+    def __init__(self, cache_dir):
+        create_dir(cache_dir)
+        self.location = os.path.join(cache_dir, INVENTORY_CACHE_FILE)
+        self.connection = sqlite3.connect(self.location, timeout=60)
+        self._setup()
+
+    def _setup(self):
+        with self.connection as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS metadata ('
+                'key TEXT PRIMARY KEY, value TEXT)')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS abouts ('
+                'location TEXT, about_file_path TEXT, '
+                'mtime_ns INTEGER, size INTEGER, sha1 TEXT, '
+                'referenced TEXT, about BLOB, '
+                'PRIMARY KEY (location, about_file_path))')
+            row = conn.execute(
+                "SELECT value FROM metadata WHERE key = 'version'").fetchone()
+            if not row or row[0] != __version__:
+                # entries created by another version may not be compatible
+                conn.execute('DELETE FROM abouts')
+                conn.execute(
+                    "INSERT OR REPLACE INTO metadata (key, value) "
+                    "VALUES ('version', ?)", (__version__,))
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        self.close()
+
+    def get(self, location, about_file_path):
+        """
+        Return a cached About object for the ABOUT file at `location` with an
+        `about_file_path` or None if there is no valid cached entry.
+        """
+        row = self.connection.execute(
+            'SELECT mtime_ns, size, sha1, referenced, about FROM abouts '
+            'WHERE location = ? AND about_file_path = ?',
+            (location, about_file_path)).fetchone()
+        if not row:
+            return
+
+        mtime_ns, size, sha1, referenced, pickled = row
+        current_mtime_ns, current_size = file_signature(location)
+        if current_size is None or current_size != size:
+            return
+        if current_mtime_ns != mtime_ns:
+            # the file was touched: it is still valid if its content is the same
+            if file_sha1(location) != sha1:
+                return
+            self.connection.execute(
+                'UPDATE abouts SET mtime_ns = ? '
+                'WHERE location = ? AND about_file_path = ?',
+                (current_mtime_ns, location, about_file_path))
+            self.connection.commit()
+
+        for ref_location, ref_mtime_ns, ref_size in json.loads(referenced):
+            if file_signature(ref_location) != (ref_mtime_ns, ref_size):
+                return
+
+        try:
+            return pickle.loads(pickled)
+        except Exception:
+            return
+
+    def put_all(self, entries):
+        """
+        Store in the cache an `entries` list of (location, about_file_path,
+        About object) tuples.
+        """
+        rows = []
+        for location, about_file_path, about in entries:
+            mtime_ns, size = file_signature(location)
+            if size is None:
+                continue
+            referenced = [
+                (ref_location,) + file_signature(ref_location)
+                for ref_location in get_referenced_locations(about)
+            ]
+            rows.append((
+                location,
+                about_file_path,
+                mtime_ns,
+                size,
+                file_sha1(location),
+                json.dumps(referenced),
+                pickle.dumps(about, protocol=pickle.HIGHEST_PROTOCOL),
+            ))
+
+        with self.connection as conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO abouts (location, about_file_path, '
+                'mtime_ns, size, sha1, referenced, about) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
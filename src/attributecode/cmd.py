@@ -32,9 +32,15 @@ from attributecode.model import get_copy_list
 from attributecode.model import copy_redist_src
 from attributecode.model import collect_inventory, collect_abouts_license_expression, collect_inventory_license_expression
 from attributecode.gen import generate as generate_about_files, load_inventory
+from attributecode import fetch
+from attributecode.licensedb import InvalidLicenseDB
+from attributecode.licensedb import LicenseDB
 from attributecode.attrib import generate_and_save as generate_attribution_doc
 from attributecode.attrib import DEFAULT_LICENSE_SCORE
 from attributecode.attrib import check_template
+from attributecode.attrib import load_context
+from attributecode.attrib import render_and_save
+from attributecode.attrib_util import set_bytecode_cache_dir
 from attributecode import severities
 from attributecode import __version__
 from attributecode import __about_spec_version__
@@ -128,6 +134,19 @@ def validate_key_values(ctx, param, value):
     return kvals
 
 
+def validate_licensedb(ctx, param, value):
+    """
+    Return a LicenseDB loaded from the `value` location or raise a UsageError
+    otherwise.
+    """
+    if not value:
+        return
+    try:
+        return LicenseDB(value)
+    except InvalidLicenseDB as e:
+        raise click.UsageError('Invalid --licensedb option: {e}'.format(**locals()))
+
+
 def validate_extensions(ctx, param, value, extensions=tuple(('.csv', '.json',))):
     if not value:
         return
@@ -159,6 +178,24 @@ def validate_extensions(ctx, param, value, extensions=tuple(('.csv', '.json',)))
               show_default=True,
               type=click.Choice(['json', 'csv', 'excel']),
               help='Set OUTPUT inventory file format.')
+@click.option('-n', '--processes',
+              type=click.IntRange(min=1),
+              default=1,
+              show_default=True,
+              help='Number of parallel processes to use to load the .ABOUT files.')
+@click.option('--cache-dir',
+              metavar='DIR',
+              type=click.Path(file_okay=False, writable=True, resolve_path=True),
+              help='Path to a directory where to cache the loaded .ABOUT files. '
+              'Unchanged .ABOUT files are not loaded again on later runs.')
+@click.option('--exclude',
+              metavar='PATTERN',
+              multiple=True,
+              help='Skip the files and directories matching this glob pattern '
+              'when collecting .ABOUT files. Patterns with a "/" match the '
+              'relative path and patterns ending with a "/" only match '
+              'directories. The patterns of an .aboutignore file at the root '
+              'of the input directory are also used. This option can be repeated.')
 @click.option('-q', '--quiet',
               is_flag=True,
               help='Do not print error or warning messages.')
@@ -166,7 +203,7 @@ def validate_extensions(ctx, param, value, extensions=tuple(('.csv', '.json',)))
               is_flag=True,
               help='Show all error and warning messages.')
 @click.help_option('-h', '--help')
-def inventory(location, output, format, quiet, verbose):  # NOQA
+def inventory(location, output, format, processes, cache_dir, exclude, quiet, verbose):  # NOQA
     """
 Collect the inventory of .ABOUT files to a CSV/JSON/XLSX file.
 
@@ -181,7 +218,8 @@ OUTPUT: Path to the CSV/JSON/XLSX inventory file to create.
     if location.lower().endswith('.zip'):
         # accept zipped ABOUT files as input
         location = extract_zip(location)
-    errors, abouts = collect_inventory(location)
+    errors, abouts = collect_inventory(
+        location, processes=processes, cache_dir=cache_dir, exclude=exclude)
     write_output(abouts=abouts, location=output, format=format)
 
     errors_count = report_errors(
@@ -221,6 +259,33 @@ OUTPUT: Path to the CSV/JSON/XLSX inventory file to create.
               metavar='api_url api_key',
               help='Fetch license data and text files from a DejaCode License Library '
               'API URL using the API KEY.')
+@click.option('--license-link',
+              type=click.Choice(['hardlink', 'symlink']),
+              help='Write each fetched license text file once and create the other '
+              'copies as hard links or symbolic links. Use with --fetch-license '
+              'or --fetch-license-djc.')
+@click.option('--licensedb',
+              metavar='PATH',
+              callback=validate_licensedb,
+              type=click.Path(exists=True, readable=True, resolve_path=True),
+              help='Path to an offline mirror of the ScanCode LicenseDB: a directory '
+              'or a .zip or .tar archive with an index.json and the <key>.json and '
+              '<key>.LICENSE files. Licenses are looked up in this mirror without '
+              'network access.')
+@click.option('--license-cache-dir',
+              metavar='DIR',
+              type=click.Path(file_okay=False, writable=True, resolve_path=True),
+              help='Path to a directory where to cache the fetched license data. '
+              'The cached license data is reused by later runs for one day.')
+@click.option('--refresh-licenses',
+              is_flag=True,
+              help='Fetch the license data again instead of using the cached responses '
+              'from earlier runs.')
+@click.option('--fetch-workers',
+              type=int,
+              default=8,
+              show_default=True,
+              help='Number of concurrent requests to use to fetch the license data.')
 @click.option('--scancode',
               is_flag=True,
               help='Indicate the input JSON file is from scancode_toolkit.')
@@ -239,7 +304,7 @@ OUTPUT: Path to the CSV/JSON/XLSX inventory file to create.
               is_flag=True,
               help='Show all error and warning messages.')
 @click.help_option('-h', '--help')
-def gen(location, output, android, fetch_license, fetch_license_djc, scancode, reference, worksheet, quiet, verbose):
+def gen(location, output, android, fetch_license, fetch_license_djc, license_link, licensedb, license_cache_dir, refresh_licenses, fetch_workers, scancode, reference, worksheet, quiet, verbose):
     """
 Given a CSV/JSON/XLSX inventory, generate ABOUT files in the output location.
 
@@ -260,6 +325,17 @@ OUTPUT: Path to a directory where ABOUT files are generated.
         raise click.UsageError(
             'ERROR: --worksheet option only works with .xlsx input.')
 
+    if license_link and not (fetch_license or fetch_license_djc):
+        raise click.UsageError(
+            'ERROR: --license-link option requires --fetch-license or --fetch-license-djc.')
+
+    if licensedb and not fetch_license:
+        raise click.UsageError(
+            'ERROR: --licensedb option requires --fetch-license.')
+
+    fetch.configure(
+        cache_dir=license_cache_dir, refresh=refresh_licenses, workers=fetch_workers)
+
     errors, abouts = generate_about_files(
         location=location,
         base_dir=output,
@@ -268,11 +344,14 @@ OUTPUT: Path to a directory where ABOUT files are generated.
         fetch_license=fetch_license,
         fetch_license_djc=fetch_license_djc,
         scancode=scancode,
-        worksheet=worksheet
+        worksheet=worksheet,
+        license_link=license_link,
+        licensedb=licensedb,
     )
 
     errors_count = report_errors(
         errors, quiet, verbose, log_file_loc=output + '-error.log')
+    report_fetch_stats(quiet)
     if not quiet:
         abouts_count = len(abouts)
         msg = '{abouts_count} .ABOUT files generated in {output}.'.format(
@@ -301,6 +380,28 @@ OUTPUT: Path to a directory where ABOUT files are generated.
               type=str,
               metavar='api_url api_key',
               help='Fetch licenses from a DejaCode License Library.')
+@click.option('--licensedb',
+              metavar='PATH',
+              callback=validate_licensedb,
+              type=click.Path(exists=True, readable=True, resolve_path=True),
+              help='Path to an offline mirror of the ScanCode LicenseDB: a directory '
+              'or a .zip or .tar archive with an index.json and the <key>.json and '
+              '<key>.LICENSE files. Licenses are looked up in this mirror without '
+              'network access.')
+@click.option('--license-cache-dir',
+              metavar='DIR',
+              type=click.Path(file_okay=False, writable=True, resolve_path=True),
+              help='Path to a directory where to cache the fetched license data. '
+              'The cached license data is reused by later runs for one day.')
+@click.option('--refresh-licenses',
+              is_flag=True,
+              help='Fetch the license data again instead of using the cached responses '
+              'from earlier runs.')
+@click.option('--fetch-workers',
+              type=int,
+              default=8,
+              show_default=True,
+              help='Number of concurrent requests to use to fetch the license data.')
 @click.option('--scancode',
               is_flag=True,
               help='Indicate the input JSON file is from scancode_toolkit.')
@@ -311,7 +412,7 @@ OUTPUT: Path to a directory where ABOUT files are generated.
               is_flag=True,
               help='Show all error and warning messages.')
 @click.help_option('-h', '--help')
-def gen_license(location, output, djc, scancode, worksheet, verbose):
+def gen_license(location, output, djc, licensedb, license_cache_dir, refresh_licenses, fetch_workers, scancode, worksheet, verbose):
     """
 Fetch licenses (Default: ScanCode LicenseDB) in the license_expression field and save to the output location.
 
@@ -328,6 +429,13 @@ OUTPUT: Path to a directory where license files are saved.
         raise click.UsageError(
             'ERROR: --worksheet option only works with .xlsx input.')
 
+    if licensedb and djc:
+        raise click.UsageError(
+            'ERROR: --licensedb and --djc options cannot be used together.')
+
+    fetch.configure(
+        cache_dir=license_cache_dir, refresh=refresh_licenses, workers=fetch_workers)
+
     log_file_loc = os.path.join(output, 'error.log')
 
     if location.endswith('.csv') or location.endswith('.json') or location.endswith('.xlsx'):
@@ -349,7 +457,7 @@ OUTPUT: Path to a directory where license files are saved.
     click.echo('Fetching licenses...')
     from_check = False
     license_dict, lic_errors = pre_process_and_fetch_license_dict(
-        abouts, from_check, api_url, api_key, scancode)
+        abouts, from_check, api_url, api_key, scancode, licensedb=licensedb)
 
     if lic_errors:
         errors.extend(lic_errors)
@@ -368,6 +476,7 @@ OUTPUT: Path to a directory where license files are saved.
 
     severe_errors_count = report_errors(
         errors, quiet=False, verbose=verbose, log_file_loc=log_file_loc)
+    report_fetch_stats()
     sys.exit(severe_errors_count)
 
 
@@ -380,8 +489,7 @@ def validate_template(ctx, param, value):
     if not value:
         return None
 
-    with open(value, encoding='utf-8', errors='replace') as templatef:
-        template_error = check_template(templatef.read())
+    template_error = check_template(template_loc=value)
 
     if template_error:
         lineno, message = template_error
@@ -391,6 +499,25 @@ def validate_template(ctx, param, value):
     return value
 
 
+def set_template_cache_dir(ctx, param, value):
+    """
+    Cache the compiled attribution templates in a templates subdirectory of
+    the cache directory `value` if any.
+    """
+    if value:
+        set_bytecode_cache_dir(os.path.join(value, 'templates'))
+    return value
+
+
+def validate_renders(ctx, param, value):
+    if not value:
+        return ()
+
+    for template_loc, _output in value:
+        validate_template(ctx, param, template_loc)
+    return value
+
+
 @about.command(cls=AboutCommand,
                short_help='Generate an attribution document from JSON/CSV/XLSX/.ABOUT files.')
 @click.argument('input',
@@ -412,6 +539,28 @@ def validate_template(ctx, param, value):
               type=click.STRING,
               metavar='KEY',
               help='API Key for the  DejaCode License Library')
+@click.option('--licensedb',
+              metavar='PATH',
+              callback=validate_licensedb,
+              type=click.Path(exists=True, readable=True, resolve_path=True),
+              help='Path to an offline mirror of the ScanCode LicenseDB: a directory '
+              'or a .zip or .tar archive with an index.json and the <key>.json and '
+              '<key>.LICENSE files. Licenses are looked up in this mirror without '
+              'network access.')
+@click.option('--license-cache-dir',
+              metavar='DIR',
+              type=click.Path(file_okay=False, writable=True, resolve_path=True),
+              help='Path to a directory where to cache the fetched license data. '
+              'The cached license data is reused by later runs for one day.')
+@click.option('--refresh-licenses',
+              is_flag=True,
+              help='Fetch the license data again instead of using the cached responses '
+              'from earlier runs.')
+@click.option('--fetch-workers',
+              type=int,
+              default=8,
+              show_default=True,
+              help='Number of concurrent requests to use to fetch the license data.')
 @click.option('--min-license-score',
               type=int,
               help='Attribute components that have license score higher than or equal to the defined '
@@ -419,6 +568,16 @@ def validate_template(ctx, param, value):
 @click.option('--scancode',
               is_flag=True,
               help='Indicate the input JSON file is from scancode_toolkit.')
+@click.option('--group-by',
+              type=click.Choice(['package', 'directory']),
+              help='Attribute one component for each package or each directory of the '
+              'scancode_toolkit input rather than one for each file. Files that are '
+              'not part of a package are grouped by directory. Requires --scancode.')
+@click.option('--group-depth',
+              type=click.IntRange(min=1),
+              default=1,
+              show_default=True,
+              help='Depth of the directories used to group files with --group-by.')
 @click.option('--reference',
               metavar='DIR',
               type=click.Path(exists=True, file_okay=False,
@@ -432,6 +591,42 @@ def validate_template(ctx, param, value):
                               readable=True, resolve_path=True),
               help='Path to an optional custom attribution template to generate the '
               'attribution document. If not provided the default built-in template is used.')
+@click.option('--render',
+              nargs=2,
+              multiple=True,
+              callback=validate_renders,
+              metavar='TEMPLATE OUTPUT',
+              type=(click.Path(exists=True, dir_okay=False, readable=True, resolve_path=True),
+                    click.Path(exists=False, dir_okay=False, writable=True, resolve_path=True)),
+              help='Also generate an attribution document at OUTPUT using the custom '
+              'attribution TEMPLATE. The input is loaded once for all the documents. '
+              'This option can be repeated.')
+@click.option('--render-workers',
+              type=click.IntRange(min=1),
+              default=1,
+              show_default=True,
+              help='Number of threads to use to generate the attribution documents.')
+@click.option('--page-size',
+              type=click.IntRange(min=1),
+              help='Split the attribution document in pages of at most this number of '
+              'components. OUTPUT is then an index page that links to the pages and to '
+              'a page with the license texts, saved next to it. A --template is used '
+              'for the pages of components.')
+@click.option('--page-max-bytes',
+              type=click.IntRange(min=1),
+              help='Split the attribution document in pages of about this size in '
+              'bytes. Can be combined with --page-size.')
+@click.option('--save-context',
+              metavar='FILE',
+              type=click.Path(exists=False, dir_okay=False, writable=True, resolve_path=True),
+              help='Save the template context of the attribution in FILE to generate '
+              'attributions again with --from-context.')
+@click.option('--from-context',
+              metavar='FILE',
+              type=click.Path(exists=True, dir_okay=False, readable=True, resolve_path=True),
+              help='Generate the attribution from the template context saved in FILE '
+              'with --save-context instead of loading and processing INPUT again. '
+              'Only use a FILE that you saved as it is loaded with pickle.')
 @click.option('--vartext',
               multiple=True,
               callback=validate_key_values,
@@ -440,6 +635,28 @@ def validate_template(ctx, param, value):
 @click.option('--worksheet',
               metavar='name',
               help='The worksheet name from the INPUT. (Default: the "active" worksheet)')
+@click.option('-n', '--processes',
+              type=click.IntRange(min=1),
+              default=1,
+              show_default=True,
+              help='Number of parallel processes to use to load the .ABOUT files.')
+@click.option('--cache-dir',
+              metavar='DIR',
+              # eager to cache the --template validated when it is parsed
+              is_eager=True,
+              callback=set_template_cache_dir,
+              type=click.Path(file_okay=False, writable=True, resolve_path=True),
+              help='Path to a directory where to cache the loaded .ABOUT files and '
+              'the compiled templates. Unchanged .ABOUT files and templates are not '
+              'loaded again on later runs.')
+@click.option('--exclude',
+              metavar='PATTERN',
+              multiple=True,
+              help='Skip the files and directories matching this glob pattern '
+              'when collecting .ABOUT files. Patterns with a "/" match the '
+              'relative path and patterns ending with a "/" only match '
+              'directories. The patterns of an .aboutignore file at the root '
+              'of the input directory are also used. This option can be repeated.')
 @click.option('-q', '--quiet',
               is_flag=True,
               help='Do not print error or warning messages.')
@@ -447,7 +664,7 @@ def validate_template(ctx, param, value):
               is_flag=True,
               help='Show all error and warning messages.')
 @click.help_option('-h', '--help')
-def attrib(input, output, api_url, api_key, scancode, min_license_score, reference, template, vartext, worksheet, quiet, verbose):
+def attrib(input, output, api_url, api_key, licensedb, license_cache_dir, refresh_licenses, fetch_workers, scancode, min_license_score, group_by, group_depth, reference, template, render, render_workers, page_size, page_max_bytes, save_context, from_context, vartext, worksheet, processes, cache_dir, exclude, quiet, verbose):
     """
 Generate an attribution document at OUTPUT using JSON, CSV or XLSX or .ABOUT files at INPUT.
 
@@ -466,10 +683,44 @@ OUTPUT: Path where to write the attribution document.
         raise click.UsageError(
             'ERROR: --worksheet option only works with .xlsx input.')
 
+    if licensedb and (api_url or api_key):
+        raise click.UsageError(
+            'ERROR: --licensedb option cannot be used with --api_url or --api_key.')
+
+    if group_by and not scancode:
+        raise click.UsageError(
+            'ERROR: --group-by option requires --scancode.')
+
+    if save_context and from_context:
+        raise click.UsageError(
+            'ERROR: --save-context option cannot be used with --from-context.')
+
+    fetch.configure(
+        cache_dir=license_cache_dir, refresh=refresh_licenses, workers=fetch_workers)
+
     if not quiet:
         print_version()
         click.echo('Generating attribution...')
 
+    if from_context:
+        errors, scancode, context = load_context(from_context)
+        if context:
+            if vartext:
+                context['vartext'] = vartext
+            attrib_errors, rendered = render_and_save(
+                context=context,
+                output_location=output,
+                scancode=scancode,
+                template_loc=template,
+                renders=render,
+                workers=render_workers,
+                page_size=page_size or 0,
+                page_max_bytes=page_max_bytes or 0,
+                stream=True,
+            )
+            errors.extend(attrib_errors)
+        report_attrib(errors, rendered, output, render, quiet, verbose)
+
     # accept zipped ABOUT files as input
     if input.lower().endswith('.zip'):
         input = extract_zip(input)
@@ -504,7 +755,9 @@ OUTPUT: Path where to write the attribution document.
             from_attrib=from_attrib,
             scancode=scancode,
             reference_dir=reference,
-            worksheet=worksheet
+            worksheet=worksheet,
+            group_by=group_by,
+            group_depth=group_depth,
         )
 
         # Exit if CRITICAL error
@@ -516,7 +769,8 @@ OUTPUT: Path where to write the attribution document.
 
     else:
         is_about_input = True
-        _errors, abouts = collect_inventory(input)
+        _errors, abouts = collect_inventory(
+            input, processes=processes, cache_dir=cache_dir, exclude=exclude)
 
     if not abouts:
         msg = 'No ABOUT file or reference is found from the input. Attribution generation halted.'
@@ -542,7 +796,8 @@ OUTPUT: Path where to write the attribution document.
         api_key = api_key.strip("'").strip('"')
         from_check = False
         license_dict, lic_errors = pre_process_and_fetch_license_dict(
-            abouts, from_check, api_url, api_key, scancode, reference)
+            abouts, from_check, api_url, api_key, scancode, reference,
+            licensedb=licensedb)
         errors.extend(lic_errors)
         sorted_license_dict = sorted(license_dict)
 
@@ -565,16 +820,32 @@ OUTPUT: Path where to write the attribution document.
             min_license_score=min_license_score,
             template_loc=template,
             vartext=vartext,
+            renders=render,
+            workers=render_workers,
+            page_size=page_size or 0,
+            page_max_bytes=page_max_bytes or 0,
+            context_location=save_context,
+            stream=True,
         )
         errors.extend(attrib_errors)
 
+    report_attrib(errors, rendered, output, render, quiet, verbose)
+
+
+def report_attrib(errors, rendered, output, renders=(), quiet=False, verbose=False):
+    """
+    Report the `errors` and the generated attribution documents of the attrib
+    command and exit with the count of errors.
+    """
     errors_count = report_errors(
         errors, quiet, verbose, log_file_loc=output + '-error.log')
+    report_fetch_stats(quiet)
 
     if not quiet:
         if rendered:
-            msg = 'Attribution generated in: {output}'.format(**locals())
-            click.echo(msg)
+            for location in [output] + [render_output for _, render_output in renders]:
+                msg = 'Attribution generated in: {location}'.format(**locals())
+                click.echo(msg)
         else:
             msg = 'Attribution generation failed.'
             click.echo(msg)
@@ -693,20 +964,71 @@ OUTPUT: Path to a directory or a zip file where sources will be copied to.
               metavar='api_url api_key',
               help='Validate license_expression from a DejaCode License Library '
               'API URL using the API KEY.')
+@click.option('--licensedb',
+              metavar='PATH',
+              callback=validate_licensedb,
+              type=click.Path(exists=True, readable=True, resolve_path=True),
+              help='Path to an offline mirror of the ScanCode LicenseDB: a directory '
+              'or a .zip or .tar archive with an index.json and the <key>.json and '
+              '<key>.LICENSE files. Licenses are looked up in this mirror without '
+              'network access.')
+@click.option('--license-cache-dir',
+              metavar='DIR',
+              type=click.Path(file_okay=False, writable=True, resolve_path=True),
+              help='Path to a directory where to cache the fetched license data. '
+              'The cached license data is reused by later runs for one day.')
+@click.option('--refresh-licenses',
+              is_flag=True,
+              help='Fetch the license data again instead of using the cached responses '
+              'from earlier runs.')
+@click.option('--fetch-workers',
+              type=int,
+              default=8,
+              show_default=True,
+              help='Number of concurrent requests to use to fetch the license data.')
 @click.option('--log',
               nargs=1,
               metavar='FILE',
               help='Path to a file to save the error messages if any.')
+@click.option('-n', '--processes',
+              type=click.IntRange(min=1),
+              default=1,
+              show_default=True,
+              help='Number of parallel processes to use to load the .ABOUT files.')
+@click.option('--cache-dir',
+              metavar='DIR',
+              type=click.Path(file_okay=False, writable=True, resolve_path=True),
+              help='Path to a directory where to cache the loaded .ABOUT files. '
+              'Unchanged .ABOUT files are not loaded again on later runs.')
+@click.option('--exclude',
+              metavar='PATTERN',
+              multiple=True,
+              help='Skip the files and directories matching this glob pattern '
+              'when collecting .ABOUT files. Patterns with a "/" match the '
+              'relative path and patterns ending with a "/" only match '
+              'directories. The patterns of an .aboutignore file at the root '
+              'of the input directory are also used. This option can be repeated.')
 @click.option('--verbose',
               is_flag=True,
               help='Show all error and warning messages.')
 @click.help_option('-h', '--help')
-def check(location, license, djc, log, verbose):
+def check(location, license, djc, licensedb, license_cache_dir, refresh_licenses, fetch_workers, log, processes, cache_dir, exclude, verbose):
     """
 Check .ABOUT file(s) at LOCATION for validity and print error messages.
 
 LOCATION: Path to an ABOUT file or a directory with ABOUT files.
     """
+    if licensedb and not license:
+        raise click.UsageError(
+            'ERROR: --licensedb option requires --license.')
+
+    if licensedb and djc:
+        raise click.UsageError(
+            'ERROR: --licensedb and --djc options cannot be used together.')
+
+    fetch.configure(
+        cache_dir=license_cache_dir, refresh=refresh_licenses, workers=fetch_workers)
+
     print_version()
 
     if log:
@@ -722,18 +1044,20 @@ LOCATION: Path to an ABOUT file or a directory with ABOUT files.
         api_url = djc[0].strip("'").strip('"')
         api_key = djc[1].strip("'").strip('"')
     click.echo('Checking ABOUT files...')
-    errors, abouts = collect_inventory(location)
+    errors, abouts = collect_inventory(
+        location, processes=processes, cache_dir=cache_dir, exclude=exclude)
 
     # Validate license_expression
     if license:
         from_check = True
         _key_text_dict, errs = pre_process_and_fetch_license_dict(
-            abouts, from_check, api_url, api_key)
+            abouts, from_check, api_url, api_key, licensedb=licensedb)
         for e in errs:
             errors.append(e)
 
     severe_errors_count = report_errors(
         errors, quiet=False, verbose=verbose, log_file_loc=log)
+    report_fetch_stats()
     sys.exit(severe_errors_count)
 
 ######################################################################
@@ -871,6 +1195,16 @@ def report_errors(errors, quiet, verbose, log_file_loc=None):
     return severe_errors_count
 
 
+def report_fetch_stats(quiet=False):
+    """
+    Report the statistics of the license data requests to screen if any
+    unless `quiet` is True.
+    """
+    stats = fetch.get_fetcher().stats
+    if not quiet and (stats.requests or stats.cached):
+        click.echo(stats.summary())
+
+
 def get_error_messages(errors, verbose=False):
     """
     Return a tuple of (list of error message strings to report,
@@ -0,0 +1,517 @@
+#!/usr/bin/env python
+# -*- coding: utf8 -*-
+# ============================================================================
+#  Copyright (c) nexB Inc. http://www.nexb.com/ - All rights reserved.
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#      http://www.apache.org/licenses/LICENSE-2.0
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ============================================================================
+
+import hashlib
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+"""
+HTTP GET requests for the LicenseDB and DejaCode lookups with an optional
+persistent on-disk response cache, and uncached HEAD requests to check that
+these services are reachable without downloading a response body.
+
+Only successful responses are cached. Cached responses are used without any
+request for a TTL. Past this TTL, they are revalidated with a conditional
+request (If-None-Match/If-Modified-Since) such that an unchanged response is
+not downloaded again.
+
+Requests have a timeout, are retried on connection errors and on 429 and 5xx
+responses with an exponential backoff with jitter, and can be rate limited
+per host. Concurrent requests for the same URL are sent only once.
+
+These environment variables configure the requests:
+
+- ABOUTCODE_HTTP_CACHE_DIR: the cache directory. There is no cache by
+  default.
+- ABOUTCODE_HTTP_CACHE_TTL: the cache TTL in seconds. Defaults to one day.
+- ABOUTCODE_HTTP_TIMEOUT: the connect and read timeout in seconds. Defaults
+  to 30 seconds.
+- ABOUTCODE_HTTP_RETRIES: the number of retries. Defaults to 3.
+- ABOUTCODE_HTTP_RATE: the maximum number of requests per second to a host.
+  Defaults to 0 for no limit.
+"""
+
+DEFAULT_TTL = 24 * 60 * 60
+
+# default number of concurrent requests
+DEFAULT_WORKERS = 8
+
+DEFAULT_TIMEOUT = 30
+
+DEFAULT_RETRIES = 3
+
+# base and maximum delays in seconds between retries
+BACKOFF = 0.5
+MAX_BACKOFF = 30
+
+# retry on these response status codes
+RETRY_STATUS = frozenset([429, 500, 502, 503, 504])
+
+
+def is_cacheable(status_code):
+    """
+    Return True if a response with `status_code` can be cached: only the
+    successful responses are cached such that an error (such as for an
+    invalid license key or API key) is not reported again once fixed.
+    """
+    return 200 <= status_code < 300
+
+
+def is_server_error(status_code):
+    return status_code >= 500 or status_code in RETRY_STATUS
+
+
+def get_env_number(name, default, cast=int):
+    """
+    Return the number value of the `name` environment variable or `default`.
+    """
+    try:
+        return cast(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def get_cache_dir():
+    """
+    Return the HTTP cache directory set in the environment or None if caching
+    is disabled, which is the default.
+    """
+    return os.environ.get('ABOUTCODE_HTTP_CACHE_DIR') or None
+
+
+def get_ttl():
+    """
+    Return the default HTTP cache TTL in seconds.
+    """
+    return get_env_number('ABOUTCODE_HTTP_CACHE_TTL', DEFAULT_TTL)
+
+
+class Response(object):
+    """
+    An HTTP response with the subset of the requests.Response attributes used
+    in AboutCode Toolkit.
+    """
+    __slots__ = ('status_code', 'text', 'headers', 'from_cache')
+
+    def __init__(self, status_code, text, headers=None, from_cache=False):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+        self.from_cache = from_cache
+
+    def json(self):
+        return json.loads(self.text)
+
+    def __repr__(self):
+        return 'Response(status_code=%r, from_cache=%r)' % (
+            self.status_code, self.from_cache)
+
+
+class TokenBucket(object):
+    """
+    A thread-safe token bucket allowing `rate` requests per second on average
+    with bursts of up to `capacity` requests.
+    """
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1)
+        self.tokens = self.capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Take a token, waiting until one is available.
+        """
+        with self.lock:
+            now = self.clock()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait:
+            self.sleep(wait)
+
+
+class FetchStats(object):
+    """
+    Thread-safe statistics of the requests of a Fetcher.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.cached = 0
+        self.retries = 0
+        self.failures = 0
+        self.latencies = []
+
+    def add_request(self, latency):
+        with self.lock:
+            self.requests += 1
+            self.latencies.append(latency)
+
+    def add_cached(self):
+        with self.lock:
+            self.cached += 1
+
+    def add_retry(self):
+        with self.lock:
+            self.retries += 1
+
+    def add_failure(self):
+        with self.lock:
+            self.failures += 1
+
+    def summary(self):
+        """
+        Return a one line summary of the statistics.
+        """
+        with self.lock:
+            latencies = sorted(self.latencies)
+            msg = ('License data requests: {requests}, cached: {cached}, '
+                   'retries: {retries}, failures: {failures}'.format(
+                       requests=self.requests, cached=self.cached,
+                       retries=self.retries, failures=self.failures))
+        if latencies:
+            average = sum(latencies) / len(latencies)
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            msg += ', latency: average {:.2f}s, p95 {:.2f}s, max {:.2f}s'.format(
+                average, p95, latencies[-1])
+        return msg
+
+
+class HttpCache(object):
+    """
+    An on-disk cache of HTTP responses stored in a `location` directory with
+    one JSON file per request. Files are replaced atomically such that the
+    cache can be shared by concurrent processes.
+    """
+
+    def __init__(self, location):
+        self.location = location
+
+    @staticmethod
+    def get_key(url, headers=None):
+        """
+        Return a cache key for a request to `url` with `headers`. The key is a
+        hash such that no URL or credentials are stored in the cache.
+        """
+        key = [url]
+        if headers:
+            key.extend('%s:%s' % (k.lower(), v) for k, v in sorted(headers.items()))
+        return hashlib.sha1('\n'.join(key).encode('utf-8')).hexdigest()
+
+    def get_location(self, key):
+        return os.path.join(self.location, key[:2], key + '.json')
+
+    def get(self, key):
+        """
+        Return a cached entry mapping for `key` or None.
+        """
+        try:
+            with open(self.get_location(key), encoding='utf-8') as entry:
+                return json.load(entry)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key, entry):
+        """
+        Store an `entry` mapping for `key`.
+        """
+        location = self.get_location(key)
+        parent = os.path.dirname(location)
+        try:
+            os.makedirs(parent, exist_ok=True)
+            fd, temp = tempfile.mkstemp(dir=parent, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as out:
+                json.dump(entry, out)
+            os.replace(temp, location)
+        except OSError:
+            # caching is best effort
+            pass
+
+
+class Fetcher(object):
+    """
+    Send HTTP GET requests using an optional HttpCache `cache`. Cached
+    responses younger than `ttl` seconds are used as-is. If `refresh` is True,
+    cached responses are ignored and replaced.
+
+    Requests are sent with a keep-alive session shared by up to `workers`
+    concurrent threads, with a `timeout` in seconds and up to `retries`
+    retries. If `rate` is set, at most `rate` requests per second are sent to
+    each host.
+    """
+
+    def __init__(self, cache=None, ttl=DEFAULT_TTL, refresh=False, workers=DEFAULT_WORKERS,
+                 timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES, rate=0):
+        self.cache = cache
+        self.ttl = ttl
+        self.refresh = refresh
+        self.workers = max(workers, 1)
+        self.timeout = timeout
+        self.retries = retries
+        self.rate = rate
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=self.workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.sleep = time.sleep
+        self.stats = FetchStats()
+        self.lock = threading.Lock()
+        # mapping of {host: TokenBucket}
+        self.buckets = {}
+        # mapping of {request key: Future} for the requests in progress
+        self.in_flight = {}
+
+    def map(self, function, items):
+        """
+        Return a list of the results of calling `function` on each of the
+        `items` using up to `workers` concurrent threads.
+        """
+        items = list(items)
+        if self.workers == 1 or len(items) < 2:
+            return [function(item) for item in items]
+        workers = min(self.workers, len(items))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(function, items))
+
+    def get(self, url, headers=None, use_cache=True):
+        """
+        Return a Response for a GET request to `url` with `headers`. A request
+        for the same `url` and `headers` as a request in progress in another
+        thread waits for and returns the response of this other request. If
+        `use_cache` is False, the cache is neither used nor updated.
+        """
+        key = HttpCache.get_key(url, headers)
+        with self.lock:
+            future = self.in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self.in_flight[key] = Future()
+        if not owner:
+            return future.result()
+
+        try:
+            response = self.get_response(key, url, headers, use_cache)
+            future.set_result(response)
+            return response
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                del self.in_flight[key]
+
+    def get_response(self, key, url, headers=None, use_cache=True):
+        """
+        Return a Response for a GET request to `url` with `headers` using the
+        cache if any and if `use_cache` is True.
+        """
+        if not self.cache or not use_cache:
+            return self.send(url, headers)
+
+        entry = None if self.refresh else self.cache.get(key)
+        if entry and time.time() - entry['fetched'] < self.ttl:
+            self.stats.add_cached()
+            return Response(entry['status_code'], entry['text'], entry['headers'], True)
+
+        request_headers = dict(headers or {})
+        if entry:
+            if entry['headers'].get('ETag'):
+                request_headers['If-None-Match'] = entry['headers']['ETag']
+            if entry['headers'].get('Last-Modified'):
+                request_headers['If-Modified-Since'] = entry['headers']['Last-Modified']
+
+        try:
+            response = self.send(url, request_headers)
+        except requests.exceptions.RequestException:
+            if entry:
+                # use a stale response rather than failing
+                return Response(entry['status_code'], entry['text'], entry['headers'], True)
+            raise
+
+        if entry and response.status_code == 304:
+            entry['fetched'] = time.time()
+            self.cache.put(key, entry)
+            return Response(entry['status_code'], entry['text'], entry['headers'], True)
+
+        if entry and is_server_error(response.status_code):
+            # use a stale response rather than a server error
+            return Response(entry['status_code'], entry['text'], entry['headers'], True)
+
+        if is_cacheable(response.status_code):
+            self.cache.put(key, dict(
+                status_code=response.status_code,
+                text=response.text,
+                headers=response.headers,
+                fetched=time.time(),
+            ))
+        return response
+
+    def head(self, url, headers=None):
+        """
+        Return a Response without text for a HEAD request to `url` with
+        `headers`. HEAD requests are not cached.
+        """
+        return self.send(url, headers, method='HEAD')
+
+    def send(self, url, headers=None, method='GET'):
+        """
+        Return a Response for a `method` GET or HEAD request to `url` with
+        `headers` sent to the network. Retry on connection errors and on 429
+        and 5xx responses. Raise the last exception if all the retries fail.
+        """
+        if method == 'HEAD':
+            def request(url, headers, timeout):
+                return self.session.head(
+                    url, headers=headers, timeout=timeout, allow_redirects=True)
+        else:
+            request = self.session.get
+
+        attempt = 0
+        while True:
+            self.wait_for_rate_limit(url)
+            start = time.monotonic()
+            try:
+                response = request(url, headers=headers, timeout=self.timeout)
+            except requests.exceptions.RequestException:
+                self.stats.add_request(time.monotonic() - start)
+                if attempt >= self.retries:
+                    self.stats.add_failure()
+                    raise
+                retry_after = None
+            else:
+                self.stats.add_request(time.monotonic() - start)
+                if response.status_code not in RETRY_STATUS:
+                    return Response(
+                        response.status_code,
+                        response.text,
+                        {name: response.headers[name]
+                         for name in ('ETag', 'Last-Modified')
+                         if response.headers.get(name)},
+                    )
+                if attempt >= self.retries:
+                    self.stats.add_failure()
+                    return Response(response.status_code, response.text)
+                retry_after = response.headers.get('Retry-After')
+
+            self.stats.add_retry()
+            self.sleep(self.get_backoff(attempt, retry_after))
+            attempt += 1
+
+    @staticmethod
+    def get_backoff(attempt, retry_after=None):
+        """
+        Return a delay in seconds before retrying after `attempt` failed
+        attempts, using an exponential backoff with full jitter or a
+        `retry_after` number of seconds from a Retry-After header.
+        """
+        try:
+            if retry_after is not None:
+                return min(float(retry_after), MAX_BACKOFF)
+        except ValueError:
+            # a Retry-After HTTP date is not supported
+            pass
+        return random.uniform(0, min(MAX_BACKOFF, BACKOFF * 2 ** attempt))
+
+    def wait_for_rate_limit(self, url):
+        """
+        Wait until a request to the host of `url` is allowed by the rate limit.
+        """
+        if not self.rate:
+            return
+        host = urlparse(url).netloc
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = self.buckets[host] = TokenBucket(self.rate, sleep=self.sleep)
+        bucket.acquire()
+
+
+_fetcher = None
+
+
+def get_fetcher():
+    """
+    Return the shared Fetcher, creating it with the default configuration if
+    needed.
+    """
+    if _fetcher is None:
+        configure()
+    return _fetcher
+
+
+def configure(cache_dir=None, ttl=None, refresh=False, workers=DEFAULT_WORKERS,
+              timeout=None, retries=None, rate=None):
+    """
+    Configure and return the shared Fetcher with a `cache_dir` HTTP cache
+    directory, a `ttl` in seconds, `refresh` to ignore and replace the cached
+    responses, a number of concurrent `workers`, a `timeout` in seconds, a
+    number of `retries` and a `rate` limit of requests per second per host.
+    The environment variables or defaults are used for the unset values.
+    """
+    global _fetcher
+    cache_dir = cache_dir or get_cache_dir()
+    cache = HttpCache(cache_dir) if cache_dir else None
+    if ttl is None:
+        ttl = get_ttl()
+    if timeout is None:
+        timeout = get_env_number('ABOUTCODE_HTTP_TIMEOUT', DEFAULT_TIMEOUT, float)
+    if retries is None:
+        retries = get_env_number('ABOUTCODE_HTTP_RETRIES', DEFAULT_RETRIES)
+    if rate is None:
+        rate = get_env_number('ABOUTCODE_HTTP_RATE', 0, float)
+    _fetcher = Fetcher(
+        cache=cache,
+        ttl=ttl,
+        refresh=refresh,
+        workers=workers,
+        timeout=timeout,
+        retries=retries,
+        rate=rate,
+    )
+    return _fetcher
+
+
+def get(url, headers=None, use_cache=True):
+    """
+    Return a Response for a GET request to `url` with `headers` using the
+    shared Fetcher and its cache if `use_cache` is True.
+    """
+    return get_fetcher().get(url, headers=headers, use_cache=use_cache)
+
+
+def head(url, headers=None):
+    """
+    Return a Response for a HEAD request to `url` with `headers` using the
+    shared Fetcher.
+    """
+    return get_fetcher().head(url, headers=headers)
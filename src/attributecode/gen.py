@@ -27,12 +27,15 @@ from attributecode import Error
 from attributecode import model
 from attributecode import util
 from attributecode.util import add_unc
+from attributecode.util import aggregate_scancode_files
 from attributecode.util import csv
 from attributecode.util import file_fields
 from attributecode.util import invalid_chars
 from attributecode.util import to_posix
 from attributecode.util import UNC_PREFIX_POSIX
+from attributecode.util import ScancodeFiles
 from attributecode.util import load_scancode_json, load_csv, load_json, load_excel
+from attributecode.util import load_scancode_packages
 from attributecode.util import strip_inventory_value
 
 
@@ -118,7 +121,8 @@ def check_about_resource_filename(arp):
     return ''
 
 
-def load_inventory(location, from_attrib=False, base_dir=None, scancode=False, reference_dir=None, worksheet=None):
+def load_inventory(location, from_attrib=False, base_dir=None, scancode=False, reference_dir=None, worksheet=None,
+                   group_by=None, group_depth=1):
     """
     Load the inventory file at `location` for ABOUT and LICENSE files stored in
     the `base_dir`. Return a list of errors and a list of About objects
@@ -126,15 +130,28 @@ def load_inventory(location, from_attrib=False, base_dir=None, scancode=False, r
 
     Optionally use `reference_dir` as the directory location of extra reference
     license and notice files to reuse.
+
+    Optionally aggregate the files of a `scancode` scan with `group_by`
+    "package" or "directory" such that one About object is created for each
+    package or each directory at `group_depth` rather than for each file.
     """
     errors = []
     abouts = []
     is_spreadsheet = False
+    # do not keep the texts of a previous inventory
+    model.clear_text_caches()
 
     if base_dir:
         base_dir = util.to_posix(base_dir)
     if scancode:
-        inventory = load_scancode_json(location)
+        # the scan is streamed as the inventory is loaded
+        inventory = ScancodeFiles(location)
+        if group_by:
+            packages = {}
+            if group_by == 'package':
+                packages = load_scancode_packages(location)
+            inventory = aggregate_scancode_files(
+                inventory, packages=packages, depth=group_depth)
     else:
         if location.endswith('.csv'):
             dup_cols_err = check_duplicated_columns(location)
@@ -154,6 +171,11 @@ def load_inventory(location, from_attrib=False, base_dir=None, scancode=False, r
 
     arp_list = []
     errors = []
+    # errors in the inventory values: no About object is returned if any
+    inventory_errors = []
+    # a missing required field error that stops the loading of About objects
+    missing_field_error = None
+    custom_fields_list = []
 
     if is_spreadsheet:
         # Only the .csv and .xlsx may have newline issue
@@ -161,30 +183,31 @@ def load_inventory(location, from_attrib=False, base_dir=None, scancode=False, r
     else:
         stripped_inv = inventory
 
-    for component in stripped_inv:
+    # check and load each component in a single pass over the inventory such
+    # that a scan is streamed only once
+    for fields in stripped_inv:
         if not from_attrib:
-            if 'about_resource' in component:
-                arp = component['about_resource']
+            if 'about_resource' in fields:
+                arp = fields['about_resource']
                 dup_err = check_duplicated_about_resource(arp, arp_list)
                 if dup_err:
-                    if not dup_err in errors:
-                        errors.append(dup_err)
+                    if not dup_err in inventory_errors:
+                        inventory_errors.append(dup_err)
                 else:
                     arp_list.append(arp)
 
                 invalid_about_filename = check_about_resource_filename(arp)
-                if invalid_about_filename and not invalid_about_filename in errors:
-                    errors.append(invalid_about_filename)
+                if invalid_about_filename and not invalid_about_filename in inventory_errors:
+                    inventory_errors.append(invalid_about_filename)
 
-        newline_in_file_err = check_newline_in_file_field(component)
+        newline_in_file_err = check_newline_in_file_field(fields)
         if newline_in_file_err:
-            errors.extend(newline_in_file_err)
+            inventory_errors.extend(newline_in_file_err)
 
-    if errors:
-        return errors, abouts
+        if inventory_errors or missing_field_error:
+            # only check the rest of the inventory
+            continue
 
-    custom_fields_list = []
-    for fields in stripped_inv:
         # check does the input contains the required fields
         required_fields = model.About.required_fields
 
@@ -195,8 +218,11 @@ def load_inventory(location, from_attrib=False, base_dir=None, scancode=False, r
                 else:
                     msg = "Required field: %(f)r not found in the <input>" % locals(
                     )
-                    errors.append(Error(CRITICAL, msg))
-                    return errors, abouts
+                    missing_field_error = Error(CRITICAL, msg)
+                    break
+        if missing_field_error:
+            continue
+
         # Set about file path to '' if no 'about_resource' is provided from
         # the input
         if 'about_resource' not in fields:
@@ -241,6 +267,13 @@ def load_inventory(location, from_attrib=False, base_dir=None, scancode=False, r
                 errors.append(Error(severity, message))
 
         abouts.append(about)
+
+    if inventory_errors:
+        return inventory_errors, []
+    if missing_field_error:
+        errors.append(missing_field_error)
+        return errors, abouts
+
     if custom_fields_list:
         custom_fields_err_msg = 'Field ' + \
             str(custom_fields_list) + ' is a custom field.'
@@ -253,10 +286,13 @@ def update_about_resource(self):
     pass
 
 
-def generate(location, base_dir, android=None, reference_dir=None, fetch_license=False, fetch_license_djc=False, scancode=False, worksheet=None):
+def generate(location, base_dir, android=None, reference_dir=None, fetch_license=False, fetch_license_djc=False, scancode=False, worksheet=None, license_link=None, licensedb=None):
     """
     Load ABOUT data from a CSV inventory at `location`. Write ABOUT files to
     base_dir. Return errors and about objects.
+    If `license_link` is "hardlink" or "symlink", write each fetched license
+    text once and create the other copies of this text as links.
+    If `licensedb` is a LicenseDB mirror, fetch the licenses from this mirror.
     """
     notice_dict = {}
     api_url = ''
@@ -284,8 +320,9 @@ def generate(location, base_dir, android=None, reference_dir=None, fetch_license
         worksheet=worksheet
     )
     if gen_license:
+        license_writer = model.LicenseFileWriter(link=license_link)
         license_dict, err = model.pre_process_and_fetch_license_dict(
-            abouts, api_url=api_url, api_key=api_key)
+            abouts, api_url=api_url, api_key=api_key, licensedb=licensedb)
         if err:
             for e in err:
                 # Avoid having same error multiple times
@@ -324,7 +361,7 @@ def generate(location, base_dir, android=None, reference_dir=None, fetch_license
             if gen_license:
                 # Write generated LICENSE file
                 license_key_name_context_url_list = about.dump_lic(
-                    dump_loc, license_dict)
+                    dump_loc, license_dict, license_writer=license_writer)
                 if license_key_name_context_url_list:
                     for lic_key, lic_name, lic_filename, lic_context, lic_url, spdx_lic_key in license_key_name_context_url_list:
                         licenses_dict[lic_key] = [
@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# -*- coding: utf8 -*-
+# ============================================================================
+#  Copyright (c) nexB Inc. http://www.nexb.com/ - All rights reserved.
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#      http://www.apache.org/licenses/LICENSE-2.0
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ============================================================================
+
+import json
+import os
+import posixpath
+import tarfile
+import zipfile
+
+from attributecode.util import add_unc
+from attributecode.util import get_spdx_key_and_lic_key
+
+"""
+Offline mirror of the ScanCode LicenseDB.
+
+A mirror is a directory or a .zip or .tar archive with the files of
+https://scancode-licensedb.aboutcode.org/: an index.json and a <key>.json and
+<key>.LICENSE file for each license.
+"""
+
+LICENSEDB_URL = 'https://scancode-licensedb.aboutcode.org/'
+
+LICENSEDB_INDEX = 'index.json'
+
+TAR_EXTENSIONS = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+
+
+class InvalidLicenseDB(Exception):
+    """
+    Raised when a LicenseDB mirror cannot be loaded.
+    """
+
+
+class DirectoryReader(object):
+    """
+    Read the files of a LicenseDB mirror directory.
+    """
+
+    def __init__(self, location):
+        self.location = location
+
+    def read(self, name):
+        """
+        Return the bytes of the file `name` or None if it does not exist.
+        """
+        try:
+            with open(add_unc(os.path.join(self.location, name)), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+
+class ArchiveReader(object):
+    """
+    Read the files of a LicenseDB mirror archive. The index.json may be at
+    the root of the archive or in a top-level directory.
+    """
+
+    def __init__(self, location):
+        if location.lower().endswith('.zip'):
+            self.archive = zipfile.ZipFile(location)
+            members = {m.filename: m for m in self.archive.infolist()}
+            self.extract = self.archive.read
+        else:
+            self.archive = tarfile.open(location)
+            members = {m.name: m for m in self.archive.getmembers() if m.isfile()}
+            self.extract = lambda member: self.archive.extractfile(member).read()
+
+        self.members = members
+        # use the shortest directory of an index.json, which may be the root
+        prefix = None
+        for name in members:
+            if posixpath.basename(name) == LICENSEDB_INDEX:
+                directory = posixpath.dirname(name)
+                if prefix is None or len(directory) < len(prefix):
+                    prefix = directory
+        self.prefix = prefix or ''
+
+    def read(self, name):
+        """
+        Return the bytes of the file `name` or None if it does not exist.
+        """
+        member = self.members.get(posixpath.join(self.prefix, name))
+        if member is None:
+            return None
+        return self.extract(member)
+
+
+class LicenseDB(object):
+    """
+    An in-memory index of a LicenseDB mirror at `location`, a directory or an
+    archive. The index.json is loaded once and the license data and texts
+    are read only when needed.
+    """
+
+    def __init__(self, location):
+        self.location = location
+        try:
+            if os.path.isdir(location):
+                self.reader = DirectoryReader(location)
+            elif location.lower().endswith(('.zip',) + TAR_EXTENSIONS):
+                self.reader = ArchiveReader(location)
+            else:
+                raise InvalidLicenseDB(
+                    'Not a directory, .zip or .tar archive: ' + location)
+
+            index = self.reader.read(LICENSEDB_INDEX)
+            if index is None:
+                raise InvalidLicenseDB(
+                    'No ' + LICENSEDB_INDEX + ' found in: ' + location)
+            licenses_index = json.loads(index)
+        except (OSError, ValueError, zipfile.BadZipFile, tarfile.TarError) as e:
+            raise InvalidLicenseDB(
+                'Cannot load LicenseDB from: ' + location + ': ' + str(e))
+
+        # mapping of {license key: index entry}
+        self.index = {lic['license_key']: lic for lic in licenses_index}
+        # mapping of {spdx license key: license key}
+        self.spdx_keys = get_spdx_key_and_lic_key(licenses_index)
+        # mapping of {license key: license data} for the loaded licenses
+        self.licenses = {}
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def get_license_data(self, key):
+        """
+        Return a mapping of license data for the license `key` or None if this
+        license does not exist or its data cannot be loaded.
+        """
+        if key not in self.index:
+            return None
+        data = self.licenses.get(key)
+        if data is None:
+            name = self.index[key].get('json') or key + '.json'
+            content = self.reader.read(name)
+            if content is None:
+                return None
+            try:
+                data = json.loads(content)
+            except ValueError:
+                return None
+            self.licenses[key] = data
+        return data
+
+    def get_license_text(self, key):
+        """
+        Return the license text for the license `key` or an empty string.
+        """
+        entry = self.index.get(key)
+        if not entry:
+            return ''
+        name = entry.get('license') or key + '.LICENSE'
+        content = self.reader.read(name)
+        if content is None:
+            return ''
+        return content.decode('utf-8', errors='replace')
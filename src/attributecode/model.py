@@ -24,16 +24,22 @@ AboutCode toolkit reads and validates ABOUT files and collect software
 components inventories.
 """
 
+import hashlib
 import json
 import os
 import posixpath
-from requests import get, head, exceptions
+from requests import exceptions
 import traceback
+from collections.abc import MutableMapping
+from functools import lru_cache
+from itertools import chain
 from itertools import zip_longest
 
 from urllib.parse import urljoin
 from urllib.parse import urlparse
 
+from license_expression import LicenseSymbol
+from license_expression import LicenseWithExceptionSymbol
 from license_expression import Licensing
 from packageurl import PackageURL
 
@@ -44,9 +50,16 @@ from attributecode import INFO
 from attributecode import WARNING
 from attributecode import api
 from attributecode import Error
+from attributecode import fetch
 from attributecode import saneyaml
 from attributecode import gen
+from attributecode import parser
 from attributecode import util
+from attributecode.cache import InventoryCache
+from attributecode.cache import file_signature
+from attributecode.fetch import get
+from attributecode.fetch import head
+from attributecode.licensedb import LICENSEDB_URL
 from attributecode.transform import write_excel
 from attributecode.util import add_unc
 from attributecode.util import boolean_fields
@@ -59,8 +72,6 @@ from attributecode.util import get_spdx_key_and_lic_key_from_licdb
 from attributecode.util import is_valid_name
 from attributecode.util import on_windows
 from attributecode.util import norm
-from attributecode.util import replace_tab_with_spaces
-from attributecode.util import wrap_boolean_value
 from attributecode.util import UNC_PREFIX
 from attributecode.util import ungroup_licenses
 from attributecode.util import ungroup_licenses_from_sctk
@@ -74,6 +85,9 @@ class Field(object):
     will alter the value type as needed.
     """
 
+    # fields use slots as there are dozens of them for each About object
+    __slots__ = ('name', 'original_value', 'value', 'required', 'present', '_errors',)
+
     def __init__(self, name=None, value=None, required=False, present=False):
         # normalized names are lowercased per specification
         self.name = name
@@ -93,7 +107,18 @@ class Field(object):
         # True if the field is present in an About object
         self.present = present
 
-        self.errors = []
+        # the list of errors is only created when needed
+        self._errors = None
+
+    @property
+    def errors(self):
+        if self._errors is None:
+            self._errors = []
+        return self._errors
+
+    @errors.setter
+    def errors(self, errors):
+        self._errors = errors or None
 
     def default_value(self):
         return ''
@@ -232,6 +257,8 @@ class StringField(Field):
     The validated value is a string.
     """
 
+    __slots__ = ()
+
     def _validate(self, *args, **kwargs):
         errors = super(StringField, self)._validate(*args, ** kwargs)
         no_special_char_field = [
@@ -281,6 +308,8 @@ class SingleLineField(StringField):
     a string.
     """
 
+    __slots__ = ()
+
     def _validate(self, *args, **kwargs):
         errors = super(SingleLineField, self)._validate(*args, ** kwargs)
         if self.value and isinstance(self.value, str) and '\n' in self.value:
@@ -298,6 +327,8 @@ class ListField(StringField):
     value is a list.
     """
 
+    __slots__ = ()
+
     def default_value(self):
         return []
 
@@ -366,6 +397,8 @@ class PackageUrlField(StringField):
     A Package URL field. The validated value is a purl.
     """
 
+    __slots__ = ()
+
     def _validate(self, *args, **kwargs):
         """
         Check that Package URL is valid. Return a list of errors.
@@ -394,6 +427,8 @@ class UrlListField(ListField):
     A URL field. The validated value is a list of URLs.
     """
 
+    __slots__ = ()
+
     def _validate(self, *args, **kwargs):
         """
         Check that URLs are valid. Return a list of errors.
@@ -422,6 +457,8 @@ class UrlField(StringField):
     A URL field. The validated value is a URL.
     """
 
+    __slots__ = ()
+
     def _validate(self, *args, **kwargs):
         """
         Check that URL is valid. Return a list of errors.
@@ -451,6 +488,19 @@ class PathField(ListField):
     The paths can also be resolved
     """
 
+    __slots__ = (
+        'about_file_path', 'running_inventory', 'base_dir', 'reference_dir',
+        'checked_locations',
+    )
+
+    def __init__(self, *args, ** kwargs):
+        super(PathField, self).__init__(*args, ** kwargs)
+        self.about_file_path = None
+        self.running_inventory = None
+        self.base_dir = None
+        self.reference_dir = None
+        self.checked_locations = None
+
     def default_value(self):
         return {}
 
@@ -467,6 +517,7 @@ class PathField(ListField):
         self.running_inventory = kwargs.get('running_inventory')
         self.base_dir = kwargs.get('base_dir')
         self.reference_dir = kwargs.get('reference_dir')
+        path_index = kwargs.get('path_index')
 
         if self.base_dir:
             self.base_dir = util.to_posix(self.base_dir)
@@ -479,6 +530,8 @@ class PathField(ListField):
         # the value is used as the context of the file
         # dict of normalized paths to a location or None
         paths = {}
+        # list of all the locations checked for existence, found or not
+        self.checked_locations = []
 
         for path_value in self.value:
             p = path_value.split(',')
@@ -530,8 +583,13 @@ class PathField(ListField):
                 location = os.path.abspath(os.path.normpath(location))
                 location = util.to_posix(location)
                 location = add_unc(location)
+                self.checked_locations.append(location)
 
-                if not os.path.exists(location):
+                if path_index:
+                    exists = path_index.exists(location)
+                else:
+                    exists = os.path.exists(location)
+                if not exists:
                     # We don't want to show the UNC_PREFIX in the error message
                     location = util.to_posix(location.strip(UNC_PREFIX))
                     msg = (u'Field %(name)s: Path %(location)s not found'
@@ -555,6 +613,8 @@ class AboutResourceField(PathField):
     the paths resolved relative to the about file path.
     """
 
+    __slots__ = ('resolved_paths',)
+
     def __init__(self, *args, ** kwargs):
         super(AboutResourceField, self).__init__(*args, ** kwargs)
         self.resolved_paths = []
@@ -571,6 +631,8 @@ class IgnoredResourcesField(PathField):
     by the ABOUT file.
     """
 
+    __slots__ = ()
+
     def __init__(self, *args, ** kwargs):
         super(AboutResourceField, self).__init__(*args, ** kwargs)
         self.resolved_paths = []
@@ -580,23 +642,208 @@ class IgnoredResourcesField(PathField):
         return errors
 
 
+class TextStore(object):
+    """
+    An inventory-wide store of texts keyed by the SHA1 of their content such
+    that identical texts (such as the same license text referenced from many
+    ABOUT files) are kept once in memory. The store is cleared when a new
+    inventory is loaded.
+    """
+
+    def __init__(self):
+        # mapping of SHA1 -> text
+        self.texts = {}
+
+    @staticmethod
+    def get_key(text):
+        """
+        Return the content hash key of a `text`.
+        """
+        return hashlib.sha1(text.encode('utf-8', 'surrogatepass')).hexdigest()
+
+    def intern(self, text):
+        """
+        Return the stored text identical to `text`, storing `text` if needed.
+        """
+        if not text:
+            return text
+        return self.texts.setdefault(self.get_key(text), text)
+
+    def get(self, key):
+        """
+        Return the stored text for a content hash `key` or None.
+        """
+        return self.texts.get(key)
+
+    def clear(self):
+        self.texts.clear()
+
+
+# the texts of the license, notice and other files of an inventory
+text_store = TextStore()
+
+# maximum number of file texts and readability checks cached by location
+TEXT_CACHE_SIZE = 1024
+
+
+def get_read_error(location):
+    """
+    Return an error message if the file at `location` cannot be opened for
+    reading or None otherwise. Results are cached such that a file referenced
+    by many ABOUT files is checked once, until this file is modified.
+    """
+    return _get_read_error(location, *file_signature(location))
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def _get_read_error(location, mtime_ns, size):
+    try:
+        with open(add_unc(location), 'rb'):
+            pass
+    except Exception as e:
+        # only keep the first 100 char of the exception
+        return repr(e)[:100]
+
+
+def read_text(location):
+    """
+    Return the text of the file at `location` or None if it cannot be read.
+    Results are cached such that a file referenced by many ABOUT files is read
+    once, until this file is modified, and the texts are interned in the
+    `text_store` such that files with the same content are kept once in memory.
+    """
+    return _read_text(location, *file_signature(location))
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def _read_text(location, mtime_ns, size):
+    try:
+        with open(add_unc(location), encoding='utf-8', errors='replace') as txt:
+            return text_store.intern(txt.read())
+    except Exception:
+        return None
+
+
+def clear_text_caches():
+    """
+    Clear the cached file texts and readability checks and the `text_store`
+    such that the texts of a previous inventory are not kept in memory.
+    """
+    _get_read_error.cache_clear()
+    _read_text.cache_clear()
+    text_store.clear()
+
+
+class LicenseFileWriter(object):
+    """
+    Write license text files. If `link` is "hardlink" or "symlink", each
+    distinct text is written once to disk and the other files with the same
+    text are created as hard links or symbolic links to this first file.
+    Otherwise, each file is written in full.
+    """
+
+    def __init__(self, link=None):
+        self.link = link
+        # mapping of text SHA1 -> location of the first file written
+        self.written = {}
+
+    def write(self, location, text):
+        """
+        Write `text` to a file at `location`, possibly as a link to an
+        existing file with the same text.
+        """
+        key = TextStore.get_key(text)
+        original = self.written.get(key)
+        if self.link and original and original != location:
+            try:
+                if os.path.lexists(location):
+                    os.remove(location)
+                if self.link == 'hardlink':
+                    os.link(original, location)
+                else:
+                    target = os.path.relpath(
+                        original, os.path.dirname(location))
+                    os.symlink(target, location)
+                return
+            except OSError:
+                # links may not be supported: write the file instead
+                pass
+
+        with open(location, mode='w', encoding='utf-8', newline='\n', errors='replace') as lic:
+            lic.write(text)
+        self.written.setdefault(key, location)
+
+
+class FileTexts(MutableMapping):
+    """
+    An ordered mapping of path->text of the files referenced by a
+    FileTextField. The text of a file is only read from its location when
+    accessed. The text is None if there is no location or if the text cannot
+    be read.
+    """
+
+    __slots__ = ('locations', 'texts',)
+
+    def __init__(self, locations):
+        # mapping of path->location or None
+        self.locations = locations
+        # mapping of path->text for the texts that have been explicitly set
+        self.texts = {}
+
+    def __getitem__(self, path):
+        if path in self.texts:
+            return self.texts[path]
+        location = self.locations[path]
+        if location:
+            return read_text(location)
+
+    def __setitem__(self, path, text):
+        if path not in self.locations:
+            self.locations[path] = None
+        self.texts[path] = text
+
+    def __delitem__(self, path):
+        del self.locations[path]
+        self.texts.pop(path, None)
+
+    def __iter__(self):
+        return iter(self.locations)
+
+    def __len__(self):
+        return len(self.locations)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+    def load(self):
+        """
+        Read and keep the texts of all the files such that they are no longer
+        read from their locations, such as before saving these texts.
+        """
+        for path in self.locations:
+            if path not in self.texts:
+                self.texts[path] = self[path]
+
+
 class FileTextField(PathField):
     """
     A path field pointing to one or more text files such as license files.
-    The validated value is an ordered dict of path->Text or None if no
-    location or text could not be loaded.
+    The validated value is an ordered FileTexts mapping of path->Text or None
+    if no location or text could not be loaded.
     """
 
+    __slots__ = ()
+
     def _validate(self, *args, **kwargs):
         """
-        Load and validate the texts referenced by paths fields. Return a list
-        of errors. base_dir is the directory used to resolve a file location
-        from a path.
+        Validate that the texts referenced by paths fields can be read. Return
+        a list of errors. base_dir is the directory used to resolve a file
+        location from a path. The texts are loaded when first accessed.
         """
         errors = super(FileTextField, self)._validate(*args, ** kwargs)
         # a FileTextField is a PathField
         # self.value is a paths to location ordered dict
-        # we will replace the location with the text content
+        # we will replace it with a mapping of path to text content
         name = self.name
         for path, location in self.value.items():
             if not location:
@@ -604,19 +851,13 @@ class FileTextField(PathField):
                 # errors about non existing locations are PathField errors
                 # already collected.
                 continue
-            try:
-                # TODO: we have lots the location by replacing it with a text
-                location = add_unc(location)
-                with open(location, encoding='utf-8', errors='replace') as txt:
-                    text = txt.read()
-                self.value[path] = text
-            except Exception as e:
-                # only keep the first 100 char of the exception
-                emsg = repr(e)[:100]
+            emsg = get_read_error(location)
+            if emsg:
                 msg = (u'Field %(name)s: Failed to load text at path: '
                        u'%(path)s '
                        u'with error: %(emsg)s' % locals())
                 errors.append(Error(ERROR, msg))
+        self.value = FileTexts(self.value)
         # set or reset self
         self.errors = errors
         return errors
@@ -627,6 +868,8 @@ class BooleanField(SingleLineField):
     An flag field with a boolean value. Validated value is False, True or None.
     """
 
+    __slots__ = ('about_file_path',)
+
     def default_value(self):
         return None
 
@@ -726,6 +969,8 @@ class BooleanAndTwoCharactersField(SingleLineField):
     characters). Validated value is False, True, None or character value.
     """
 
+    __slots__ = ('about_file_path',)
+
     def default_value(self):
         return None
 
@@ -820,10 +1065,11 @@ class BooleanAndTwoCharactersField(SingleLineField):
 
 
 def validate_fields(fields, about_file_path, running_inventory, base_dir,
-                    reference_dir=None):
+                    reference_dir=None, path_index=None):
     """
     Validate a sequence of Field objects. Return a list of errors.
     Validation may update the Field objects as needed as a side effect.
+    Use an optional `path_index` PathIndex to check that paths exist.
     """
     errors = []
     for f in fields:
@@ -832,6 +1078,7 @@ def validate_fields(fields, about_file_path, running_inventory, base_dir,
             about_file_path=about_file_path,
             running_inventory=running_inventory,
             reference_dir=reference_dir,
+            path_index=path_index,
         )
         errors.extend(val_err)
     return errors
@@ -857,6 +1104,95 @@ class License:
         self.text = text
 
 
+class LicenseRegistry(object):
+    """
+    Index License objects by license key. The first License added for a key
+    is kept.
+    """
+
+    def __init__(self, licenses=()):
+        # mapping of {license key: License} in the order of addition
+        self.licenses = {}
+        for license in licenses:
+            self.add(license)
+
+    def add(self, license):
+        """
+        Add a `license` License unless a License with the same key exists and
+        return the License registered for this key.
+        """
+        return self.licenses.setdefault(license.key, license)
+
+    def get(self, key, default=None):
+        return self.licenses.get(key, default)
+
+    def __getitem__(self, key):
+        return self.licenses[key]
+
+    def __contains__(self, key):
+        return key in self.licenses
+
+    def __iter__(self):
+        return iter(self.licenses.values())
+
+    def __len__(self):
+        return len(self.licenses)
+
+    def keys(self):
+        return self.licenses.keys()
+
+    def keep(self, keys):
+        """
+        Remove the Licenses whose key is not in the `keys` set.
+        """
+        self.licenses = {
+            key: license for key, license in self.licenses.items()
+            if key in keys}
+
+    def sorted(self):
+        """
+        Return a list of the Licenses sorted by key.
+        """
+        return [self.licenses[key] for key in sorted(self.licenses)]
+
+    def get_name_expression(self, license_expression):
+        """
+        Return the `license_expression` string with the license keys replaced
+        by the license names.
+        """
+        names = []
+        for segment in license_expression.split():
+            license = self.licenses.get(segment)
+            names.append(license.name if license else segment)
+        return ' '.join(names)
+
+
+class FieldDescriptor(object):
+    """
+    Describe a standard field of an About object with a `name`, a Field
+    `field_class` and a `required` flag. As a descriptor, this gives access to
+    the Field object of an About object as an attribute.
+    """
+
+    __slots__ = ('name', 'field_class', 'required',)
+
+    def __init__(self, name, field_class, required=False):
+        self.name = name
+        self.field_class = field_class
+        self.required = required
+
+    def create(self):
+        """
+        Return a new Field object for this field.
+        """
+        return self.field_class(name=self.name, required=self.required)
+
+    def __get__(self, about, owner=None):
+        if about is None:
+            return self
+        return about.fields[self.name]
+
+
 class About(object):
     """
     Represent an ABOUT file and functions to parse and validate a file.
@@ -876,78 +1212,81 @@ class About(object):
     # Required fields
     required_fields = ['name']
 
+    # The schema of the standard fields shared by all About objects, in their
+    # standard ordering. Each standard field is also accessible as an attribute
+    # such as about.name.
+    field_schema = (
+        FieldDescriptor('about_resource', AboutResourceField),
+        FieldDescriptor('ignored_resources', AboutResourceField),
+        FieldDescriptor('name', SingleLineField, required=True),
+        FieldDescriptor('version', SingleLineField),
+
+        FieldDescriptor('download_url', UrlField),
+        FieldDescriptor('description', StringField),
+        FieldDescriptor('homepage_url', UrlField),
+        FieldDescriptor('package_url', PackageUrlField),
+        FieldDescriptor('notes', StringField),
+
+        FieldDescriptor('license_expression', SingleLineField),
+        FieldDescriptor('license_key', ListField),
+        FieldDescriptor('license_name', ListField),
+        FieldDescriptor('license_file', FileTextField),
+        FieldDescriptor('license_url', UrlListField),
+        FieldDescriptor('spdx_license_expression', SingleLineField),
+        FieldDescriptor('spdx_license_key', ListField),
+        FieldDescriptor('declared_license_expression', SingleLineField),
+        FieldDescriptor('other_license_expression', SingleLineField),
+        FieldDescriptor('copyright', StringField),
+        FieldDescriptor('notice_file', FileTextField),
+        FieldDescriptor('notice_url', UrlField),
+
+        FieldDescriptor('redistribute', BooleanField),
+        FieldDescriptor('attribute', BooleanAndTwoCharactersField),
+        FieldDescriptor('track_changes', BooleanField),
+        FieldDescriptor('modified', BooleanField),
+        FieldDescriptor('internal_use_only', BooleanField),
+
+        FieldDescriptor('changelog_file', FileTextField),
+
+        FieldDescriptor('owner', StringField),
+        FieldDescriptor('owner_url', UrlField),
+        FieldDescriptor('contact', StringField),
+        FieldDescriptor('author', StringField),
+        FieldDescriptor('author_file', FileTextField),
+
+        FieldDescriptor('vcs_tool', SingleLineField),
+        FieldDescriptor('vcs_repository', SingleLineField),
+        FieldDescriptor('vcs_path', SingleLineField),
+        FieldDescriptor('vcs_tag', SingleLineField),
+        FieldDescriptor('vcs_branch', SingleLineField),
+        FieldDescriptor('vcs_revision', SingleLineField),
+
+        FieldDescriptor('checksum_md5', SingleLineField),
+        FieldDescriptor('checksum_sha1', SingleLineField),
+        FieldDescriptor('checksum_sha256', SingleLineField),
+        FieldDescriptor('spec_version', SingleLineField),
+    )
+
     def get_required_fields(self):
         return [f for f in self.fields if f.required]
 
     def set_standard_fields(self):
         """
-        Create fields in an ordered dict to keep a standard ordering. We
-        could use a metaclass to track ordering django-like but this approach
-        is simpler.
-        """
-        self.fields = dict([
-            ('about_resource', AboutResourceField()),
-            ('ignored_resources', AboutResourceField()),
-            ('name', SingleLineField(required=True)),
-            ('version', SingleLineField()),
-
-            ('download_url', UrlField()),
-            ('description', StringField()),
-            ('homepage_url', UrlField()),
-            ('package_url', PackageUrlField()),
-            ('notes', StringField()),
-
-            ('license_expression', SingleLineField()),
-            ('license_key', ListField()),
-            ('license_name', ListField()),
-            ('license_file', FileTextField()),
-            ('license_url', UrlListField()),
-            ('spdx_license_expression', SingleLineField()),
-            ('spdx_license_key', ListField()),
-            ('declared_license_expression', SingleLineField()),
-            ('other_license_expression', SingleLineField()),
-            ('copyright', StringField()),
-            ('notice_file', FileTextField()),
-            ('notice_url', UrlField()),
-
-            ('redistribute', BooleanField()),
-            ('attribute', BooleanAndTwoCharactersField()),
-            ('track_changes', BooleanField()),
-            ('modified', BooleanField()),
-            ('internal_use_only', BooleanField()),
-
-            ('changelog_file', FileTextField()),
-
-            ('owner', StringField()),
-            ('owner_url', UrlField()),
-            ('contact', StringField()),
-            ('author', StringField()),
-            ('author_file', FileTextField()),
-
-            ('vcs_tool', SingleLineField()),
-            ('vcs_repository', SingleLineField()),
-            ('vcs_path', SingleLineField()),
-            ('vcs_tag', SingleLineField()),
-            ('vcs_branch', SingleLineField()),
-            ('vcs_revision', SingleLineField()),
-
-            ('checksum_md5', SingleLineField()),
-            ('checksum_sha1', SingleLineField()),
-            ('checksum_sha256', SingleLineField()),
-            ('spec_version', SingleLineField()),
-        ])
-
-        for name, field in self.fields.items():
-            # we could have a hack to get the actual field name
-            # but setting an attribute is explicit and cleaner
-            field.name = name
-            setattr(self, name, field)
-
-    def __init__(self, location=None, about_file_path=None, strict=False):
+        Create the standard fields in a dict, in the standard ordering of the
+        shared `field_schema`.
+        """
+        self.fields = {
+            descriptor.name: descriptor.create()
+            for descriptor in self.field_schema
+        }
+
+    def __init__(self, location=None, about_file_path=None, strict=False,
+                 path_index=None):
         """
         Create an instance.
         If strict is True, raise an Exception on errors. Otherwise the errors
         attribute contains the errors.
+        Use an optional `path_index` PathIndex to check that paths exist.
         """
         self.set_standard_fields()
         self.custom_fields = {}
@@ -963,11 +1302,21 @@ class About(object):
         self.base_dir = None
         if self.location:
             self.base_dir = os.path.dirname(location)
-            self.errors.extend(self.load(location))
+            self.errors.extend(self.load(location, path_index=path_index))
             if strict and self.errors and filter_errors(self.errors):
                 msg = '\n'.join(map(str, self.errors))
                 raise Exception(msg)
 
+    def __getattr__(self, name):
+        # custom fields are also accessible as attributes. Use __dict__ to
+        # avoid a recursion when the object is not yet fully created such as
+        # when unpickled.
+        custom_fields = self.__dict__.get('custom_fields')
+        if custom_fields and name in custom_fields:
+            return custom_fields[name]
+        raise AttributeError(
+            '%r object has no attribute %r' % (self.__class__.__name__, name))
+
     def __repr__(self):
         return repr(self.all_fields())
 
@@ -1062,12 +1411,12 @@ class About(object):
                 # A new, unknown custom field
                 custom_field = Field(name=name, value=value, present=True)
                 self.custom_fields[name] = custom_field
-                # FIXME: why would this ever fail???
+                # custom fields are available as attributes and cannot shadow
+                # an existing attribute
                 try:
                     if name in dir(self):
                         raise Exception(
                             'Illegal field: %(name)r: %(value)r.' % locals())
-                    setattr(self, name, custom_field)
                 except:
                     msg = 'Internal error with custom field: %(name)r: %(value)r.'
                     errors.append(Error(CRITICAL, msg % locals()))
@@ -1079,7 +1428,8 @@ class About(object):
         return errors
 
     def process(self, fields, about_file_path, running_inventory=False,
-                base_dir=None, scancode=False, from_attrib=False, reference_dir=None):
+                base_dir=None, scancode=False, from_attrib=False, reference_dir=None,
+                path_index=None):
         """
         Validate and set as attributes on this About object a sequence of
         `fields` name/value tuples. Return a list of errors.
@@ -1107,11 +1457,12 @@ class About(object):
                 about_file_path,
                 running_inventory,
                 self.base_dir,
-                self.reference_dir)
+                self.reference_dir,
+                path_index=path_index)
             errors.extend(validation_errors)
         return errors
 
-    def load(self, location):
+    def load(self, location, path_index=None):
         """
         Read, parse and process the ABOUT file at `location`.
         Return a list of errors and update self with errors.
@@ -1129,14 +1480,10 @@ class About(object):
                 errors.append(Error(CRITICAL, msg % locals()))
                 self.errors = errors
                 return errors
-            # The 'Yes' and 'No' will be converted to 'True' and 'False' in the yaml.load()
-            # Therefore, we need to wrap the original value in quote to prevent
-            # the conversion
-            pre_input = wrap_boolean_value(input_text)
-            # saneyaml.load() will have parsing error if the input has
-            # tab value. Therefore, we should check if the input contains
-            # any tab and then convert it to spaces.
-            input = replace_tab_with_spaces(pre_input)
+            # The 'Yes' and 'No' would be converted to 'True' and 'False' by
+            # a YAML load. Therefore, the parser wraps the original values of
+            # boolean fields in quote to prevent the conversion. It also
+            # converts any tab to spaces.
             # FIXME: this should be done in the commands, not here
             """
             The running_inventory defines if the current process is 'inventory' or not.
@@ -1148,9 +1495,10 @@ class About(object):
             and then join with the 'about_resource'
             """
             running_inventory = True
-            data = saneyaml.load(input, allow_duplicate_keys=False)
+            data = parser.load(input_text)
             errs = self.load_dict(
-                data, base_dir, running_inventory=running_inventory)
+                data, base_dir, running_inventory=running_inventory,
+                path_index=path_index)
             errors.extend(errs)
         except Exception as e:
             # The trace is good for debugging, but probably not good for user to
@@ -1166,7 +1514,7 @@ class About(object):
     # FIXME: should be a from_dict class factory instead
     # FIXME: running_inventory: remove this : this should be done in the commands, not here
 
-    def load_dict(self, fields_dict, base_dir, scancode=False, from_attrib=False, running_inventory=False, reference_dir=None,):
+    def load_dict(self, fields_dict, base_dir, scancode=False, from_attrib=False, running_inventory=False, reference_dir=None, path_index=None):
         """
         Load this About object file from a `fields_dict` name/value dict.
         Return a list of errors.
@@ -1176,7 +1524,8 @@ class About(object):
 
         if scancode:
             have_copyright = False
-            for key, value in fields:
+            # iterate on a copy as the license_detections field is removed
+            for key, value in list(fields):
                 if not value:
                     continue
                 if key == u'copyrights':
@@ -1257,6 +1606,7 @@ class About(object):
             scancode=scancode,
             from_attrib=from_attrib,
             reference_dir=reference_dir,
+            path_index=path_index,
         )
         self.errors = errors
         return errors
@@ -1489,11 +1839,14 @@ class About(object):
                     notice_context += '\n\n' + lic_file_dict[key] + '\n\n'
         return notice_path, notice_context
 
-    def dump_lic(self, location, license_dict):
+    def dump_lic(self, location, license_dict, license_writer=None):
         """
         Write LICENSE files and return the a list of key, name, context and the url
         as these information are needed for the ABOUT file
+        Use an optional `license_writer` LicenseFileWriter to write the files.
         """
+        if not license_writer:
+            license_writer = LicenseFileWriter()
         license_name = license_context = license_url = ''
         loc = util.to_posix(location)
         parent = posixpath.dirname(loc)
@@ -1542,8 +1895,7 @@ class About(object):
                     license_info = (lic_key, license_name, license_filename,
                                     license_context, license_url, spdx_license_key)
                     license_key_name_context_url.append(license_info)
-                    with open(license_path, mode='w', encoding='utf-8', newline='\n', errors='replace') as lic:
-                        lic.write(license_context)
+                    license_writer.write(license_path, license_context)
                 else:
                     # Invalid license issue is already handled
                     license_info = (lic_key, license_name, license_filename,
@@ -1553,22 +1905,106 @@ class About(object):
         return license_key_name_context_url
 
 
-def collect_inventory(location):
+# give access to each standard field as an About attribute
+for _descriptor in About.field_schema:
+    setattr(About, _descriptor.name, _descriptor)
+
+
+# PathIndex shared by the About objects loaded in a worker process
+_worker_path_index = None
+
+
+def _init_worker(path_index):
+    """
+    Initialize a worker process with a shared `path_index`.
+    """
+    global _worker_path_index
+    _worker_path_index = path_index
+
+
+def _load_about(location_and_path, path_index=None):
+    """
+    Return an About object loaded from a (location, about_file_path) tuple.
+    This is a module-level function such that it can be used in a worker
+    process.
+    """
+    location, about_file_path = location_and_path
+    path_index = path_index or _worker_path_index
+    return About(location, about_file_path, path_index=path_index)
+
+
+def load_abouts(locations_and_paths, processes=1, path_index=None):
+    """
+    Return a list of About objects loaded from a `locations_and_paths` list of
+    (location, about_file_path) tuples, in the same order.
+    Use a pool of `processes` worker processes if `processes` is greater than 1.
+    Use an optional `path_index` PathIndex to check that paths exist.
+    """
+    if processes and processes > 1 and len(locations_and_paths) > 1:
+        import multiprocessing
+        with multiprocessing.Pool(
+                processes=processes,
+                initializer=_init_worker,
+                initargs=(path_index,)) as pool:
+            return pool.map(_load_about, locations_and_paths)
+    return [_load_about(lp, path_index) for lp in locations_and_paths]
+
+
+def collect_inventory(location, processes=1, cache_dir=None, exclude=()):
     """
     Collect ABOUT files at location and return a list of errors and a list of
     About objects.
+    Load the ABOUT files in parallel using `processes` worker processes if
+    `processes` is greater than 1.
+    If a `cache_dir` directory is provided, reuse the About objects cached
+    there for unchanged ABOUT files and cache the other ones.
+    Skip the files and directories matching any of the `exclude` glob patterns
+    or any of the patterns of an .aboutignore file at the root of `location`.
     """
     errors = []
+    # do not keep the texts of a previous inventory
+    clear_text_caches()
     input_location = util.get_absolute(location)
-    about_locations = list(util.get_about_locations(input_location))
+    about_locations = list(
+        util.get_about_locations(input_location, exclude=exclude))
+
+    def get_path_index():
+        # list the directories of the paths referenced in the ABOUT files once
+        # to check that these paths exist without a stat call for each path
+        if locations_and_paths and os.path.isdir(input_location):
+            return util.PathIndex(input_location)
 
     name_errors = util.check_file_names(about_locations)
     errors.extend(name_errors)
     abouts = []
     custom_fields_list = []
-    for about_loc in about_locations:
-        about_file_path = util.get_relative_path(input_location, about_loc)
-        about = About(about_loc, about_file_path)
+    locations_and_paths = [
+        (about_loc, util.get_relative_path(input_location, about_loc))
+        for about_loc in about_locations
+    ]
+    if cache_dir:
+        with InventoryCache(cache_dir) as cache:
+            loaded = [cache.get(loc, afp) for loc, afp in locations_and_paths]
+            to_load = [lp for lp, about in zip(
+                locations_and_paths, loaded) if about is None]
+            newly_loaded = []
+            if to_load:
+                newly_loaded = load_abouts(
+                    to_load, processes=processes, path_index=get_path_index())
+            cache.put_all([
+                (loc, afp, about)
+                for (loc, afp), about in zip(to_load, newly_loaded)
+            ])
+            newly_loaded = iter(newly_loaded)
+            loaded = [
+                next(newly_loaded) if about is None else about
+                for about in loaded
+            ]
+    else:
+        loaded = load_abouts(
+            locations_and_paths, processes=processes,
+            path_index=get_path_index())
+    for (_about_loc, about_file_path), about in zip(locations_and_paths, loaded):
         for severity, message in about.errors:
             if 'Custom Field' in message:
                 field_name = message.replace('Custom Field: ', '').strip()
@@ -1601,11 +2037,7 @@ def collect_abouts_license_expression(location):
             loc = add_unc(loc)
             with open(loc, encoding='utf-8', errors='replace') as txt:
                 input_text = txt.read()
-            # saneyaml.load() will have parsing error if the input has
-            # tab value. Therefore, we should check if the input contains
-            # any tab and then convert it to spaces.
-            input = replace_tab_with_spaces(input_text)
-            data = saneyaml.load(input, allow_duplicate_keys=False)
+            data = parser.load(input_text, wrap_booleans=False)
             about = About()
             about.load_dict(data, base_dir='')
             abouts.append(about)
@@ -1626,12 +2058,14 @@ def collect_inventory_license_expression(location, scancode=False, worksheet=Non
     errors = []
 
     if scancode:
-        inventory = gen.load_scancode_json(location)
+        inventory = util.iter_scancode_json(location)
+        first = next(inventory, None)
         # ScanCode uses 'detected_license_expression'
-        if not 'detected_license_expression' in inventory[0]:
+        if not first or not 'detected_license_expression' in first:
             errors.append(
                 Error(CRITICAL, "No 'license_expressions' field in the input."))
             return errors, abouts
+        inventory = chain([first], inventory)
     else:
         if location.endswith('.csv'):
             inventory = gen.load_csv(location)
@@ -1878,39 +2312,47 @@ def save_as_excel(location, about_dicts):
     write_excel(location, formatted_list)
 
 
-def pre_process_and_fetch_license_dict(abouts, from_check=False, api_url=None, api_key=None, scancode=False, reference=None):
+def pre_process_and_fetch_license_dict(abouts, from_check=False, api_url=None, api_key=None, scancode=False, reference=None, licensedb=None):
     """
     Return a dictionary containing the license information (key, name, text, url)
     fetched from the ScanCode LicenseDB or DejaCode API.
+    If `licensedb` is a LicenseDB mirror, the licenses are looked up in this
+    mirror without any network access.
     """
     key_text_dict = {}
-    captured_license = []
     errors = []
+    lic_urn = ''
     if api_url:
         dje_uri = urlparse(api_url)
         domain = '{uri.scheme}://{uri.netloc}/'.format(uri=dje_uri)
         lic_urn = urljoin(domain, 'urn/?urn=urn:dje:license:')
         url = api_url
     else:
-        url = 'https://scancode-licensedb.aboutcode.org/'
-    if util.have_network_connection():
-        if not valid_api_url(url):
-            msg = u"URL not reachable. Invalid 'URL. License generation is skipped."
+        url = LICENSEDB_URL
+    if not licensedb:
+        if util.have_network_connection():
+            if not valid_api_url(url):
+                msg = u"URL not reachable. Invalid 'URL. License generation is skipped."
+                errors.append(Error(ERROR, msg))
+        else:
+            msg = u'Network problem. Please check your Internet connection. License generation is skipped.'
             errors.append(Error(ERROR, msg))
-    else:
-        msg = u'Network problem. Please check your Internet connection. License generation is skipped.'
-        errors.append(Error(ERROR, msg))
 
     if errors:
         return key_text_dict, errors
 
-    spdx_sclickey_dict = get_spdx_key_and_lic_key_from_licdb()
+    if licensedb:
+        spdx_translator = SpdxTranslator(licensedb.spdx_keys)
+    else:
+        spdx_translator = SpdxTranslator(get_spdx_key_and_lic_key_from_licdb())
+
+    # Collect the expression errors and the unique license keys in the order
+    # of the abouts: the keys are fetched in parallel and the errors are then
+    # reported in this order. None marks the start of an about.
+    plan = []
+    key_afps = {}
     for about in abouts:
-        # No need to go through all the about objects if '--api_key' is invalid
-        auth_error = Error(
-            ERROR, u"Authorization denied. Invalid '--api_key'. License generation is skipped.")
-        if auth_error in errors:
-            break
+        plan.append(None)
 
         if scancode:
             lic_exp = ''
@@ -1943,16 +2385,10 @@ def pre_process_and_fetch_license_dict(abouts, from_check=False, api_url=None, a
                     else:
                         msg = (u"This spdx_license_expression is invalid: " +
                                str(invalid_lic_exp))
-                errors.append(Error(ERROR, msg))
+                plan.append(Error(ERROR, msg))
             else:
-                spdx_lic_exp_segment = about.spdx_license_expression.value.split()
-                for spdx_lic_key in spdx_lic_exp_segment:
-                    if lic_exp_value:
-                        lic_exp_value = lic_exp_value + " " + convert_spdx_expression_to_lic_expression(
-                            spdx_lic_key, spdx_sclickey_dict)
-                    else:
-                        lic_exp_value = convert_spdx_expression_to_lic_expression(
-                            spdx_lic_key, spdx_sclickey_dict)
+                lic_exp_value = spdx_translator.translate(
+                    about.spdx_license_expression.value)
                 if lic_exp_value:
                     about.license_expression.value = lic_exp_value
                     about.license_expression.present = True
@@ -1969,7 +2405,7 @@ def pre_process_and_fetch_license_dict(abouts, from_check=False, api_url=None, a
                 else:
                     msg = (u"The following character(s) cannot be in the declared_license_expression: " +
                            str(special_char_in_expression))
-                errors.append(Error(ERROR, msg))
+                plan.append(Error(ERROR, msg))
             if invalid_lic_exp:
                 if afp:
                     msg = (afp + u": This declared_license_expression is invalid: " +
@@ -1977,7 +2413,7 @@ def pre_process_and_fetch_license_dict(abouts, from_check=False, api_url=None, a
                 else:
                     msg = (u"This declared_license_expression is invalid: " +
                            str(invalid_lic_exp))
-                errors.append(Error(ERROR, msg))
+                plan.append(Error(ERROR, msg))
             if lic_list:
                 lic_exp_list.extend(lic_list)
 
@@ -1991,7 +2427,7 @@ def pre_process_and_fetch_license_dict(abouts, from_check=False, api_url=None, a
                 else:
                     msg = (u"This declared_license_expression is invalid: " +
                            str(invalid_lic_exp))
-                errors.append(Error(ERROR, msg))
+                plan.append(Error(ERROR, msg))
             if invalid_lic_exp:
                 if afp:
                     msg = (afp + u": This other_license_expression is invalid: " +
@@ -1999,7 +2435,7 @@ def pre_process_and_fetch_license_dict(abouts, from_check=False, api_url=None, a
                 else:
                     msg = (u"This other_license_expression is invalid: " +
                            str(invalid_lic_exp))
-                errors.append(Error(ERROR, msg))
+                plan.append(Error(ERROR, msg))
             if lic_list:
                 lic_exp_list.extend(lic_list)
 
@@ -2013,7 +2449,7 @@ def pre_process_and_fetch_license_dict(abouts, from_check=False, api_url=None, a
                 else:
                     msg = (u"The following character(s) cannot be in the license_expression: " +
                            str(special_char_in_expression))
-                errors.append(Error(ERROR, msg))
+                plan.append(Error(ERROR, msg))
             if invalid_lic_exp:
                 if afp:
                     msg = (afp + u": This license_expression is invalid: " +
@@ -2021,137 +2457,315 @@ def pre_process_and_fetch_license_dict(abouts, from_check=False, api_url=None, a
                 else:
                     msg = (u"This license_expression is invalid: " +
                            str(invalid_lic_exp))
-                errors.append(Error(ERROR, msg))
+                plan.append(Error(ERROR, msg))
             if lic_list:
                 lic_exp_list.extend(lic_list)
             if not about.license_key.value:
                 about.license_key.value = lic_list
 
-        if lic_exp_list:
-            for lic_key in lic_exp_list:
-                if not lic_key in captured_license:
-                    lic_url = ''
-                    license_name = ''
-                    license_filename = ''
-                    license_text = ''
-                    spdx_license_key = ''
-                    detail_list = []
-                    captured_license.append(lic_key)
-                    if api_key:
-                        license_data, errs = api.get_license_details_from_api(
-                            url, api_key, lic_key)
-                        # Catch incorrect API URL
-                        if errs:
-                            _, msg = errs[0]
-                            if msg == "Invalid '--api_url'. License generation is skipped.":
-                                errors.extend(errs)
-                                return key_text_dict, errors
-                        for severity, message in errs:
-                            msg = (afp + ": " + message)
-                            errors.append(Error(severity, msg))
-                        # We don't want to actually get the license information from the
-                        # check utility
-                        if from_check:
-                            continue
-                        if not license_data:
-                            continue
-                        license_name = license_data.get('short_name', '')
-                        license_text = license_data.get('full_text', '')
-                        spdx_license_key = license_data.get(
-                            'spdx_license_key', '')
-                        license_filename = lic_key + '.LICENSE'
-                        lic_url = lic_urn + lic_key
-                    else:
-                        license_url = url + lic_key + '.json'
-                        license_text_url = url + lic_key + '.LICENSE'
-                        try:
-                            response = head(license_url)
-                            if response.status_code < 400:
-                                json_url_content = get(
-                                    license_url).text
-                                # We don't want to actually get the license
-                                # information from the check utility
-                                if from_check:
-                                    continue
-                                data = json.loads(json_url_content)
-                                license_name = data['short_name']
-                                license_text = get(
-                                    license_text_url).text
-                                license_filename = data['key'] + '.LICENSE'
-                                lic_url = url + license_filename
-                                spdx_license_key = data['spdx_license_key']
-                            else:
-                                if afp:
-                                    msg = afp + u" : Invalid 'license': " + lic_key
-                                else:
-                                    msg = u"Invalid 'license': " + lic_key
-                                errors.append(Error(ERROR, msg))
-                                continue
-                        except exceptions.RequestException as e:
-                            msg = f"An error occurred while trying to access the URL: {e}"
-                            errors.append(Error(ERROR, msg))
-                    if not from_check:
-                        detail_list.append(license_name)
-                        detail_list.append(license_filename)
-                        detail_list.append(license_text)
-                        detail_list.append(lic_url)
-                        detail_list.append(spdx_license_key)
-                        key_text_dict[lic_key] = detail_list
+        for lic_key in lic_exp_list:
+            if lic_key not in key_afps:
+                key_afps[lic_key] = afp
+                plan.append(lic_key)
+
+    bulk_licenses_data = {}
+    lic_keys = list(key_afps)
+    if api_key and lic_keys:
+        # Request many keys per API call and fetch the others one at a time
+        bulk_licenses_data = api.request_licenses_data(url, api_key, lic_keys)
+
+    def fetch_license(lic_key):
+        return fetch_license_details(
+            lic_key, key_afps[lic_key], url, api_key=api_key, lic_urn=lic_urn,
+            licensedb=licensedb, from_check=from_check,
+            license_data=bulk_licenses_data.get(lic_key))
+
+    results = {}
+    if lic_keys:
+        # Fetch the first license alone to stop early on an invalid API URL
+        first, others = lic_keys[0], lic_keys[1:]
+        results[first] = fetch_license(first)
+        if not results[first][2]:
+            if licensedb:
+                details = map(fetch_license, others)
+            else:
+                details = fetch.get_fetcher().map(fetch_license, others)
+            results.update(zip(others, details))
+
+    auth_error = Error(
+        ERROR, u"Authorization denied. Invalid '--api_key'. License generation is skipped.")
+    for item in plan:
+        if item is None:
+            # No need to go through all the about objects if '--api_key' is invalid
+            if auth_error in errors:
+                break
+        elif isinstance(item, Error):
+            errors.append(item)
+        else:
+            detail_list, errs, invalid_api_url = results[item]
+            errors.extend(errs)
+            if invalid_api_url:
+                return key_text_dict, errors
+            if detail_list:
+                key_text_dict[item] = detail_list
     return key_text_dict, errors
 
 
+def fetch_license_details(lic_key, afp, url, api_key=None, lic_urn='', licensedb=None, from_check=False, license_data=None):
+    """
+    Return a tuple of (list of license details or None, list of errors,
+    invalid API URL flag) for a `lic_key` license referenced first in the
+    ABOUT file at `afp`. The details are fetched from the DejaCode API at
+    `url` if `api_key` is set, from a `licensedb` LicenseDB mirror if set or
+    from the ScanCode LicenseDB at `url` otherwise. If `from_check` is True,
+    only check that the license exists and return no details.
+    Use the `license_data` DejaCode API license data if already fetched.
+    """
+    lic_url = ''
+    license_name = ''
+    license_filename = ''
+    license_text = ''
+    spdx_license_key = ''
+    errors = []
+    if api_key:
+        if license_data:
+            errs = []
+        else:
+            license_data, errs = api.get_license_details_from_api(
+                url, api_key, lic_key)
+        # Catch incorrect API URL
+        if errs:
+            _, msg = errs[0]
+            if msg == "Invalid '--api_url'. License generation is skipped.":
+                return None, errs, True
+        for severity, message in errs:
+            msg = (afp + ": " + message)
+            errors.append(Error(severity, msg))
+        # We don't want to actually get the license information from the
+        # check utility
+        if from_check:
+            return None, errors, False
+        if not license_data:
+            return None, errors, False
+        license_name = license_data.get('short_name', '')
+        license_text = license_data.get('full_text', '')
+        spdx_license_key = license_data.get(
+            'spdx_license_key', '')
+        license_filename = lic_key + '.LICENSE'
+        lic_url = lic_urn + lic_key
+    elif licensedb:
+        if lic_key not in licensedb:
+            if afp:
+                msg = afp + u" : Invalid 'license': " + lic_key
+            else:
+                msg = u"Invalid 'license': " + lic_key
+            errors.append(Error(ERROR, msg))
+            return None, errors, False
+        if from_check:
+            return None, errors, False
+        data = licensedb.get_license_data(lic_key)
+        if not data:
+            msg = u"No license data in the LicenseDB for: " + lic_key
+            errors.append(Error(ERROR, msg))
+            return None, errors, False
+        license_name = data['short_name']
+        license_text = licensedb.get_license_text(lic_key)
+        license_filename = data['key'] + '.LICENSE'
+        lic_url = url + license_filename
+        spdx_license_key = data['spdx_license_key']
+    else:
+        license_url = url + lic_key + '.json'
+        license_text_url = url + lic_key + '.LICENSE'
+        try:
+            response = get(license_url)
+            if response.status_code >= 500:
+                # a server error that persisted after retries
+                msg = (u"Server error %d while fetching license: %s" %
+                       (response.status_code, lic_key))
+                errors.append(Error(ERROR, msg))
+                return None, errors, False
+            elif response.status_code < 400:
+                # We don't want to actually get the license
+                # information from the check utility
+                if from_check:
+                    return None, errors, False
+                data = json.loads(response.text)
+                license_name = data['short_name']
+                text_response = get(license_text_url)
+                if text_response.status_code >= 400:
+                    msg = (u"Error %d while fetching license text: %s" %
+                           (text_response.status_code, lic_key))
+                    errors.append(Error(ERROR, msg))
+                    return None, errors, False
+                license_text = text_response.text
+                license_filename = data['key'] + '.LICENSE'
+                lic_url = url + license_filename
+                spdx_license_key = data['spdx_license_key']
+            else:
+                if afp:
+                    msg = afp + u" : Invalid 'license': " + lic_key
+                else:
+                    msg = u"Invalid 'license': " + lic_key
+                errors.append(Error(ERROR, msg))
+                return None, errors, False
+        except exceptions.RequestException as e:
+            msg = f"An error occurred while trying to access the URL: {e}"
+            errors.append(Error(ERROR, msg))
+    if from_check:
+        return None, errors, False
+    detail_list = [
+        license_name,
+        license_filename,
+        text_store.intern(license_text),
+        lic_url,
+        spdx_license_key,
+    ]
+    return detail_list, errors, False
+
+
 def convert_spdx_expression_to_lic_expression(spdx_key, spdx_lic_dict):
     """
     Translate the spdx_license_expression to license_expression and return
     errors if spdx_license_key is not matched
     """
-    value = ""
-    if spdx_key in spdx_lic_dict:
-        value = spdx_lic_dict[spdx_key]
-    else:
-        if spdx_key.startswith('('):
-            mod_key = spdx_key.partition('(')[2]
-            value = '(' + \
-                convert_spdx_expression_to_lic_expression(
-                    mod_key, spdx_lic_dict)
-        elif spdx_key.endswith(')'):
-            mod_key = spdx_key.rpartition(')')[0]
-            value = convert_spdx_expression_to_lic_expression(
-                mod_key, spdx_lic_dict) + ')'
+    return get_spdx_translator(spdx_lic_dict).translate(spdx_key)
+
+
+# a list of the last (spdx_keys mapping, number of keys, SpdxTranslator) used
+_spdx_translator = []
+
+
+def get_spdx_translator(spdx_keys):
+    """
+    Return an SpdxTranslator for a `spdx_keys` mapping, reusing the translator
+    and its translations of the previous call with the same unchanged mapping.
+    """
+    if _spdx_translator:
+        cached_keys, size, translator = _spdx_translator
+        if cached_keys is spdx_keys and size == len(spdx_keys):
+            return translator
+    translator = SpdxTranslator(spdx_keys)
+    _spdx_translator[:] = [spdx_keys, len(spdx_keys), translator]
+    return translator
+
+
+# the Licensing shared by all the license expression parsing
+licensing = Licensing()
+
+
+class SpdxTranslator(object):
+    """
+    Translate SPDX license expressions to ScanCode license expressions using a
+    `spdx_keys` mapping of {SPDX license key: ScanCode license key} such as
+    built from the LicenseDB index with its "other_spdx_license_keys".
+    SPDX keys are matched case-insensitively and the keys without a match
+    are kept as-is. Each distinct expression is translated once.
+    """
+
+    def __init__(self, spdx_keys):
+        self.spdx_keys = dict(spdx_keys)
+        self.spdx_keys_lower = {
+            spdx_key.lower(): key for spdx_key, key in self.spdx_keys.items()}
+        # mapping of {SPDX expression: translated expression}
+        self.translations = {}
+
+    def get_key(self, spdx_key):
+        """
+        Return the ScanCode license key for an `spdx_key` or `spdx_key`.
+        """
+        key = self.spdx_keys.get(spdx_key)
+        if key is None:
+            key = self.spdx_keys_lower.get(spdx_key.lower(), spdx_key)
+        return key
+
+    def translate(self, spdx_expression):
+        """
+        Return a ScanCode license expression string translated from an
+        `spdx_expression` string, or the `spdx_expression` if it cannot be
+        parsed.
+        """
+        translation = self.translations.get(spdx_expression)
+        if translation is None:
+            translation = self.translations[spdx_expression] = self._translate(
+                spdx_expression)
+        return translation
+
+    def _translate(self, spdx_expression):
+        try:
+            parsed = licensing.parse(spdx_expression)
+        except Exception:
+            return spdx_expression
+        if parsed is None:
+            return spdx_expression
+
+        substitutions = {}
+        for symbol in licensing.license_symbols(parsed, unique=True, decompose=False):
+            if isinstance(symbol, LicenseWithExceptionSymbol):
+                substitutions[symbol] = LicenseWithExceptionSymbol(
+                    license_symbol=LicenseSymbol(
+                        self.get_key(symbol.license_symbol.key)),
+                    exception_symbol=LicenseSymbol(
+                        self.get_key(symbol.exception_symbol.key)),
+                )
+            else:
+                substitutions[symbol] = LicenseSymbol(self.get_key(symbol.key))
+
+        if isinstance(parsed, (LicenseSymbol, LicenseWithExceptionSymbol)):
+            parsed = substitutions[parsed]
         else:
-            # This can be operator or key that don't have match
-            value = spdx_key
-    return value
+            parsed = parsed.subs(substitutions)
+        return parsed.render()
+
+
+# maximum number of parsed license expressions cached
+EXPRESSION_CACHE_SIZE = 4096
+
+# characters that are not supported in a license expression
+not_support_char = [
+    '!', '@', '#', '$', '^', '&', '*', '=', '{', '}',
+    '|', '[', ']', '\\', ':', ';', '<', '>', '?', ',', '/']
+not_support_char_set = frozenset(not_support_char)
 
 
 def parse_license_expression(lic_expression):
-    licensing = Licensing()
-    lic_list = []
+    """
+    Return a tuple of (list of unsupported special characters, list of license
+    keys, invalid expression or empty string) for a `lic_expression` string.
+    The same expressions are repeated across an inventory and are parsed once.
+    """
+    special_char, lic_list, invalid_lic_exp = _parse_license_expression(
+        lic_expression)
+    return list(special_char), list(lic_list), invalid_lic_exp
+
+
+@lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def _parse_license_expression(lic_expression):
+    lic_list = ()
     invalid_lic_exp = ''
-    special_char = detect_special_char(lic_expression)
+    special_char = tuple(detect_special_char(lic_expression))
     if not special_char:
         # Parse the license expression and save it into a list
         try:
-            lic_list = licensing.license_keys(lic_expression)
+            lic_list = tuple(licensing.license_keys(lic_expression))
         except:
             invalid_lic_exp = lic_expression
     return special_char, lic_list, invalid_lic_exp
 
 
 def detect_special_char(expression):
-    not_support_char = [
-        '!', '@', '#', '$', '^', '&', '*', '=', '{', '}',
-        '|', '[', ']', '\\', ':', ';', '<', '>', '?', ',', '/']
-    special_character = []
-    for char in not_support_char:
-        if char in expression:
-            special_character.append(char)
-    return special_character
+    """
+    Return a list of the unsupported special characters found in an
+    `expression` string, in the `not_support_char` order.
+    """
+    found = not_support_char_set.intersection(expression)
+    if not found:
+        return []
+    return [char for char in not_support_char if char in found]
 
 
 def valid_api_url(api_url):
     try:
-        response = get(api_url)
+        response = head(api_url)
         # The 403 error code is expected if the api_url is pointing to DJE as no
         # API key is provided. The 200 status code represent connection success
         # to scancode's LicenseDB. All other exception yield to invalid api_url
@@ -0,0 +1,333 @@
+#!/usr/bin/env python
+# -*- coding: utf8 -*-
+# ============================================================================
+#  Copyright (c) nexB Inc. http://www.nexb.com/ - All rights reserved.
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#      http://www.apache.org/licenses/LICENSE-2.0
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ============================================================================
+
+import re
+
+from attributecode import saneyaml
+from attributecode.util import boolean_fields
+from attributecode.util import replace_tab_with_spaces
+from attributecode.util import wrap_boolean_value
+
+"""
+Fast parser for the subset of YAML used in ABOUT files: a flat mapping of
+`key: value` pairs with plain or quoted scalars, literal block scalars and
+lists of scalars or of flat mappings (such as the `licenses` list).
+
+Anything else is parsed with saneyaml such that the results are always the same
+as with saneyaml.
+"""
+
+# a simple mapping key followed by a colon and an optional value
+key_value = re.compile(r'^([A-Za-z0-9_][A-Za-z0-9_.\-]*):(?: +(.*))?$').match
+
+# the YAML 1.1 booleans as resolved by the YAML loader
+yaml_booleans = {
+    'yes': True, 'no': False,
+    'true': True, 'false': False,
+    'on': True, 'off': False,
+}
+is_yaml_boolean = re.compile(
+    r'^(?:yes|Yes|YES|no|No|NO|true|True|TRUE|false|False|FALSE'
+    r'|on|On|ON|off|Off|OFF)$').match
+
+# characters that have a special meaning at the start of a plain scalar
+indicators = set('-?:,[]{}#&*!|>\'"%@`')
+
+# characters that are not accepted in a YAML stream
+has_non_printable = re.compile(
+    '[^\x09\x0A\x0D\x20-\x7E\x85\xA0-\uD7FF\uE000-\uFFFD\U00010000-\U0010ffff]'
+).search
+
+
+class UnsupportedSyntax(Exception):
+    """
+    Raised for YAML constructs that are not handled by the fast parser.
+    """
+
+
+def load(text, wrap_booleans=True):
+    """
+    Return a mapping loaded from an ABOUT file `text`.
+
+    This is the same as loading with saneyaml the text processed with
+    `wrap_boolean_value` (if `wrap_booleans` is True) and
+    `replace_tab_with_spaces`, but the common ABOUT file syntax is parsed
+    in a single pass without YAML. Raise an Exception if the text is not valid
+    YAML, or if it contains duplicated keys.
+    """
+    try:
+        return fast_load(text, wrap_booleans=wrap_booleans)
+    except UnsupportedSyntax:
+        if wrap_booleans:
+            text = wrap_boolean_value(text)
+        text = replace_tab_with_spaces(text)
+        return saneyaml.load(text, allow_duplicate_keys=False)
+
+
+def indentation(line):
+    """
+    Return the number of leading spaces of a `line`.
+    """
+    return len(line) - len(line.lstrip(' '))
+
+
+def is_blank(line):
+    return not line.strip(' ')
+
+
+def parse_scalar(value):
+    """
+    Return a string or boolean parsed from a stripped single line scalar
+    `value` or raise an UnsupportedSyntax.
+    """
+    if not value:
+        # null values are loaded as empty strings by saneyaml
+        return ''
+
+    first = value[0]
+    if first == "'":
+        inner = value[1:-1]
+        if len(value) < 2 or value[-1] != "'" or "'" in inner.replace("''", ''):
+            raise UnsupportedSyntax(value)
+        return inner.replace("''", "'")
+
+    if first == '"':
+        inner = value[1:-1]
+        if len(value) < 2 or value[-1] != '"' or '"' in inner or '\\' in inner:
+            raise UnsupportedSyntax(value)
+        return inner
+
+    if (first in indicators
+            or ': ' in value
+            or ' #' in value
+            or value.endswith(':')
+            or value in ('=', '<<')):
+        raise UnsupportedSyntax(value)
+
+    if is_yaml_boolean(value):
+        return yaml_booleans[value.lower()]
+    return value
+
+
+def parse_key_value(line):
+    """
+    Return a (key, value) tuple from a `key: value` `line` where value is None
+    if empty or raise an UnsupportedSyntax.
+    """
+    match = key_value(line)
+    if not match:
+        raise UnsupportedSyntax(line)
+    key, value = match.groups()
+    if is_yaml_boolean(key):
+        raise UnsupportedSyntax(line)
+    if value is not None:
+        value = value.strip(' ') or None
+    return key, value
+
+
+def fast_load(text, wrap_booleans=True):
+    """
+    Return a mapping loaded from an ABOUT file `text` or raise an
+    UnsupportedSyntax if the text uses YAML constructs that are not supported.
+    """
+    if has_non_printable(text):
+        raise UnsupportedSyntax(text)
+
+    lines = text.splitlines()
+    for i, line in enumerate(lines):
+        if '\t' in line:
+            lines[i] = line.replace('\t', '    ')
+
+    data = {}
+    count = len(lines)
+    i = 0
+    while i < count:
+        line = lines[i]
+        i += 1
+        if not line.strip(' ') or line[0] == '#':
+            continue
+
+        key, value = parse_key_value(line)
+        if key in data:
+            # let the YAML loader report duplicated keys
+            raise UnsupportedSyntax(key)
+
+        plain = False
+        if wrap_booleans and key in boolean_fields:
+            # the value is wrapped in double quotes by wrap_boolean_value
+            value = line.partition(':')[2].strip()
+            if '"' in value or '\\' in value:
+                raise UnsupportedSyntax(line)
+            data[key] = value
+        elif value == '|':
+            value, i = parse_literal_block(lines, i)
+            data[key] = value
+            continue
+        elif value is None:
+            j = next_content_line(lines, i)
+            if j < count and lines[j][indentation(lines[j]):][:1] == '-':
+                value, i = parse_sequence(lines, j)
+                data[key] = value
+                continue
+            data[key] = ''
+        else:
+            data[key] = parse_scalar(value)
+            plain = value[0] not in '\'"'
+
+        # only a plain scalar can continue on the next indented lines
+        j = next_content_line(lines, i)
+        if j < count and lines[j][0] == ' ':
+            if not plain:
+                raise UnsupportedSyntax(lines[j])
+            data[key], i = parse_plain_continuation(value, lines, i)
+
+    if not data:
+        raise UnsupportedSyntax(text)
+    return data
+
+
+def next_content_line(lines, i):
+    """
+    Return the index of the first line that is not blank starting at `i`.
+    """
+    count = len(lines)
+    while i < count and not lines[i].strip(' '):
+        i += 1
+    return i
+
+
+def parse_plain_continuation(value, lines, i):
+    """
+    Return a tuple of (string, index of the next line) for a plain scalar that
+    starts with a `value` and continues on the indented lines starting at line
+    `i`. Line breaks are folded to a space and empty lines to a newline.
+    """
+    parts = [value]
+    empties = 0
+    count = len(lines)
+    while i < count:
+        line = lines[i]
+        if is_blank(line):
+            empties += 1
+            i += 1
+            continue
+        if not line.startswith(' '):
+            break
+        text = line.strip(' ')
+        if (text.startswith('#')
+                or ' #' in text
+                or ': ' in text
+                or text.endswith(':')):
+            raise UnsupportedSyntax(line)
+        parts.append('\n' * empties if empties else ' ')
+        parts.append(text)
+        empties = 0
+        i += 1
+    return ''.join(parts), i
+
+
+def parse_literal_block(lines, i):
+    """
+    Return a tuple of (string, index of the next line) for a literal block
+    scalar starting at line `i` with the default "clip" chomping.
+    """
+    block = []
+    block_indent = None
+    count = len(lines)
+    while i < count:
+        line = lines[i]
+        if is_blank(line):
+            if block_indent is not None and len(line) > block_indent:
+                raise UnsupportedSyntax(line)
+            block.append(line)
+            i += 1
+            continue
+
+        indent = indentation(line)
+        if block_indent is None:
+            if not indent:
+                break
+            if any(len(empty) > indent for empty in block):
+                raise UnsupportedSyntax(line)
+            block_indent = indent
+        elif indent < block_indent:
+            if indent:
+                raise UnsupportedSyntax(line)
+            break
+        block.append(line)
+        i += 1
+
+    block = [line[block_indent:] if block_indent else '' for line in block]
+    while block and not block[-1]:
+        block.pop()
+    if not block:
+        return '', i
+    return '\n'.join(block) + '\n', i
+
+
+def parse_sequence(lines, i):
+    """
+    Return a tuple of (list, index of the next line) for a block sequence of
+    scalars or of flat mappings starting at line `i`.
+    """
+    items = []
+    count = len(lines)
+    seq_indent = indentation(lines[i])
+    while i < count:
+        line = lines[i]
+        if is_blank(line):
+            i += 1
+            continue
+        indent = indentation(line)
+        if indent < seq_indent and not indent:
+            break
+        if indent != seq_indent or line[indent:indent + 2] != '- ':
+            if indent == seq_indent == 0:
+                break
+            raise UnsupportedSyntax(line)
+
+        content = line[indent + 1:]
+        item_indent = indent + 1 + indentation(content)
+        content = content.strip(' ')
+        i += 1
+        if not content:
+            raise UnsupportedSyntax(line)
+
+        if key_value(content):
+            item = {}
+            key, value = parse_key_value(content)
+            item[key] = parse_scalar(value or '')
+            while i < count:
+                line = lines[i]
+                if is_blank(line):
+                    i += 1
+                    continue
+                indent = indentation(line)
+                if indent > item_indent:
+                    raise UnsupportedSyntax(line)
+                if indent < item_indent:
+                    break
+                key, value = parse_key_value(line[indent:])
+                if key in item:
+                    raise UnsupportedSyntax(line)
+                item[key] = parse_scalar(value or '')
+                i += 1
+            items.append(item)
+        else:
+            items.append(parse_scalar(content))
+            j = next_content_line(lines, i)
+            if j < count and indentation(lines[j]) > seq_indent:
+                raise UnsupportedSyntax(lines[j])
+    return items, i
@@ -17,6 +17,7 @@ from collections import OrderedDict
 
 import codecs
 import csv
+import fnmatch
 import json
 import ntpath
 import openpyxl
@@ -150,11 +151,115 @@ def get_absolute(location):
     return location
 
 
-def get_locations(location):
+# name of a file at the root of a tree with patterns of paths to ignore
+ABOUT_IGNORE_FILE = '.aboutignore'
+
+
+def load_ignore_patterns(location):
+    """
+    Return a list of ignore patterns loaded from the ignore file at `location`
+    with one pattern per line. Empty lines and lines starting with # are
+    ignored. Return an empty list if there is no such file.
+    """
+    location = add_unc(location)
+    if not os.path.isfile(location):
+        return []
+    with open(location, encoding='utf-8', errors='replace') as ignore_file:
+        return [line.strip() for line in ignore_file
+                if line.strip() and not line.strip().startswith('#')]
+
+
+def compile_ignore_patterns(patterns):
+    """
+    Return a list of (regex, match_path, directory_only) tuples from a list of
+    glob `patterns` where:
+     - a pattern ending with a / only matches directories,
+     - a pattern containing a / matches the path relative to the walked root,
+     - any other pattern matches a file or directory name.
+    """
+    compiled = []
+    for pattern in patterns:
+        pattern = to_posix(pattern.strip())
+        directory_only = pattern.endswith('/')
+        pattern = pattern.strip('/')
+        if not pattern:
+            continue
+        match_path = '/' in pattern
+        compiled.append(
+            (re.compile(fnmatch.translate(pattern)), match_path, directory_only))
+    return compiled
+
+
+def is_ignored(name, path, is_dir, ignore_patterns):
+    """
+    Return True if a file or directory with a `name` and a `path` relative to
+    the walked root matches any of the compiled `ignore_patterns`.
+    """
+    for regex, match_path, directory_only in ignore_patterns:
+        if directory_only and not is_dir:
+            continue
+        if regex.match(path if match_path else name):
+            return True
+    return False
+
+
+def walk_locations(location, exclude=(), name_filter=None):
+    """
+    Yield the locations of the files found in the directory tree at `location`
+    using posix path separators. Only yield the files whose name is accepted by
+    a `name_filter` callable if provided.
+
+    Directories and files matching any of the `exclude` glob patterns or any of
+    the patterns of the .aboutignore file at the root of the tree are skipped
+    and excluded directories are not walked. Symlinked directories are not
+    walked either.
+    """
+    root = to_posix(location).rstrip('/')
+    patterns = list(exclude or [])
+    patterns.extend(
+        load_ignore_patterns(os.path.join(location, ABOUT_IGNORE_FILE)))
+    ignore_patterns = compile_ignore_patterns(patterns)
+
+    # walk top-down, depth first, in the same order as os.walk
+    directories = [(root, '')]
+    while directories:
+        directory, rel_dir = directories.pop()
+        try:
+            with os.scandir(add_unc(to_native(directory))) as entries:
+                entries = list(entries)
+        except OSError:
+            continue
+
+        subdirs = []
+        for entry in entries:
+            name = entry.name
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+
+            if ignore_patterns:
+                rel_path = rel_dir + '/' + name if rel_dir else name
+                if is_ignored(name, rel_path, is_dir, ignore_patterns):
+                    continue
+            else:
+                rel_path = None
+
+            if is_dir:
+                if not entry.is_symlink():
+                    subdirs.append((directory + '/' + name, rel_path))
+            elif not name_filter or name_filter(name):
+                yield directory + '/' + name
+
+        directories.extend(reversed(subdirs))
+
+
+def get_locations(location, exclude=()):
     """
     Return a list of locations of files given the `location` of a
     a file or a directory tree containing ABOUT files.
     File locations are normalized using posix path separators.
+    Skip the files and directories matching any of the `exclude` patterns.
     """
     location = add_unc(location)
     location = get_absolute(location)
@@ -163,23 +268,112 @@ def get_locations(location):
     if os.path.isfile(location):
         yield location
     else:
-        for base_dir, _, files in os.walk(location):
-            for name in files:
-                bd = to_posix(base_dir)
-                yield posixpath.join(bd, name)
+        for loc in walk_locations(location, exclude=exclude):
+            yield loc
 
 
-def get_about_locations(location):
+def is_about_file_name(name):
+    """
+    Return True if a file `name` has an ABOUT file extension.
+    """
+    return name[-6:].lower() == '.about'
+
+
+def get_about_locations(location, exclude=()):
     """
     Return a list of locations of ABOUT files given the `location` of a
     a file or a directory tree containing ABOUT files.
     File locations are normalized using posix path separators.
+    Skip the files and directories matching any of the `exclude` patterns.
     """
-    for loc in get_locations(location):
-        if is_about_file(loc):
+    location = add_unc(location)
+    location = get_absolute(location)
+    assert os.path.exists(location)
+
+    if os.path.isfile(location):
+        if is_about_file(location):
+            yield location
+    else:
+        for loc in walk_locations(
+                location, exclude=exclude, name_filter=is_about_file_name):
             yield loc
 
 
+def strip_unc(location):
+    """
+    Return a `location` without its eventual UNC prefix.
+    """
+    if location.startswith(UNC_PREFIXES):
+        return location[len(UNC_PREFIX):]
+    return location
+
+
+class PathIndex(object):
+    """
+    An in-memory index of the entries of the directories under a `root`
+    directory. Each directory is listed once with os.scandir, only when a path
+    in this directory is checked. This is used to check that the paths
+    referenced in ABOUT files exist with a set lookup rather than with a stat
+    call, without walking the whole tree (including the excluded and ignored
+    paths).
+
+    Paths outside of the indexed root and paths not found in the index (such as
+    paths in a different case on a case-insensitive filesystem) are checked on
+    the filesystem.
+    """
+
+    def __init__(self, root):
+        self.root = to_posix(strip_unc(get_absolute(root))).rstrip('/')
+        # mapping of {directory path: set of entry names or None if the
+        # directory cannot be listed}
+        self.directories = {}
+
+    def list_directory(self, directory):
+        """
+        Return a set of the names of the existing entries of `directory` or
+        None if this directory cannot be listed.
+        """
+        try:
+            return self.directories[directory]
+        except KeyError:
+            pass
+        names = None
+        try:
+            entries = list(os.scandir(add_unc(to_native(directory))))
+        except OSError:
+            entries = None
+        if entries is not None:
+            names = set()
+            for entry in entries:
+                try:
+                    if entry.is_symlink() and not os.path.exists(entry.path):
+                        # broken links do not exist for os.path.exists
+                        continue
+                except OSError:
+                    continue
+                names.add(entry.name)
+        self.directories[directory] = names
+        return names
+
+    def is_indexed(self, location):
+        """
+        Return True if `location` is under the indexed root.
+        """
+        return location.startswith(self.root + '/')
+
+    def exists(self, location):
+        """
+        Return True if the absolute and normalized `location` exists.
+        """
+        path = to_posix(strip_unc(location)).rstrip('/')
+        if self.is_indexed(path):
+            directory, _, name = path.rpartition('/')
+            names = self.list_directory(directory)
+            if names and name in names:
+                return True
+        return os.path.exists(location)
+
+
 def norm(p):
     """
     Normalize the path
@@ -198,7 +392,7 @@ def get_spdx_key_and_lic_key_from_licdb():
     "spdx_license_key" will be the key of the dictionary and the "license_key"
     will be the value of the directionary
     """
-    import requests
+    from attributecode.fetch import get
     lic_dict = dict()
 
     # URL of the license index
@@ -221,18 +415,27 @@ def get_spdx_key_and_lic_key_from_licdb():
         "license": "bsd-new.LICENSE"
     },
     """
-    response = requests.get(url)
+    response = get(url)
     # Check if the request was successful (status code 200)
     if response.status_code == 200:
         # Retrieve the JSON data from the response
         licenses_index = response.json()
+        lic_dict = get_spdx_key_and_lic_key(licenses_index)
+
+    return lic_dict
 
-        for license in licenses_index:
-            lic_dict[license['spdx_license_key']] = license['license_key']
-            if license['other_spdx_license_keys']:
-                for other_spdx in license['other_spdx_license_keys']:
-                    lic_dict[other_spdx] = license['license_key']
 
+def get_spdx_key_and_lic_key(licenses_index):
+    """
+    Return a dictionary of {spdx_license_key: license_key} built from a
+    `licenses_index` list of license mappings from a LicenseDB index.json.
+    """
+    lic_dict = dict()
+    for license in licenses_index:
+        lic_dict[license['spdx_license_key']] = license['license_key']
+        if license.get('other_spdx_license_keys'):
+            for other_spdx in license['other_spdx_license_keys']:
+                lic_dict[other_spdx] = license['license_key']
     return lic_dict
 
 
@@ -337,11 +540,12 @@ def have_network_connection():
     """
     Return True if an HTTP connection to some public web site is possible.
     """
-    import requests
+    from attributecode.fetch import head
 
     url = "https://scancode-licensedb.aboutcode.org/"
 
-    response = requests.get(url)
+    # a HEAD request is not cached and does not download the page
+    response = head(url)
     if response.status_code == 200:
         return True
     else:
@@ -709,26 +913,318 @@ def convert_object_to_dict(about):
     return about_dict
 
 
+class JSONStreamReader(object):
+    """
+    Decode incrementally the JSON text of a text `stream` read in chunks of
+    `chunk_size` characters such that only the value being decoded is kept in
+    memory.
+    """
+    decoder = json.JSONDecoder()
+
+    def __init__(self, stream, chunk_size=1024 * 1024):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, size):
+        """
+        Read `size` more characters discarding the consumed ones.
+        """
+        data = self.stream.read(size)
+        if not data:
+            self.eof = True
+        self.buffer = self.buffer[self.pos:] + data
+        self.pos = 0
+
+    def peek(self):
+        """
+        Return the next non-whitespace character or an empty string at the end
+        of the stream.
+        """
+        while True:
+            buffer = self.buffer
+            pos = self.pos
+            length = len(buffer)
+            while pos < length and buffer[pos] in ' \t\n\r':
+                pos += 1
+            self.pos = pos
+            if pos < length:
+                return buffer[pos]
+            if self.eof:
+                return ''
+            self.fill(self.chunk_size)
+
+    def expect(self, chars):
+        """
+        Consume and return the next non-whitespace character that must be one
+        of `chars`.
+        """
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(
+                'Expecting one of %r at position %d of the JSON chunk: %r'
+                % (chars, self.pos, char))
+        self.pos += 1
+        return char
+
+    def value(self):
+        """
+        Return the next decoded JSON value.
+        """
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # a number at the end of the buffer may not be complete
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except ValueError:
+                if self.eof:
+                    raise
+            self.fill(size)
+            # read larger chunks for large values to avoid decoding them over
+            # and over
+            size = max(size, len(self.buffer))
+
+    def iter_array(self):
+        """
+        Yield the decoded values of the next JSON array.
+        """
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.expect(',]') == ']':
+                return
+
+    def iter_object(self):
+        """
+        Yield the keys of the next JSON object. The value of each key must be
+        consumed with `value` or `iter_array` before the next key.
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key
+            if self.expect(',}') == '}':
+                return
+
+
+# Fields of the ScanCode license matches that are not used for attribution and
+# are dropped when loading a scan: the matched text can be as large as the
+# scanned files.
+SCANCODE_DROPPED_MATCH_FIELDS = ('matched_text', 'matched_text_diagnostics',)
+
+
+def get_scancode_file_data(item):
+    """
+    Return a dictionary of the fields of a ScanCode `item` file data using the
+    "path" as the "about_resource" and its base name as the "name", without the
+    license matched texts.
+    """
+    for field in ('license_detections', 'license_clues', 'licenses',):
+        for match in item.get(field) or []:
+            if not isinstance(match, dict):
+                continue
+            for detection_match in [match] + (match.get('matches') or []):
+                for dropped in SCANCODE_DROPPED_MATCH_FIELDS:
+                    detection_match.pop(dropped, None)
+
+    updated_dict = {}
+    # Rename the "path" to "about_resource" and update "name" from path value
+    for key, value in item.items():
+        if key == 'path':
+            updated_dict['about_resource'] = value
+            updated_dict['name'] = os.path.basename(value)
+        else:
+            updated_dict[key] = value
+    return updated_dict
+
+
+def iter_scancode_json(location):
+    """
+    Yield a dictionary for each of the "files" of the scancode JSON file at
+    `location`, reading the file incrementally.
+    """
+    with open(location, encoding='utf-8') as json_file:
+        reader = JSONStreamReader(json_file)
+        for key in reader.iter_object():
+            if key == 'files':
+                for item in reader.iter_array():
+                    yield get_scancode_file_data(item)
+            else:
+                reader.value()
+
+
+class ScancodeFiles(object):
+    """
+    An iterable of the "files" of the scancode JSON file at `location` that is
+    read again on each iteration rather than loaded at once in memory.
+    """
+
+    def __init__(self, location):
+        self.location = location
+
+    def __iter__(self):
+        return iter_scancode_json(self.location)
+
+
 def load_scancode_json(location):
     """
     Read the scancode JSON file at `location` and return a list of dictionaries.
     """
-    updated_results = []
+    return list(iter_scancode_json(location))
 
-    with open(location) as json_file:
-        results = json.load(json_file)
-    results = results['files']
-    # Rename the "path" to "about_resource" and update "name" from path value
-    for item in results:
-        updated_dict = {}
-        for key in item:
-            if key == 'path':
-                updated_dict['about_resource'] = item[key]
-                updated_dict['name'] = os.path.basename(item[key])
+
+def load_scancode_packages(location):
+    """
+    Return a mapping of {package_uid: package data} of the top-level "packages"
+    of the scancode JSON file at `location`.
+    """
+    with open(location, encoding='utf-8') as json_file:
+        reader = JSONStreamReader(json_file)
+        for key in reader.iter_object():
+            if key == 'packages':
+                packages = reader.value() or []
+                return {
+                    package['package_uid']: package for package in packages
+                    if package.get('package_uid')}
+            elif key == 'files':
+                for _item in reader.iter_array():
+                    pass
             else:
-                updated_dict[key] = item[key]
-        updated_results.append(updated_dict)
-    return updated_results
+                reader.value()
+    return {}
+
+
+# The ScanCode fields aggregated for a group of files: the dictionary key of the
+# values of each field.
+SCANCODE_AGGREGATED_FIELDS = (
+    ('copyrights', 'copyright'),
+    ('holders', 'holder'),
+    ('authors', 'author'),
+)
+
+
+def get_scancode_group(item, packages, depth):
+    """
+    Return a tuple of (group key, package data or None) for the ScanCode file
+    data `item`: the first of its `packages` "for_packages" or its parent
+    directory at `depth` otherwise.
+    """
+    for package_uid in item.get('for_packages') or []:
+        package = packages.get(package_uid)
+        if package:
+            return package_uid, package
+    path = item.get('about_resource') or ''
+    parents = path.split('/')[:-1]
+    return '/'.join(parents[:depth]) or path, None
+
+
+def aggregate_scancode_files(files, packages=None, depth=1):
+    """
+    Return a list of dictionaries, one for each group of the ScanCode `files`
+    data such as returned by `iter_scancode_json`, grouped by package using a
+    `packages` mapping of {package_uid: package data} and by parent directory
+    up to `depth` for the files that are not part of a package. Directories are
+    skipped.
+
+    Each group has the unique detected license expressions, the unique license
+    detections and matches with their highest score and the unique copyrights,
+    holders and authors of its files.
+    """
+    packages = packages or {}
+    groups = {}
+    for item in files:
+        if item.get('type') == 'directory':
+            continue
+        key, package = get_scancode_group(item, packages, depth)
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = dict(
+                key=key,
+                package=package,
+                # ordered sets of values
+                expressions={},
+                # mapping of {detection expression: {match expression: score}}
+                detections={},
+                **{field: {} for field, _ in SCANCODE_AGGREGATED_FIELDS}
+            )
+
+        expression = item.get('detected_license_expression')
+        if expression:
+            group['expressions'][expression] = True
+
+        for detection in item.get('license_detections') or []:
+            detection_expression = detection.get('license_expression')
+            if not detection_expression:
+                continue
+            scores = group['detections'].setdefault(detection_expression, {})
+            for match in detection.get('matches') or []:
+                match_expression = match.get('license_expression')
+                score = match.get('score') or 0
+                if match_expression not in scores or score > scores[match_expression]:
+                    scores[match_expression] = score
+
+        for field, value_key in SCANCODE_AGGREGATED_FIELDS:
+            values = group[field]
+            for entry in item.get(field) or []:
+                value = entry.get(value_key) if isinstance(entry, dict) else entry
+                if value not in values:
+                    values[value] = entry
+
+    return [get_scancode_group_data(group) for group in groups.values()]
+
+
+def get_scancode_group_data(group):
+    """
+    Return a dictionary of ScanCode file data for an aggregated `group`.
+    """
+    package = group['package']
+    if package:
+        datafile_paths = package.get('datafile_paths') or []
+        about_resource = datafile_paths and posixpath.dirname(datafile_paths[0])
+        data = {
+            'about_resource': about_resource or '.',
+            'name': package.get('name') or group['key'],
+            'version': package.get('version') or '',
+            'package_url': package.get('purl') or '',
+        }
+    else:
+        data = {
+            'about_resource': group['key'],
+            'name': posixpath.basename(group['key']),
+        }
+
+    expressions = list(group['expressions'])
+    if len(expressions) > 1:
+        expressions = ['(%s)' % exp if ' ' in exp else exp for exp in expressions]
+    data['detected_license_expression'] = ' AND '.join(expressions)
+
+    data['license_detections'] = [
+        {
+            'license_expression': detection_expression,
+            'matches': [
+                {'license_expression': match_expression, 'score': score}
+                for match_expression, score in scores.items()
+            ],
+        }
+        for detection_expression, scores in group['detections'].items()
+    ]
+
+    for field, _ in SCANCODE_AGGREGATED_FIELDS:
+        data[field] = list(group[field].values())
+    return data
 
 
 def load_excel(location, worksheet=None):
@@ -26,9 +26,10 @@ from attributecode import Error
 class FakeResponse(object):
     response_content = None
 
-    def __init__(self, response_content):
+    def __init__(self, response_content, status_code=200):
         self.response_content = response_content
         self.text = response_content
+        self.status_code = status_code
 
     def read(self):
         return self.response_content
@@ -85,3 +86,69 @@ class ApiTest(unittest.TestCase):
         expected = (
             {}, [Error(ERROR, "Invalid '--api_url'. License generation is skipped.")])
         assert expected == license_data
+
+    @mock.patch.object(api, 'get')
+    def test_api_request_license_data_with_server_error(self, mock_data):
+        mock_data.return_value = FakeResponse('<html></html>', status_code=502)
+        license_data = api.request_license_data(
+            api_url='http://fake.url/', api_key='api_key', license_key='apache-2.0')
+        expected = (
+            {}, [Error(ERROR, 'Server error 502 while fetching license: apache-2.0')])
+        assert expected == license_data
+
+    @mock.patch.object(api, 'get')
+    def test_api_request_license_data_with_network_error(self, mock_data):
+        mock_data.side_effect = requests.exceptions.ReadTimeout('http://fake.url/?api_key=secret')
+        license_data = api.request_license_data(
+            api_url='http://fake.url/', api_key='secret', license_key='apache-2.0')
+        expected = (
+            {}, [Error(ERROR, 'An error occurred while fetching license: apache-2.0: ReadTimeout')])
+        assert expected == license_data
+
+    @mock.patch.object(api, 'get')
+    def test_api_request_licenses_data_follows_pages(self, mock_data):
+        mock_data.side_effect = [
+            FakeResponse(
+                '{"count":3,"next":"http://fake.url/?page=2","results":['
+                '{"key":"apache-2.0","name":"Apache 2.0"},{"key":"mit","name":"MIT"}]}'),
+            FakeResponse(
+                '{"count":3,"next":null,"results":[{"key":"bsd-new","name":"BSD"}]}'),
+        ]
+        result = api.request_licenses_data(
+            api_url='http://fake.url/', api_key='api_key',
+            license_keys=['mit', 'apache-2.0', 'bsd-new', 'mit'])
+        expected = {
+            'apache-2.0': {'key': 'apache-2.0', 'name': 'Apache 2.0'},
+            'mit': {'key': 'mit', 'name': 'MIT'},
+            'bsd-new': {'key': 'bsd-new', 'name': 'BSD'},
+        }
+        assert expected == result
+        first_url = mock_data.call_args_list[0][0][0]
+        assert first_url.startswith('http://fake.url/?api_key=api_key&format=json&page_size=3')
+        assert first_url.endswith('&key=mit&key=apache-2.0&key=bsd-new')
+        assert 'http://fake.url/?page=2' == mock_data.call_args_list[1][0][0]
+
+    @mock.patch.object(api, 'get')
+    def test_api_request_licenses_data_splits_keys_in_chunks(self, mock_data):
+        mock_data.return_value = FakeResponse('{"count":0,"next":null,"results":[]}')
+        keys = ['key%d' % i for i in range(api.BULK_SIZE + 1)]
+        assert {} == api.request_licenses_data(
+            api_url='http://fake.url/', api_key='api_key', license_keys=keys)
+        assert 2 == mock_data.call_count
+
+    @mock.patch.object(api, 'get')
+    def test_api_request_licenses_data_without_multi_key_filter(self, mock_data):
+        # the filter is ignored and all the licenses are returned
+        mock_data.return_value = FakeResponse(
+            '{"count":2000,"next":"http://fake.url/?page=2","results":['
+            '{"key":"0bsd"},{"key":"mit"}]}')
+        result = api.request_licenses_data(
+            api_url='http://fake.url/', api_key='api_key', license_keys=['mit', 'gpl'])
+        assert {'mit': {'key': 'mit'}} == result
+        assert 1 == mock_data.call_count
+
+    @mock.patch.object(api, 'get')
+    def test_api_request_licenses_data_ignores_errors(self, mock_data):
+        mock_data.return_value = FakeResponse('<html></html>')
+        assert {} == api.request_licenses_data(
+            api_url='http://fake.url/', api_key='api_key', license_keys=['mit'])
@@ -15,14 +15,19 @@
 # ============================================================================
 
 import io
+import json
 import os
 import unittest
+from unittest import mock
 
 from testing_utils import get_test_loc
+from testing_utils import get_temp_dir
 from testing_utils import get_temp_file
 
+from attributecode import CRITICAL
 from attributecode import INFO
 from attributecode import attrib
+from attributecode import attrib_util
 from attributecode import gen
 from attributecode import model
 
@@ -70,9 +75,118 @@ class TemplateTest(unittest.TestCase):
             except:
                 raise Exception(template_loc)
 
+    def test_check_template_with_template_loc(self):
+        template_loc = get_temp_file('template.html')
+        with open(template_loc, 'w') as tmpl:
+            tmpl.write('{{ abouts }\n')
+        expected = 1, "unexpected '}'"
+        assert expected == attrib.check_template(template_loc=template_loc)
+
+    def test_load_template_reloads_a_modified_template(self):
+        template_loc = get_temp_file('template.html')
+        with open(template_loc, 'w') as tmpl:
+            tmpl.write('{{ abouts|multi_sort(attributes=["name"])|join(",", attribute="name") }}')
+        template = attrib_util.load_template(template_loc)
+        assert template is attrib_util.load_template(template_loc)
+        assert 'a,b' == template.render(abouts=[{'name': 'b'}, {'name': 'a'}])
+
+        with open(template_loc, 'w') as tmpl:
+            tmpl.write('{{ abouts|unique_together(attributes=["name"])|length }}')
+        mtime = os.path.getmtime(template_loc) + 10
+        os.utime(template_loc, (mtime, mtime))
+        template = attrib_util.load_template(template_loc)
+        assert '1' == template.render(abouts=[{'name': 'a'}, {'name': 'a'}])
+
+    def test_get_environment_caches_compiled_templates_as_bytecode(self):
+        cache_dir = get_temp_dir()
+        template_loc = get_temp_file('template.html')
+        with open(template_loc, 'w') as tmpl:
+            tmpl.write('{{ vartext }}')
+        attrib_util.get_environment.cache_clear()
+        try:
+            with mock.patch.dict(os.environ, {'ABOUTCODE_TEMPLATE_CACHE_DIR': cache_dir}):
+                attrib_util.load_template(template_loc)
+                assert 1 == len(os.listdir(cache_dir))
+        finally:
+            attrib_util.get_environment.cache_clear()
+
+    def test_get_environment_has_no_bytecode_cache_by_default(self):
+        attrib_util.get_environment.cache_clear()
+        try:
+            with mock.patch.dict(os.environ):
+                os.environ.pop('ABOUTCODE_TEMPLATE_CACHE_DIR', None)
+                assert attrib_util.get_environment().bytecode_cache is None
+
+                cache_dir = os.path.join(get_temp_dir(), 'templates')
+                template_loc = get_temp_file('template.html')
+                with open(template_loc, 'w') as tmpl:
+                    tmpl.write('{{ vartext }}')
+                attrib_util.set_bytecode_cache_dir(cache_dir)
+                attrib_util.load_template(template_loc)
+                assert 1 == len(os.listdir(cache_dir))
+        finally:
+            attrib_util.get_environment.cache_clear()
+
+    def test_multi_sort_and_unique_together_on_objects_and_dicts(self):
+        abouts = []
+        for name, version in [('b', '1'), ('A', '2'), ('a', '1'), ('b', '1')]:
+            about = model.About()
+            about.name.value = name
+            about.version.value = version
+            abouts.append(about)
+        template = attrib_util.get_template(
+            '{% for a in abouts|multi_sort(attributes=["name.value", "version.value"]) %}'
+            '{{ a.name.value }}{{ a.version.value }} {% endfor %}|'
+            '{% for a in abouts|unique_together(attributes=["name.value", "version.value"]) %}'
+            '{{ a.name.value }}{{ a.version.value }} {% endfor %}|'
+            '{% for d in dicts|multi_sort(attributes=["keys"], case_sensitive=true) %}'
+            '{{ d["keys"] }} {% endfor %}|'
+            '{{ dicts|unique_together(attributes=["items"])|length }}')
+        dicts = [{'keys': 'b', 'items': [1]}, {'keys': 'B', 'items': [1]}]
+        result = template.render(abouts=abouts, dicts=dicts)
+        assert 'a1 A2 b1 b1 |b1 A2 a1 |B b |1' == result
+
+    def test_get_template_escapes_html(self):
+        template = attrib_util.get_template('{{ text }}')
+        assert '&lt;b&gt;' == template.render(text='<b>')
+
 
 class GenerateTest(unittest.TestCase):
 
+    def get_scancode_about(self, matches):
+        about = model.About()
+        about.load_dict({
+            'name': 'lic.txt',
+            'license_detections': [{
+                'license_expression': ' AND '.join(exp for exp, _ in matches),
+                'matches': [{'license_expression': exp, 'score': score}
+                            for exp, score in matches],
+            }],
+        }, base_dir='', scancode=True)
+        return about
+
+    def test_generate_sctk_input_keeps_highest_scores_above_min_score(self):
+        abouts = [
+            self.get_scancode_about([
+                ('mit', 50.0), ('apache-2.0', 10.0), ('bsd-new', 20.0),
+                ('mit', 90.0), ('gpl-2.0 OR mit', 100.0)]),
+            self.get_scancode_about([('bsd-new', 100.0)]),
+            model.About(),
+        ]
+        license_dict = {'mit': ['MIT License'], 'gpl-2.0': ['GPL 2.0']}
+        abouts, meet_score_licenses = attrib.generate_sctk_input(
+            abouts, 30, license_dict)
+
+        assert ['mit', 'gpl-2.0', 'bsd-new'] == meet_score_licenses
+        about = abouts[0]
+        assert [['mit'], ['gpl-2.0', 'mit']] == about.license_key.value
+        assert [['MIT License'], ['GPL 2.0', 'MIT License']] == about.license_name.value
+        assert [90.0, 100.0] == about.license_score.value
+        assert ['mit', 'gpl-2.0 OR mit'] == about.license_key_expression.value
+        assert [['bsd-new']] == abouts[1].license_key.value
+        assert [['bsd-new']] == abouts[1].license_name.value
+        assert not abouts[2].license_key.value
+
     def test_generate_from_collected_inventory_wih_custom_temaplte(self):
         test_file = get_test_loc('test_attrib/gen_simple/attrib.ABOUT')
         errors, abouts = model.collect_inventory(test_file)
@@ -146,6 +260,257 @@ class GenerateTest(unittest.TestCase):
 
         assert f1 == f2
 
+    def test_generate_and_save_streams_to_output_location(self):
+        test_file = get_test_loc('test_attrib/gen_simple/attrib.ABOUT')
+        errors, abouts = model.collect_inventory(test_file)
+        output_file = get_temp_file()
+
+        errors, result = attrib.generate_and_save(
+            abouts, True, {}, output_file, stream=True)
+        assert not errors
+        assert output_file == result
+        with open(output_file) as of:
+            streamed = of.read()
+
+        errors, rendered = attrib.generate_and_save(
+            abouts, True, {}, output_file)
+        assert remove_timestamp(rendered) == remove_timestamp(streamed)
+
+    def test_generate_and_save_does_not_save_an_empty_attribution(self):
+        test_file = get_test_loc('test_attrib/gen_simple/attrib.ABOUT')
+        errors, abouts = model.collect_inventory(test_file)
+        output_dir = get_temp_dir()
+        output_file = os.path.join(output_dir, 'attribution.html')
+        template_loc = get_temp_file('template.html')
+        with open(template_loc, 'w') as tmpl:
+            tmpl.write('{% if False %}{{ abouts }}{% endif %}')
+
+        errors, rendered = attrib.generate_and_save(
+            abouts, True, {}, output_file, template_loc=template_loc)
+        assert '' == rendered
+        errors, rendered = attrib.generate_and_save(
+            abouts, True, {}, output_file, template_loc=template_loc, stream=True)
+        assert '' == rendered
+        assert [] == os.listdir(output_dir)
+
+    def test_generate_and_save_with_renders(self):
+        test_file = get_test_loc('test_attrib/gen_simple/attrib.ABOUT')
+        errors, abouts = model.collect_inventory(test_file)
+        output_dir = get_temp_dir()
+        template_loc = os.path.join(output_dir, 'template.txt')
+        with open(template_loc, 'w') as tmpl:
+            tmpl.write('{% for about in abouts %}{{ about.name.value }}{% endfor %}')
+        json_template_loc = os.path.join(
+            os.path.dirname(attrib.DEFAULT_TEMPLATE_FILE), 'default_json.template')
+        output_file = os.path.join(output_dir, 'attribution.html')
+        renders = [
+            (template_loc, os.path.join(output_dir, 'attribution.txt')),
+            (json_template_loc, os.path.join(output_dir, 'attribution.json')),
+        ]
+
+        with mock.patch.object(attrib, 'get_template_context', wraps=attrib.get_template_context) as context:
+            errors, rendered = attrib.generate_and_save(
+                abouts, True, {}, output_file, renders=renders, workers=2, stream=True)
+        assert not errors
+        assert 1 == context.call_count
+        assert output_file == rendered
+
+        with open(os.path.join(output_dir, 'attribution.txt')) as txt:
+            assert 'Apache HTTP Server' == txt.read()
+        with open(os.path.join(output_dir, 'attribution.json')) as js:
+            assert 'Apache HTTP Server' == json.load(js)['ossAttribution']['entries'][0]['name']
+        with open(output_file) as html:
+            assert '<h3 class="component-name">Apache HTTP Server' in html.read()
+
+    def test_generate_and_save_does_not_save_a_failed_rendering(self):
+        test_file = get_test_loc('test_attrib/gen_simple/attrib.ABOUT')
+        errors, abouts = model.collect_inventory(test_file)
+        output_dir = get_temp_dir()
+        output_file = os.path.join(output_dir, 'attribution.html')
+        template_loc = os.path.join(output_dir, 'template.html')
+        with open(template_loc, 'w') as tmpl:
+            tmpl.write('{% for about in abouts %}{{ about.name.value }}{% endfor %}'
+                       '{{ vartext.missing.attribute }}')
+
+        try:
+            attrib.generate_and_save(
+                abouts, True, {}, output_file, template_loc=template_loc, stream=True)
+            self.fail('Exception not raised')
+        except Exception:
+            pass
+        assert ['template.html'] == os.listdir(output_dir)
+
+    def test_generate_with_licenses_by_key(self):
+        abouts = [model.About(), model.About()]
+        abouts[0].name.value = 'b'
+        abouts[0].license_expression.value = 'gpl OR lgpl-2.1'
+        abouts[1].name.value = 'a'
+        abouts[1].license_expression.value = 'bsd-new'
+        license_dict = {
+            'lgpl-2.1': ['LGPL 2.1', 'lgpl-2.1.LICENSE', 'lgpl text', ''],
+            'gpl': ['GPL', 'gpl.LICENSE', 'gpl text', ''],
+        }
+        template = ('{% for about in abouts %}{{ about.name.value }}: '
+                    '{{ about.license_name_expression.value }}; {% endfor %}'
+                    '{{ licenses_by_key["gpl"].text }}; '
+                    '{{ licenses_list|map(attribute="key")|join(",") }}')
+        errors, result = attrib.generate(
+            abouts, False, license_dict, False, 0, template=template)
+        assert not errors
+        assert 'a: bsd-new; b: GPL OR LGPL 2.1; gpl text; gpl,lgpl-2.1' == result
+
+    def test_render_and_save_from_a_saved_context(self):
+        test_file = get_test_loc('test_attrib/gen_simple/attrib.ABOUT')
+        errors, abouts = model.collect_inventory(test_file)
+        license_dict = {
+            'apache-2.0': ['Apache 2.0', 'apache-2.0.LICENSE', 'apache text', ''],
+        }
+        abouts[0].license_expression.value = 'apache-2.0'
+        output_dir = get_temp_dir()
+        context_file = os.path.join(output_dir, 'attribution.context')
+        template_loc = os.path.join(output_dir, 'template.txt')
+        with open(template_loc, 'w') as tmpl:
+            tmpl.write('{% for about in abouts %}{{ about.name.value }}: '
+                       '{{ about.license_name_expression.value }}{% endfor %}; '
+                       '{{ licenses_by_key["apache-2.0"].text }}; {{ vartext["title"] }}')
+
+        errors, _ = attrib.generate_and_save(
+            abouts, False, license_dict, os.path.join(output_dir, 'first.txt'),
+            template_loc=template_loc, vartext={'title': 'notice'},
+            context_location=context_file)
+        assert not errors
+
+        errors, scancode, context = attrib.load_context(context_file)
+        assert not errors
+        assert not scancode
+        output_file = os.path.join(output_dir, 'second.txt')
+        errors, rendered = attrib.render_and_save(
+            context, output_file, template_loc=template_loc)
+        assert not errors
+        with open(output_file) as second:
+            assert 'Apache HTTP Server: Apache 2.0; apache text; notice' == second.read()
+
+    def test_render_and_save_from_a_saved_context_without_the_source_files(self):
+        test_dir = get_temp_dir()
+        about_file = os.path.join(test_dir, 'foo.ABOUT')
+        notice_file = os.path.join(test_dir, 'foo.NOTICE')
+        with open(about_file, 'w') as af:
+            af.write('about_resource: .\nname: foo\nnotice_file: foo.NOTICE\n')
+        with open(notice_file, 'w') as nf:
+            nf.write('NOTICE TEXT')
+        errors, abouts = model.collect_inventory(about_file)
+        output_dir = get_temp_dir()
+        context_file = os.path.join(output_dir, 'attribution.context')
+        template_loc = os.path.join(output_dir, 'template.txt')
+        with open(template_loc, 'w') as tmpl:
+            tmpl.write('{% for about in abouts %}{{ about.name.value }}:'
+                       '{{ about.notice_file.value["foo.NOTICE"] }}{% endfor %}')
+
+        attrib.generate_and_save(
+            abouts, True, {}, os.path.join(output_dir, 'first.txt'),
+            template_loc=template_loc, context_location=context_file)
+        os.remove(notice_file)
+
+        errors, scancode, context = attrib.load_context(context_file)
+        output_file = os.path.join(output_dir, 'second.txt')
+        attrib.render_and_save(context, output_file, template_loc=template_loc)
+        with open(output_file) as second:
+            assert 'foo:NOTICE TEXT' == second.read()
+
+    def test_load_context_returns_an_error_for_an_invalid_context(self):
+        context_file = get_temp_file('attribution.context')
+        with open(context_file, 'w') as cf:
+            cf.write('not a context')
+        errors, scancode, context = attrib.load_context(context_file)
+        assert context is None
+        assert 1 == len(errors)
+        assert CRITICAL == errors[0].severity
+        assert 'Cannot load the attribution context from' in errors[0].message
+
+    def test_paginate_by_count_and_size(self):
+        abouts = []
+        for name, copyright in [('a', 'x' * 100), ('b', 'x' * 3000), ('c', ''), ('d', '')]:
+            about = model.About()
+            about.name.value = name
+            about.copyright.value = copyright
+            abouts.append(about)
+        a, b, c, d = abouts
+
+        assert [[a, b, c], [d]] == list(attrib.paginate(abouts, max_components=3))
+        assert [abouts] == list(attrib.paginate(abouts))
+        max_bytes = attrib.COMPONENT_MARKUP_SIZE * 2 + 200
+        assert [[a], [b], [c, d]] == list(attrib.paginate(abouts, max_bytes=max_bytes))
+        assert [[a], [b], [c], [d]] == list(
+            attrib.paginate(abouts, max_components=1, max_bytes=max_bytes))
+
+    def test_generate_and_save_paginated(self):
+        abouts = []
+        for name, keys in [('e', ['gpl']), ('d', [['mit']]), ('c', ['gpl']), ('b', []), ('a', ['mit'])]:
+            about = model.About()
+            about.name.value = name
+            about.license_key.value = keys
+            about.license_expression.value = ' AND '.join(k for key in keys for k in key)
+            abouts.append(about)
+        abouts[3].license_file.value = {'b.LICENSE': 'b license text'}
+        license_dict = {
+            'gpl': ['GPL', 'gpl.LICENSE', 'gpl license text', ''],
+            'mit': ['MIT', 'mit.LICENSE', 'mit license text', ''],
+        }
+        output_dir = get_temp_dir()
+        output_file = os.path.join(output_dir, 'attribution.html')
+
+        errors, rendered = attrib.generate_and_save(
+            abouts, False, license_dict, output_file, page_size=2, workers=2)
+        assert not errors
+        assert output_file == rendered
+        expected = ['attribution-1.html', 'attribution-2.html', 'attribution-3.html',
+                    'attribution-licenses.html', 'attribution.html']
+        assert expected == sorted(os.listdir(output_dir))
+
+        def read(name):
+            with open(os.path.join(output_dir, name)) as html:
+                return html.read()
+
+        index = read('attribution.html')
+        assert 'href="attribution-2.html#component_3">d</a>' in index
+        assert 'href="attribution-licenses.html"' in index
+
+        licenses = read('attribution-licenses.html')
+        assert 'gpl license text' in licenses
+        assert 'mit license text' in licenses
+
+        pages = [read('attribution-{}.html'.format(number)) for number in (1, 2, 3)]
+        assert 'id="component_0"' in pages[0]
+        assert 'b license text' in pages[0]
+        assert 'href="attribution-licenses.html#component-license-mit"' in pages[1]
+        assert 'id="component_4"' in pages[2]
+        for page in pages:
+            assert 'gpl license text' not in page
+            assert 'mit license text' not in page
+
+    def test_get_groupings(self):
+        abouts = []
+        for name, owner, expression, keys, copyright in [
+            ('a', 'nexB', 'mit AND bsd-new', ['mit', 'bsd-new'], 'Copyright nexB'),
+            ('b', 'Acme', 'mit', ['mit'], 'Copyright Acme'),
+            ('c', '', '', [], 'Copyright nexB'),
+        ]:
+            about = model.About()
+            about.name.value = name
+            about.owner.value = owner
+            about.license_expression.value = expression
+            about.license_key.value = keys
+            about.copyright.value = copyright
+            abouts.append(about)
+        a, b, c = abouts
+
+        groupings = attrib.get_groupings(abouts)
+        assert {'bsd-new': [a], 'mit': [a, b]} == groupings['abouts_by_license_key']
+        assert ['bsd-new', 'mit'] == list(groupings['abouts_by_license_key'])
+        assert ['Acme', 'nexB'] == list(groupings['abouts_by_owner'])
+        assert {'mit': [b], 'mit AND bsd-new': [a]} == groupings['abouts_by_license_expression']
+        assert ['Copyright nexB', 'Copyright Acme'] == groupings['unique_copyrights']
+
     def test_scancode_input_min_score_0(self):
         test_file = get_test_loc(
             'test_attrib/scancode_input/sc-2-licenses.json')
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf8 -*-
+
+# ============================================================================
+#  Copyright (c) nexB Inc. http://www.nexb.com/ - All rights reserved.
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#      http://www.apache.org/licenses/LICENSE-2.0
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ============================================================================
+
+import os
+import shutil
+import unittest
+
+from testing_utils import get_temp_dir
+from testing_utils import get_test_loc
+
+from attributecode import cache
+from attributecode import model
+
+
+def copy_test_dir(path):
+    """
+    Return the location of a copy of the test directory at `path` relative to
+    the testdata directory.
+    """
+    target = os.path.join(get_temp_dir(), 'inventory')
+    shutil.copytree(get_test_loc(path), target)
+    return target
+
+
+class InventoryCacheTest(unittest.TestCase):
+
+    def test_collect_inventory_with_cache_dir_returns_same_results(self):
+        location = get_test_loc('test_model/inventory/complex')
+        cache_dir = get_temp_dir()
+        expected_errors, expected_abouts = model.collect_inventory(location)
+
+        errors, abouts = model.collect_inventory(location, cache_dir=cache_dir)
+        assert expected_errors == errors
+        assert expected_abouts == abouts
+
+        # the second run uses the cache
+        errors, abouts = model.collect_inventory(location, cache_dir=cache_dir)
+        assert expected_errors == errors
+        assert expected_abouts == abouts
+        assert [a.about_file_path for a in expected_abouts] == [
+            a.about_file_path for a in abouts]
+
+    def test_InventoryCache_get_returns_cached_about(self):
+        location = copy_test_dir('test_model/inventory/complex')
+        about_loc = os.path.join(location, 'about', 'pip.ABOUT')
+        about = model.About(about_loc, 'about/pip.ABOUT')
+        with cache.InventoryCache(get_temp_dir()) as inventory_cache:
+            assert inventory_cache.get(about_loc, 'about/pip.ABOUT') is None
+            inventory_cache.put_all([(about_loc, 'about/pip.ABOUT', about)])
+            cached = inventory_cache.get(about_loc, 'about/pip.ABOUT')
+            assert about == cached
+            assert about.errors == cached.errors
+            assert inventory_cache.get(about_loc, 'other/pip.ABOUT') is None
+
+    def test_InventoryCache_get_is_invalidated_when_about_file_changes(self):
+        location = copy_test_dir('test_model/inventory/complex')
+        about_loc = os.path.join(location, 'about', 'pip.ABOUT')
+        about = model.About(about_loc, 'about/pip.ABOUT')
+        with cache.InventoryCache(get_temp_dir()) as inventory_cache:
+            inventory_cache.put_all([(about_loc, 'about/pip.ABOUT', about)])
+            with open(about_loc, 'a') as af:
+                af.write('\nnotes: changed\n')
+            assert inventory_cache.get(about_loc, 'about/pip.ABOUT') is None
+
+    def test_InventoryCache_get_is_valid_when_about_file_is_only_touched(self):
+        location = copy_test_dir('test_model/inventory/complex')
+        about_loc = os.path.join(location, 'about', 'pip.ABOUT')
+        about = model.About(about_loc, 'about/pip.ABOUT')
+        with cache.InventoryCache(get_temp_dir()) as inventory_cache:
+            inventory_cache.put_all([(about_loc, 'about/pip.ABOUT', about)])
+            stat = os.stat(about_loc)
+            os.utime(about_loc, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            assert about == inventory_cache.get(about_loc, 'about/pip.ABOUT')
+
+    def test_InventoryCache_get_is_invalidated_when_referenced_files_change(self):
+        location = copy_test_dir('test_model/inventory/complex')
+        about_loc = os.path.join(location, 'about', 'pip.ABOUT')
+        about = model.About(about_loc, 'about/pip.ABOUT')
+        with cache.InventoryCache(get_temp_dir()) as inventory_cache:
+            inventory_cache.put_all([(about_loc, 'about/pip.ABOUT', about)])
+            os.remove(os.path.join(location, 'about', 'pip.LICENSE'))
+            assert inventory_cache.get(about_loc, 'about/pip.ABOUT') is None
+
+    def test_InventoryCache_get_is_invalidated_when_missing_files_are_created(self):
+        location = copy_test_dir('test_model/inventory/complex')
+        about_loc = os.path.join(location, 'about', 'pip.ABOUT')
+        resource = os.path.join(
+            location, 'about', 'pip-1.5.6-py2.py3-none-any.whl')
+        os.remove(resource)
+        about = model.About(about_loc, 'about/pip.ABOUT')
+        assert about.errors
+        with cache.InventoryCache(get_temp_dir()) as inventory_cache:
+            inventory_cache.put_all([(about_loc, 'about/pip.ABOUT', about)])
+            with open(resource, 'w') as res:
+                res.write('pip')
+            assert inventory_cache.get(about_loc, 'about/pip.ABOUT') is None
@@ -385,6 +385,14 @@ def test_about_inventory_command_can_run_minimally_without_error():
     run_about_command_test_click(['inventory', test_dir, result])
 
 
+def test_about_inventory_command_fails_with_zero_processes():
+    test_dir = get_test_loc('test_cmd/repository-mini')
+    result = get_temp_file()
+    result = run_about_command_test_click(
+        ['inventory', '-n', '0', test_dir, result], expected_rc=2)
+    assert 'Invalid value for \'-n\' / \'--processes\'' in result.output
+
+
 def test_about_gen_command_can_run_minimally_without_error():
     test_inv = get_test_loc('test_cmd/geninventory.csv')
     gen_dir = get_temp_dir()
@@ -0,0 +1,363 @@
+#!/usr/bin/env python
+# -*- coding: utf8 -*-
+
+# ============================================================================
+#  Copyright (c) nexB Inc. http://www.nexb.com/ - All rights reserved.
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#      http://www.apache.org/licenses/LICENSE-2.0
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ============================================================================
+
+import os
+import time
+import unittest
+from unittest import mock
+
+import requests
+
+from testing_utils import get_temp_dir
+
+from attributecode import fetch
+
+
+def make_response(status_code=200, text='', headers=None):
+    response = mock.Mock()
+    response.status_code = status_code
+    response.text = text
+    response.headers = headers or {}
+    return response
+
+
+@mock.patch('requests.Session.get')
+class FetcherTest(unittest.TestCase):
+
+    def get_fetcher(self, **kwargs):
+        fetcher = fetch.Fetcher(cache=fetch.HttpCache(get_temp_dir()), **kwargs)
+        fetcher.sleep = mock.Mock()
+        return fetcher
+
+    def test_Fetcher_get_without_cache(self, mock_get):
+        mock_get.return_value = make_response(text='{"key": "mit"}')
+        fetcher = fetch.Fetcher()
+        response = fetcher.get('https://example.com/mit.json')
+        assert {'key': 'mit'} == response.json()
+        assert not response.from_cache
+        fetcher.get('https://example.com/mit.json')
+        assert 2 == mock_get.call_count
+
+    def test_Fetcher_get_uses_fresh_cached_response(self, mock_get):
+        mock_get.return_value = make_response(text='mit text')
+        fetcher = self.get_fetcher()
+        assert 'mit text' == fetcher.get('https://example.com/mit.LICENSE').text
+        response = fetcher.get('https://example.com/mit.LICENSE')
+        assert 'mit text' == response.text
+        assert 200 == response.status_code
+        assert response.from_cache
+        assert 1 == mock_get.call_count
+
+    def test_Fetcher_get_caches_by_headers(self, mock_get):
+        mock_get.return_value = make_response(text='data')
+        fetcher = self.get_fetcher()
+        fetcher.get('https://example.com/api', headers={'Authorization': 'Token 1'})
+        fetcher.get('https://example.com/api', headers={'Authorization': 'Token 2'})
+        fetcher.get('https://example.com/api', headers={'Authorization': 'Token 1'})
+        assert 2 == mock_get.call_count
+
+    def test_Fetcher_get_revalidates_stale_response(self, mock_get):
+        mock_get.return_value = make_response(
+            text='mit text', headers={'ETag': '"abc"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'})
+        fetcher = self.get_fetcher(ttl=0)
+        fetcher.get('https://example.com/mit.LICENSE')
+
+        mock_get.return_value = make_response(status_code=304)
+        response = fetcher.get('https://example.com/mit.LICENSE')
+        assert 'mit text' == response.text
+        assert 200 == response.status_code
+        assert response.from_cache
+        expected_headers = {
+            'If-None-Match': '"abc"',
+            'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT',
+        }
+        assert expected_headers == mock_get.call_args[1]['headers']
+
+    def test_Fetcher_get_replaces_changed_stale_response(self, mock_get):
+        mock_get.return_value = make_response(text='old', headers={'ETag': '"1"'})
+        fetcher = self.get_fetcher(ttl=0)
+        fetcher.get('https://example.com/mit.LICENSE')
+        mock_get.return_value = make_response(text='new', headers={'ETag': '"2"'})
+        assert 'new' == fetcher.get('https://example.com/mit.LICENSE').text
+        fetcher.ttl = 3600
+        assert 'new' == fetcher.get('https://example.com/mit.LICENSE').text
+        assert 2 == mock_get.call_count
+
+    def test_Fetcher_get_uses_stale_response_on_network_error(self, mock_get):
+        mock_get.return_value = make_response(text='mit text')
+        fetcher = self.get_fetcher(ttl=0)
+        fetcher.get('https://example.com/mit.LICENSE')
+        mock_get.side_effect = requests.exceptions.ConnectionError()
+        assert 'mit text' == fetcher.get('https://example.com/mit.LICENSE').text
+
+        try:
+            fetcher.get('https://example.com/other.LICENSE')
+            self.fail('ConnectionError not raised')
+        except requests.exceptions.ConnectionError:
+            pass
+
+    def test_Fetcher_get_with_refresh_ignores_cached_response(self, mock_get):
+        cache = fetch.HttpCache(get_temp_dir())
+        mock_get.return_value = make_response(text='old', headers={'ETag': '"1"'})
+        fetch.Fetcher(cache=cache).get('https://example.com/mit.LICENSE')
+
+        mock_get.return_value = make_response(text='new')
+        fetcher = fetch.Fetcher(cache=cache, refresh=True)
+        assert 'new' == fetcher.get('https://example.com/mit.LICENSE').text
+        assert {} == mock_get.call_args[1]['headers']
+        assert 'new' == fetch.Fetcher(cache=cache).get('https://example.com/mit.LICENSE').text
+        assert 2 == mock_get.call_count
+
+    def test_Fetcher_get_does_not_cache_client_errors(self, mock_get):
+        mock_get.return_value = make_response(status_code=404)
+        fetcher = self.get_fetcher()
+        assert 404 == fetcher.get('https://example.com/mitt.LICENSE').status_code
+        mock_get.return_value = make_response(status_code=401)
+        assert 401 == fetcher.get('https://example.com/api', headers={'Authorization': 'Token bad'}).status_code
+        mock_get.return_value = make_response(text='mit text')
+        assert 'mit text' == fetcher.get('https://example.com/mitt.LICENSE').text
+        assert 200 == fetcher.get('https://example.com/api', headers={'Authorization': 'Token bad'}).status_code
+        assert 4 == mock_get.call_count
+
+    def test_Fetcher_get_does_not_use_a_stale_response_for_a_client_error(self, mock_get):
+        mock_get.return_value = make_response(text='mit text')
+        fetcher = self.get_fetcher(ttl=0)
+        fetcher.get('https://example.com/mit.LICENSE')
+        mock_get.return_value = make_response(status_code=404)
+        assert 404 == fetcher.get('https://example.com/mit.LICENSE').status_code
+
+    def test_Fetcher_get_without_use_cache(self, mock_get):
+        mock_get.return_value = make_response(text='ok')
+        fetcher = self.get_fetcher()
+        fetcher.get('https://example.com/', use_cache=False)
+        response = fetcher.get('https://example.com/', use_cache=False)
+        assert not response.from_cache
+        assert 2 == mock_get.call_count
+        fetcher.get('https://example.com/')
+        assert 3 == mock_get.call_count
+
+    @mock.patch('requests.Session.head')
+    def test_Fetcher_head_does_not_get_or_cache(self, mock_head, mock_get):
+        mock_head.return_value = make_response(status_code=200)
+        fetcher = self.get_fetcher()
+        assert 200 == fetcher.head('https://example.com/').status_code
+        assert 200 == fetcher.head('https://example.com/').status_code
+        assert 2 == mock_head.call_count
+        assert not mock_get.called
+        assert [] == os.listdir(fetcher.cache.location)
+
+    def test_Fetcher_get_does_not_cache_server_errors(self, mock_get):
+        mock_get.return_value = make_response(status_code=503)
+        fetcher = self.get_fetcher(retries=0)
+        fetcher.get('https://example.com/mit.LICENSE')
+        fetcher.get('https://example.com/mit.LICENSE')
+        assert 2 == mock_get.call_count
+
+    def test_Fetcher_map_returns_results_in_order(self, mock_get):
+        fetcher = fetch.Fetcher(workers=4)
+        assert [i * 2 for i in range(20)] == fetcher.map(lambda i: i * 2, range(20))
+        assert [] == fetcher.map(lambda i: i, [])
+
+    def test_Fetcher_map_runs_concurrently(self, mock_get):
+        import threading
+        barrier = threading.Barrier(3, timeout=10)
+
+        def wait(item):
+            # fails with a BrokenBarrierError unless 3 threads run at once
+            barrier.wait()
+            return item
+
+        assert [1, 2, 3] == fetch.Fetcher(workers=3).map(wait, [1, 2, 3])
+
+
+    def test_Fetcher_get_retries_server_errors_with_backoff(self, mock_get):
+        mock_get.side_effect = [
+            make_response(status_code=502),
+            requests.exceptions.ReadTimeout(),
+            make_response(text='mit text'),
+        ]
+        fetcher = self.get_fetcher(timeout=5)
+        response = fetcher.get('https://example.com/mit.LICENSE')
+        assert 200 == response.status_code
+        assert 'mit text' == response.text
+        assert 3 == mock_get.call_count
+        assert 5 == mock_get.call_args[1]['timeout']
+        assert 2 == fetcher.sleep.call_count
+        first_delay = fetcher.sleep.call_args_list[0][0][0]
+        second_delay = fetcher.sleep.call_args_list[1][0][0]
+        assert 0 <= first_delay <= fetch.BACKOFF
+        assert 0 <= second_delay <= fetch.BACKOFF * 2
+        assert 2 == fetcher.stats.retries
+        assert 3 == fetcher.stats.requests
+        assert 0 == fetcher.stats.failures
+
+    def test_Fetcher_get_honors_retry_after(self, mock_get):
+        mock_get.side_effect = [
+            make_response(status_code=429, headers={'Retry-After': '2'}),
+            make_response(text='data'),
+        ]
+        fetcher = self.get_fetcher()
+        assert 'data' == fetcher.get('https://example.com/api').text
+        fetcher.sleep.assert_called_once_with(2.0)
+
+    def test_Fetcher_get_returns_last_error_after_retries(self, mock_get):
+        mock_get.return_value = make_response(status_code=502)
+        fetcher = self.get_fetcher(retries=2)
+        assert 502 == fetcher.get('https://example.com/mit.LICENSE').status_code
+        assert 3 == mock_get.call_count
+        assert 1 == fetcher.stats.failures
+
+        mock_get.side_effect = requests.exceptions.ConnectionError()
+        try:
+            fetcher.get('https://example.com/other.LICENSE')
+            self.fail('ConnectionError not raised')
+        except requests.exceptions.ConnectionError:
+            pass
+        assert 6 == mock_get.call_count
+        assert 2 == fetcher.stats.failures
+
+    def test_Fetcher_get_uses_stale_response_on_server_error(self, mock_get):
+        mock_get.return_value = make_response(text='mit text')
+        fetcher = self.get_fetcher(ttl=0, retries=0)
+        fetcher.get('https://example.com/mit.LICENSE')
+        mock_get.return_value = make_response(status_code=503)
+        response = fetcher.get('https://example.com/mit.LICENSE')
+        assert 200 == response.status_code
+        assert 'mit text' == response.text
+
+    def test_Fetcher_get_sends_concurrent_requests_for_the_same_url_once(self, mock_get):
+        import threading
+        started = threading.Event()
+        release = threading.Event()
+
+        def get(url, headers=None, timeout=None):
+            started.set()
+            release.wait(10)
+            return make_response(text=url)
+
+        mock_get.side_effect = get
+        fetcher = fetch.Fetcher(workers=4)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(
+                fetcher.get('https://example.com/mit.LICENSE')))
+            for _ in range(4)
+        ]
+        threads[0].start()
+        started.wait(10)
+        for thread in threads[1:]:
+            thread.start()
+        # wait for the other threads to wait on the request in progress
+        future, = fetcher.in_flight.values()
+        for _ in range(1000):
+            if len(future._condition._waiters) == 3:
+                break
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(10)
+        assert 4 == len(results)
+        assert 1 == mock_get.call_count
+        assert {'https://example.com/mit.LICENSE'} == {r.text for r in results}
+        assert {} == fetcher.in_flight
+
+    def test_Fetcher_get_rate_limits_per_host(self, mock_get):
+        mock_get.return_value = make_response()
+        fetcher = self.get_fetcher(rate=1, retries=0)
+        fetcher.get('https://example.com/a')
+        fetcher.get('https://example.com/b')
+        fetcher.get('https://other.example.com/a')
+        assert ['example.com', 'other.example.com'] == sorted(fetcher.buckets)
+        # the second request to the same host waits for about one second
+        assert 1 == fetcher.sleep.call_count
+        assert 0.9 < fetcher.sleep.call_args[0][0] <= 1
+
+
+class TokenBucketTest(unittest.TestCase):
+
+    def test_TokenBucket_acquire_waits_for_tokens(self):
+        now = [0.0]
+        sleep = mock.Mock()
+        bucket = fetch.TokenBucket(rate=2, capacity=2, clock=lambda: now[0], sleep=sleep)
+        bucket.acquire()
+        bucket.acquire()
+        assert not sleep.called
+        bucket.acquire()
+        sleep.assert_called_once_with(0.5)
+        now[0] = 10.0
+        sleep.reset_mock()
+        bucket.acquire()
+        assert not sleep.called
+
+
+class FetchStatsTest(unittest.TestCase):
+
+    def test_FetchStats_summary(self):
+        stats = fetch.FetchStats()
+        assert ('License data requests: 0, cached: 0, retries: 0, failures: 0'
+                == stats.summary())
+        for latency in (0.1, 0.2, 0.3):
+            stats.add_request(latency)
+        stats.add_cached()
+        stats.add_retry()
+        expected = (
+            'License data requests: 3, cached: 1, retries: 1, failures: 0, '
+            'latency: average 0.20s, p95 0.30s, max 0.30s')
+        assert expected == stats.summary()
+
+
+class HttpCacheTest(unittest.TestCase):
+
+    def test_HttpCache_does_not_store_urls_or_credentials(self):
+        cache_dir = get_temp_dir()
+        cache = fetch.HttpCache(cache_dir)
+        key = cache.get_key('https://example.com/?api_key=secret', {'Authorization': 'Token secret'})
+        cache.put(key, dict(status_code=200, text='', headers={}, fetched=0))
+        assert dict(status_code=200, text='', headers={}, fetched=0) == cache.get(key)
+        for base_dir, _dirs, files in os.walk(cache_dir):
+            for name in files:
+                assert 'secret' not in name
+                with open(os.path.join(base_dir, name)) as entry:
+                    assert 'secret' not in entry.read()
+
+    def test_HttpCache_get_ignores_invalid_entries(self):
+        cache = fetch.HttpCache(get_temp_dir())
+        key = cache.get_key('https://example.com/')
+        assert cache.get(key) is None
+        os.makedirs(os.path.dirname(cache.get_location(key)))
+        with open(cache.get_location(key), 'w') as entry:
+            entry.write('{"partial')
+        assert cache.get(key) is None
+
+    def test_configure_uses_environment(self):
+        env = {'ABOUTCODE_HTTP_CACHE_DIR': get_temp_dir(), 'ABOUTCODE_HTTP_CACHE_TTL': '60'}
+        with mock.patch.dict(os.environ, env):
+            fetcher = fetch.configure()
+            assert env['ABOUTCODE_HTTP_CACHE_DIR'] == fetcher.cache.location
+            assert 60 == fetcher.ttl
+            assert fetcher is fetch.get_fetcher()
+
+        with mock.patch.dict(os.environ, {'ABOUTCODE_HTTP_CACHE_DIR': ''}):
+            assert fetch.configure().cache is None
+        fetch.configure()
+
+    def test_configure_has_no_cache_by_default(self):
+        with mock.patch.dict(os.environ):
+            os.environ.pop('ABOUTCODE_HTTP_CACHE_DIR', None)
+            assert fetch.configure().cache is None
+            cache_dir = get_temp_dir()
+            assert cache_dir == fetch.configure(cache_dir=cache_dir).cache.location
+        fetch.configure()
@@ -14,7 +14,9 @@
 #  limitations under the License.
 # ============================================================================
 
+import os
 import unittest
+from unittest import mock
 
 from testing_utils import get_temp_dir
 from testing_utils import get_test_loc
@@ -25,6 +27,8 @@ from attributecode import INFO
 from attributecode import WARNING
 from attributecode import Error
 from attributecode import gen
+from attributecode import model
+from attributecode import util
 from unittest.case import skip
 
 
@@ -209,6 +213,29 @@ licenses:
         # We will only check the first element in the inventory list
         assert inventory[0] == expected
 
+    def test_load_inventory_with_scancode_grouped_by_package(self):
+        location = get_test_loc('test_gen/load/scancode-packages.json')
+        errors, abouts = gen.load_inventory(
+            location, from_attrib=True, scancode=True, group_by='package', group_depth=2)
+        assert not [e for e in errors if e.severity > INFO]
+
+        result = [(a.name.value, a.version.value, a.license_key.value, a.license_score.value)
+                  for a in abouts]
+        expected = [
+            ('foo', '1.0', [['mit'], ['apache-2.0']], [100.0, 90.0]),
+            ('vendor', '', [['bsd-new']], [100.0]),
+        ]
+        assert expected == result
+        assert [{'copyright': 'Copyright (c) Foo', 'start_line': 1, 'end_line': 1}] == abouts[0].copyrights.value
+
+    def test_load_inventory_with_scancode_reads_the_scan_once(self):
+        location = get_test_loc('test_gen/load/scancode-packages.json')
+        with mock.patch('attributecode.util.iter_scancode_json',
+                        wraps=util.iter_scancode_json) as iter_scancode_json:
+            errors, abouts = gen.load_inventory(location, from_attrib=True, scancode=True)
+        assert abouts
+        assert 1 == iter_scancode_json.call_count
+
     def test_generation_dir_endswith_space(self):
         location = get_test_loc(
             'test_gen/inventory/complex/about_file_path_dir_endswith_space.csv')
@@ -471,6 +498,31 @@ licenses:
         assert expected1 == result1
         assert expected2 == result2
 
+    @mock.patch.object(model, 'pre_process_and_fetch_license_dict')
+    def test_generate_with_license_link_writes_license_text_once(self, mock_fetch):
+        mock_fetch.return_value = ({'mit': [
+            'MIT License', 'mit.LICENSE', 'mit text', 'https://mit', 'MIT']}, [])
+        test_dir = get_temp_dir()
+        location = os.path.join(test_dir, 'inventory.csv')
+        with open(location, 'w') as inv:
+            inv.write(
+                'about_resource,name,license_expression\n'
+                'a/test.c,test.c,mit\n'
+                'b/test.h,test.h,mit\n'
+            )
+        base_dir = get_temp_dir()
+
+        errors, abouts = gen.generate(
+            location, base_dir, fetch_license=True, license_link='hardlink')
+
+        assert [] == [e for e in errors if e.severity > INFO]
+        assert 2 == len(abouts)
+        first = os.path.join(base_dir, 'a', 'mit.LICENSE')
+        second = os.path.join(base_dir, 'b', 'mit.LICENSE')
+        assert os.stat(first).st_ino == os.stat(second).st_ino
+        with open(second) as lf:
+            assert 'mit text' == lf.read()
+
     @skip('FIXME: this test is making a failed, live API call')
     def test_generate_not_overwrite_original_license_file(self):
         location = get_test_loc('test_gen/inv5.csv')
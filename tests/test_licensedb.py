@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: utf8 -*-
+
+# ============================================================================
+#  Copyright (c) nexB Inc. http://www.nexb.com/ - All rights reserved.
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#      http://www.apache.org/licenses/LICENSE-2.0
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ============================================================================
+
+import os
+import shutil
+import unittest
+import zipfile
+
+from testing_utils import get_temp_dir
+from testing_utils import get_test_loc
+
+from attributecode.licensedb import InvalidLicenseDB
+from attributecode.licensedb import LicenseDB
+
+
+class LicenseDBTest(unittest.TestCase):
+
+    def check_licensedb(self, licensedb):
+        assert 'mit' in licensedb
+        assert 'gpl-2.0' not in licensedb
+        assert 'mit' == licensedb.spdx_keys['MIT']
+        assert 'mit' == licensedb.spdx_keys['LicenseRef-MIT-Bootstrap']
+        assert 'apache-2.0' == licensedb.spdx_keys['Apache-2.0']
+
+        data = licensedb.get_license_data('mit')
+        assert 'MIT License' == data['short_name']
+        assert 'MIT' == data['spdx_license_key']
+        assert licensedb.get_license_data('gpl-2.0') is None
+
+        text = licensedb.get_license_text('apache-2.0')
+        assert text.startswith('Apache License\nVersion 2.0')
+        assert '' == licensedb.get_license_text('gpl-2.0')
+
+    def test_LicenseDB_from_directory(self):
+        location = get_test_loc('test_licensedb/licensedb')
+        self.check_licensedb(LicenseDB(location))
+
+    def test_LicenseDB_from_zip_archive(self):
+        location = get_test_loc('test_licensedb/licensedb')
+        archive = shutil.make_archive(
+            os.path.join(get_temp_dir(), 'licensedb'), 'zip',
+            root_dir=os.path.dirname(location), base_dir='licensedb')
+        self.check_licensedb(LicenseDB(archive))
+
+    def test_LicenseDB_from_tar_archive(self):
+        location = get_test_loc('test_licensedb/licensedb')
+        archive = shutil.make_archive(
+            os.path.join(get_temp_dir(), 'licensedb'), 'gztar',
+            root_dir=location)
+        self.check_licensedb(LicenseDB(archive))
+
+    def test_LicenseDB_from_archive_with_index_at_the_root(self):
+        location = get_test_loc('test_licensedb/licensedb')
+        archive = os.path.join(get_temp_dir(), 'licensedb.zip')
+        with zipfile.ZipFile(archive, 'w') as zf:
+            for name in sorted(os.listdir(location)):
+                zf.write(os.path.join(location, name), name)
+            zf.writestr('sub/index.json', '[]')
+        self.check_licensedb(LicenseDB(archive))
+
+    def test_LicenseDB_get_license_data_with_invalid_json(self):
+        location = os.path.join(get_temp_dir(), 'licensedb')
+        shutil.copytree(get_test_loc('test_licensedb/licensedb'), location)
+        with open(os.path.join(location, 'mit.json'), 'w') as out:
+            out.write('{"key": "mit",')
+        licensedb = LicenseDB(location)
+        assert licensedb.get_license_data('mit') is None
+        assert [] == list(licensedb.licenses)
+
+    def test_LicenseDB_loads_license_data_once(self):
+        licensedb = LicenseDB(get_test_loc('test_licensedb/licensedb'))
+        data = licensedb.get_license_data('mit')
+        assert data is licensedb.get_license_data('mit')
+        assert ['mit'] == list(licensedb.licenses)
+
+    def test_LicenseDB_raises_InvalidLicenseDB_without_index(self):
+        try:
+            LicenseDB(get_temp_dir())
+            self.fail('InvalidLicenseDB not raised')
+        except InvalidLicenseDB as e:
+            assert 'No index.json found in' in str(e)
+
+    def test_LicenseDB_raises_InvalidLicenseDB_for_invalid_archive(self):
+        location = os.path.join(get_temp_dir(), 'licensedb.zip')
+        with open(location, 'w') as archive:
+            archive.write('not a zip')
+        try:
+            LicenseDB(location)
+            self.fail('InvalidLicenseDB not raised')
+        except InvalidLicenseDB as e:
+            assert 'Cannot load LicenseDB from' in str(e)
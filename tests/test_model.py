@@ -21,6 +21,7 @@ import posixpath
 import shutil
 import unittest
 from unittest import mock
+from unittest.case import skipIf
 
 import saneyaml
 
@@ -31,7 +32,10 @@ from attributecode import WARNING
 from attributecode import Error
 from attributecode import model
 from attributecode.util import add_unc, norm, on_windows
+from attributecode.util import get_about_locations
+from attributecode.util import get_relative_path
 from attributecode.util import load_csv
+from attributecode.util import PathIndex
 from attributecode.util import to_posix
 from attributecode.util import replace_tab_with_spaces
 
@@ -547,6 +551,40 @@ class AboutTest(unittest.TestCase):
         ]
         assert sorted(expected) == sorted(result)
 
+    def test_About_custom_fields_are_accessible_as_attributes(self):
+        test_file = get_test_loc(
+            'test_model/custom_fields/custom_fields.about')
+        a = model.About(test_file)
+        assert 'README STUFF' == a.single_line.value
+        assert a.custom_fields['other'] is a.other
+        assert not hasattr(a, 'not_a_field')
+
+    def test_About_standard_fields_are_accessible_as_attributes(self):
+        test_file = get_test_loc('test_model/inventory/complex/about/pip.ABOUT')
+        a = model.About(test_file)
+        assert 'pip' == a.name.value
+        assert a.fields['name'] is a.name
+        assert a.name is not model.About().name
+        expected = [d.name for d in model.About.field_schema]
+        assert expected == list(a.fields)
+        assert all(f.required == (f.name == 'name') for f in a.fields.values())
+
+    def test_About_fields_are_compact(self):
+        a = model.About()
+        for field in a.fields.values():
+            assert not hasattr(field, '__dict__')
+        assert [] == a.name.errors
+
+    def test_About_can_be_pickled(self):
+        import pickle
+        test_file = get_test_loc('test_model/inventory/complex/about/pip.ABOUT')
+        a = model.About(test_file)
+        result = pickle.loads(pickle.dumps(a))
+        assert a == result
+        assert a.errors == result.errors
+        assert a.about_resource.resolved_paths == result.about_resource.resolved_paths
+        assert 'pip' == result.name.value
+
     def test_About_has_errors_for_illegal_custom_field_name(self):
         test_file = get_test_loc('test_model/parse/illegal_custom_field.about')
         a = model.About(test_file)
@@ -600,6 +638,138 @@ this software and releases the component to Public Domain.
         result = a.notice_file.value['notice_text.NOTICE']
         assert expected == result
 
+    def test_About_license_text_is_loaded_when_accessed(self):
+        test_dir = get_temp_dir()
+        test_file = os.path.join(test_dir, 'test.ABOUT')
+        license_file = os.path.join(test_dir, 'test.LICENSE')
+        with open(test_file, 'w') as tf:
+            tf.write('about_resource: .\nname: test\nlicense_file: test.LICENSE\n')
+        with open(license_file, 'w') as lf:
+            lf.write('original')
+        a = model.About(test_file)
+        assert [] == a.errors
+        with open(license_file, 'w') as lf:
+            lf.write('changed')
+        assert 'changed' == a.license_file.value['test.LICENSE']
+
+    def test_About_license_text_is_read_once_for_many_abouts(self):
+        test_file = get_test_loc(
+            'test_model/parse/license_file_notice_file.ABOUT')
+        model.clear_text_caches()
+        abouts = [model.About(test_file) for _ in range(3)]
+        texts = [a.license_file.value['license_text.LICENSE'] for a in abouts]
+        assert 1 == len(set(texts))
+        assert 1 == model._read_text.cache_info().misses
+
+    def test_collect_inventory_clears_the_texts_of_a_previous_inventory(self):
+        model.text_store.intern('text of a previous inventory')
+        test_loc = get_test_loc('test_model/parse/license_file_notice_file.ABOUT')
+        model.collect_inventory(test_loc)
+        key = model.TextStore.get_key('text of a previous inventory')
+        assert model.text_store.get(key) is None
+
+    def test_read_text_and_get_read_error_reload_a_modified_file(self):
+        test_file = get_temp_file('test.LICENSE')
+        assert model.get_read_error(test_file)
+        assert model.read_text(test_file) is None
+        with open(test_file, 'w') as tf:
+            tf.write('original')
+        assert model.get_read_error(test_file) is None
+        assert 'original' == model.read_text(test_file)
+        with open(test_file, 'w') as tf:
+            tf.write('modified text')
+        assert 'modified text' == model.read_text(test_file)
+
+    def test_About_reports_unreadable_license_file(self):
+        test_dir = get_temp_dir()
+        test_file = os.path.join(test_dir, 'test.ABOUT')
+        os.mkdir(os.path.join(test_dir, 'test.LICENSE'))
+        with open(test_file, 'w') as tf:
+            tf.write('about_resource: .\nname: test\nlicense_file: test.LICENSE\n')
+        a = model.About(test_file)
+        assert 1 == len(a.errors)
+        assert a.errors[0].message.startswith(
+            'Field license_file: Failed to load text at path: test.LICENSE')
+        assert {'test.LICENSE': None} == a.license_file.value
+
+    def test_FileTexts_can_set_texts(self):
+        texts = model.FileTexts({'missing.LICENSE': None})
+        assert texts['missing.LICENSE'] is None
+        texts['mit.LICENSE'] = 'mit text'
+        texts['missing.LICENSE'] = 'text'
+        assert ['missing.LICENSE', 'mit.LICENSE'] == list(texts)
+        assert {'missing.LICENSE': 'text', 'mit.LICENSE': 'mit text'} == texts
+        del texts['mit.LICENSE']
+        assert {'missing.LICENSE': 'text'} == texts
+
+    def test_TextStore_intern_returns_the_same_text_object(self):
+        store = model.TextStore()
+        text1 = ''.join(['mit ', 'license'])
+        text2 = ''.join(['mit ', 'license'])
+        assert text1 is not text2
+        assert store.intern(text1) is text1
+        assert store.intern(text2) is text1
+        assert text1 == store.get(model.TextStore.get_key(text2))
+        assert 1 == len(store.texts)
+        assert '' == store.intern('')
+        assert None is store.intern(None)
+
+    def test_About_license_texts_with_same_content_are_shared(self):
+        test_dir = get_temp_dir()
+        for name in ('a', 'b'):
+            os.mkdir(os.path.join(test_dir, name))
+            with open(os.path.join(test_dir, name, 'test.ABOUT'), 'w') as tf:
+                tf.write('about_resource: .\nname: test\nlicense_file: mit.LICENSE\n')
+            with open(os.path.join(test_dir, name, 'mit.LICENSE'), 'w') as lf:
+                lf.write('Permission is hereby granted, free of charge')
+        a = model.About(os.path.join(test_dir, 'a', 'test.ABOUT'))
+        b = model.About(os.path.join(test_dir, 'b', 'test.ABOUT'))
+        text_a = a.license_file.value['mit.LICENSE']
+        text_b = b.license_file.value['mit.LICENSE']
+        assert 'Permission is hereby granted, free of charge' == text_a
+        assert text_a is text_b
+
+    def test_LicenseFileWriter_writes_files(self):
+        test_dir = get_temp_dir()
+        writer = model.LicenseFileWriter()
+        first = os.path.join(test_dir, 'first.LICENSE')
+        second = os.path.join(test_dir, 'second.LICENSE')
+        writer.write(first, 'mit text')
+        writer.write(second, 'mit text')
+        assert not os.path.islink(second)
+        assert os.stat(first).st_ino != os.stat(second).st_ino
+        with open(second) as lf:
+            assert 'mit text' == lf.read()
+
+    def test_LicenseFileWriter_writes_hardlinks(self):
+        test_dir = get_temp_dir()
+        writer = model.LicenseFileWriter(link='hardlink')
+        first = os.path.join(test_dir, 'first.LICENSE')
+        second = os.path.join(test_dir, 'second.LICENSE')
+        other = os.path.join(test_dir, 'other.LICENSE')
+        writer.write(first, 'mit text')
+        writer.write(second, 'mit text')
+        writer.write(other, 'apache text')
+        assert os.stat(first).st_ino == os.stat(second).st_ino
+        assert os.stat(first).st_ino != os.stat(other).st_ino
+        with open(second) as lf:
+            assert 'mit text' == lf.read()
+
+    @skipIf(on_windows, 'Symlinks may not be supported on Windows')
+    def test_LicenseFileWriter_writes_relative_symlinks(self):
+        test_dir = get_temp_dir()
+        os.mkdir(os.path.join(test_dir, 'a'))
+        os.mkdir(os.path.join(test_dir, 'b'))
+        writer = model.LicenseFileWriter(link='symlink')
+        first = os.path.join(test_dir, 'a', 'mit.LICENSE')
+        second = os.path.join(test_dir, 'b', 'mit.LICENSE')
+        writer.write(first, 'mit text')
+        writer.write(second, 'mit text')
+        assert os.path.islink(second)
+        assert '../a/mit.LICENSE' == os.readlink(second)
+        with open(second) as lf:
+            assert 'mit text' == lf.read()
+
     def test_About_license_and_notice_text_are_empty_if_field_missing(self):
         test_file = get_test_loc('test_model/parse/no_file_fields.ABOUT')
         a = model.About(test_file)
@@ -1225,6 +1395,79 @@ class CollectorTest(unittest.TestCase):
         assert expected_lic == returned_lic
         assert expected_spec_char == spec_char
 
+    def test_parse_license_expression_with_invalid_expression(self):
+        result = model.parse_license_expression('mit and (apache-2.0')
+        assert ([], [], 'mit and (apache-2.0') == result
+
+    def test_parse_license_expression_is_parsed_once_and_returns_new_lists(self):
+        model._parse_license_expression.cache_clear()
+        expression = 'gpl-2.0 with classpath-exception-2.0 or mit'
+        _spec_char, lic_list1, _invalid = model.parse_license_expression(expression)
+        lic_list1.append('bsd-new')
+        _spec_char, lic_list2, _invalid = model.parse_license_expression(expression)
+        assert ['gpl-2.0', 'classpath-exception-2.0', 'mit'] == lic_list2
+        assert 1 == model._parse_license_expression.cache_info().misses
+        assert 1 == model._parse_license_expression.cache_info().hits
+
+    def test_SpdxTranslator_translate(self):
+        translator = model.SpdxTranslator({
+            'Apache-2.0': 'apache-2.0',
+            'MIT': 'mit',
+            'GPL-2.0-only': 'gpl-2.0',
+            'GPL-2.0': 'gpl-2.0',
+            'Classpath-exception-2.0': 'classpath-exception-2.0',
+        })
+        assert 'mit' == translator.translate('MIT')
+        assert 'apache-2.0 OR mit' == translator.translate('(Apache-2.0 OR MIT)')
+        assert 'apache-2.0 OR mit' == translator.translate('( apache-2.0 or mit )')
+        expected = '(apache-2.0 OR mit) AND gpl-2.0 WITH classpath-exception-2.0'
+        assert expected == translator.translate(
+            '(Apache-2.0 OR MIT) AND GPL-2.0-only WITH Classpath-exception-2.0')
+        assert 'gpl-2.0 AND unknown-spdx' == translator.translate('GPL-2.0 AND unknown-spdx')
+        assert 'mit and (' == translator.translate('mit and (')
+
+    def test_SpdxTranslator_translates_each_expression_once(self):
+        translator = model.SpdxTranslator({'MIT': 'mit'})
+        with mock.patch.object(translator, '_translate', return_value='mit') as translate:
+            translator.translate('MIT')
+            translator.translate('MIT')
+        assert 1 == translate.call_count
+
+    def test_convert_spdx_expression_to_lic_expression(self):
+        spdx_lic_dict = {'MIT': 'mit', 'Apache-2.0': 'apache-2.0'}
+        result = model.convert_spdx_expression_to_lic_expression(
+            'MIT AND (Apache-2.0 OR MIT)', spdx_lic_dict)
+        assert 'mit AND (apache-2.0 OR mit)' == result
+
+    def test_get_spdx_translator_reuses_the_translator_of_a_mapping(self):
+        spdx_lic_dict = {'MIT': 'mit'}
+        translator = model.get_spdx_translator(spdx_lic_dict)
+        assert translator is model.get_spdx_translator(spdx_lic_dict)
+        assert translator is not model.get_spdx_translator({'MIT': 'mit'})
+        spdx_lic_dict['Apache-2.0'] = 'apache-2.0'
+        assert 'apache-2.0' == model.get_spdx_translator(spdx_lic_dict).translate('Apache-2.0')
+
+    def test_LicenseRegistry(self):
+        mit = model.License('mit', 'MIT License', 'mit.LICENSE', '', 'mit text')
+        gpl = model.License('gpl-2.0', 'GPL 2.0', 'gpl-2.0.LICENSE', '', 'gpl text')
+        other_mit = model.License('mit', 'MIT', 'mit.txt', '', 'other text')
+        registry = model.LicenseRegistry([mit, gpl])
+
+        assert mit is registry.add(other_mit)
+        assert mit is registry['mit']
+        assert 'gpl' not in registry
+        assert registry.get('gpl') is None
+        assert [gpl, mit] == registry.sorted()
+        assert 'GPL 2.0 OR MIT License OR bsd-new' == registry.get_name_expression(
+            'gpl-2.0 OR mit OR bsd-new')
+
+        registry.keep({'mit'})
+        assert [mit] == list(registry)
+
+    def test_detect_special_char_returns_chars_in_a_stable_order(self):
+        assert [] == model.detect_special_char('mit or apache-2.0')
+        assert ['!', '@', ',', '/'] == model.detect_special_char('mit/ @, a!@')
+
     def test_collect_inventory_works_with_relative_paths(self):
         # FIXME: This test need to be run under src/attributecode/
         # or otherwise it will fail as the test depends on the launching
@@ -1289,6 +1532,54 @@ class CollectorTest(unittest.TestCase):
         expected = get_test_loc('test_model/inventory/complex/expected.csv')
         check_csv(expected, result, fix_cell_linesep=True, regen=False)
 
+    def test_collect_inventory_with_processes_keeps_order_and_errors(self):
+        location = get_test_loc('test_model/inventory/complex')
+        errors, abouts = model.collect_inventory(location)
+        errors2, abouts2 = model.collect_inventory(location, processes=2)
+        assert errors == errors2
+        assert [a.about_file_path for a in abouts] == [
+            a.about_file_path for a in abouts2]
+        assert abouts == abouts2
+
+    def test_collect_inventory_with_processes_collects_custom_fields(self):
+        test_loc = get_test_loc('test_model/inventory')
+        errors, _abouts = model.collect_inventory(test_loc)
+        errors2, _abouts2 = model.collect_inventory(test_loc, processes=2)
+        assert errors == errors2
+
+    def test_collect_inventory_uses_a_path_index(self):
+        location = get_test_loc('test_model/inventory/complex')
+        errors, abouts = model.collect_inventory(location)
+        about_locations = list(get_about_locations(location))
+        path_index = PathIndex(location)
+        abouts2 = [
+            model.About(
+                loc, get_relative_path(location, loc),
+                path_index=path_index)
+            for loc in about_locations
+        ]
+        assert abouts == abouts2
+        assert [a.errors for a in abouts] == [a.errors for a in abouts2]
+
+    def test_About_with_a_path_index_reports_missing_files(self):
+        test_file = get_test_loc(
+            'test_model/parse/missing_notice_license_files.ABOUT')
+        path_index = PathIndex(posixpath.dirname(test_file))
+        a = model.About(test_file, path_index=path_index)
+
+        file_path1 = posixpath.join(
+            posixpath.dirname(test_file), 'test.LICENSE')
+        file_path2 = posixpath.join(
+            posixpath.dirname(test_file), 'test.NOTICE')
+
+        err_msg1 = Error(
+            CRITICAL, 'Field license_file: Path %s not found' % file_path1)
+        err_msg2 = Error(
+            CRITICAL, 'Field notice_file: Path %s not found' % file_path2)
+
+        expected_errors = [err_msg1, err_msg2]
+        assert expected_errors == a.errors
+
     def test_collect_inventory_does_not_convert_lf_to_crlf_from_directory(self):
         location = get_test_loc('test_model/crlf/about.ABOUT')
         result = get_temp_file()
@@ -1360,7 +1651,7 @@ class CollectorTest(unittest.TestCase):
 
 class FetchLicenseTest(unittest.TestCase):
 
-    @mock.patch.object(model, 'get')
+    @mock.patch.object(model, 'head')
     def test_valid_api_url(self, mock_data):
         mock_data.return_value = ''
         assert model.valid_api_url('non_valid_url') is False
@@ -1396,3 +1687,105 @@ class FetchLicenseTest(unittest.TestCase):
         expected = ({}, [])
 
         assert model.pre_process_and_fetch_license_dict([]) == expected
+
+    @mock.patch.object(model, 'get')
+    @mock.patch('attributecode.util.have_network_connection')
+    def test_pre_process_and_fetch_license_dict_with_licensedb_mirror(self, have_network_connection, mock_get):
+        from attributecode.licensedb import LicenseDB
+        licensedb = LicenseDB(get_test_loc('test_licensedb/licensedb'))
+        about = model.About()
+        about.about_file_path = 'test.ABOUT'
+        about.license_expression.value = 'mit AND unknown'
+        about.license_expression.present = True
+        other = model.About()
+        other.spdx_license_expression.value = 'Apache-2.0'
+        other.spdx_license_expression.present = True
+
+        license_dict, errors = model.pre_process_and_fetch_license_dict(
+            [about, other], licensedb=licensedb)
+
+        assert not have_network_connection.called
+        assert not mock_get.called
+        assert [Error(ERROR, "test.ABOUT : Invalid 'license': unknown")] == errors
+        assert ['mit', 'apache-2.0'] == list(license_dict)
+        name, filename, text, url, spdx_key = license_dict['mit']
+        assert 'MIT License' == name
+        assert 'mit.LICENSE' == filename
+        assert text.startswith('Permission is hereby granted')
+        assert 'https://scancode-licensedb.aboutcode.org/mit.LICENSE' == url
+        assert 'MIT' == spdx_key
+        assert 'apache-2.0' == other.license_expression.value
+
+    @mock.patch.object(model, 'get_spdx_key_and_lic_key_from_licdb')
+    @mock.patch.object(model, 'valid_api_url')
+    @mock.patch('attributecode.util.have_network_connection')
+    @mock.patch.object(model, 'get')
+    def test_pre_process_and_fetch_license_dict_reports_errors_in_order(self, mock_get, have_network_connection, valid_api_url, get_spdx):
+        have_network_connection.return_value = True
+        valid_api_url.return_value = True
+        get_spdx.return_value = {}
+
+        def get(url):
+            key = url.rsplit('/', 1)[-1].rsplit('.', 1)[0]
+            response = mock.Mock()
+            response.status_code = 404 if key.startswith('bad') else 200
+            response.text = key + ' text'
+            if url.endswith('.json'):
+                response.text = json.dumps(dict(
+                    key=key, short_name=key.upper(), spdx_license_key=key))
+            return response
+
+        mock_get.side_effect = get
+        abouts = []
+        for i, expression in enumerate([
+                'mit AND bad1', 'bad2 OR apache-2.0', 'mit AND bad1 AND gpl@', 'bsd-new']):
+            about = model.About()
+            about.about_file_path = 'about%d.ABOUT' % i
+            about.license_expression.value = expression
+            about.license_expression.present = True
+            abouts.append(about)
+
+        license_dict, errors = model.pre_process_and_fetch_license_dict(abouts)
+
+        expected_errors = [
+            Error(ERROR, "about0.ABOUT : Invalid 'license': bad1"),
+            Error(ERROR, "about1.ABOUT : Invalid 'license': bad2"),
+            Error(ERROR, "about2.ABOUT: The following character(s) cannot be in the license_expression: ['@']"),
+        ]
+        assert expected_errors == errors
+        assert ['mit', 'apache-2.0', 'bsd-new'] == list(license_dict)
+        assert ['MIT', 'mit.LICENSE', 'mit text', 'https://scancode-licensedb.aboutcode.org/mit.LICENSE', 'mit'] == license_dict['mit']
+        # one request for the JSON and one for the text of each valid key
+        assert 8 == mock_get.call_count
+
+    @mock.patch.object(model, 'get_spdx_key_and_lic_key_from_licdb')
+    @mock.patch.object(model, 'valid_api_url')
+    @mock.patch('attributecode.util.have_network_connection')
+    @mock.patch('attributecode.api.request_license_data')
+    @mock.patch('attributecode.api.request_licenses_data')
+    def test_pre_process_and_fetch_license_dict_with_bulk_api_requests(self, request_licenses_data, request_license_data, have_network_connection, valid_api_url, get_spdx):
+        have_network_connection.return_value = True
+        valid_api_url.return_value = True
+        get_spdx.return_value = {}
+        request_licenses_data.return_value = {
+            'mit': {'short_name': 'MIT', 'full_text': 'mit text', 'spdx_license_key': 'MIT'},
+        }
+        request_license_data.return_value = (
+            {}, [Error(ERROR, "Invalid 'license': unknown")])
+        about = model.About()
+        about.about_file_path = 'test.ABOUT'
+        about.license_expression.value = 'mit AND unknown'
+        about.license_expression.present = True
+
+        license_dict, errors = model.pre_process_and_fetch_license_dict(
+            [about], api_url='https://dejacode.example.com/api/v2/licenses/', api_key='key')
+
+        request_licenses_data.assert_called_once_with(
+            'https://dejacode.example.com/api/v2/licenses/', 'key', ['mit', 'unknown'])
+        request_license_data.assert_called_once_with(
+            'https://dejacode.example.com/api/v2/licenses/', 'key', 'unknown')
+        assert [Error(ERROR, "test.ABOUT: Invalid 'license': unknown")] == errors
+        expected = {'mit': [
+            'MIT', 'mit.LICENSE', 'mit text',
+            'https://dejacode.example.com/urn/?urn=urn:dje:license:mit', 'MIT']}
+        assert expected == license_dict
@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+# -*- coding: utf8 -*-
+
+# ============================================================================
+#  Copyright (c) nexB Inc. http://www.nexb.com/ - All rights reserved.
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#      http://www.apache.org/licenses/LICENSE-2.0
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ============================================================================
+
+import os
+import unittest
+
+from testing_utils import get_test_loc
+
+from attributecode import parser
+from attributecode import saneyaml
+from attributecode.util import replace_tab_with_spaces
+from attributecode.util import wrap_boolean_value
+
+
+def yaml_load(text, wrap_booleans=True):
+    """
+    Return a mapping loaded from an ABOUT file `text` with saneyaml.
+    """
+    if wrap_booleans:
+        text = wrap_boolean_value(text)
+    text = replace_tab_with_spaces(text)
+    return saneyaml.load(text, allow_duplicate_keys=False)
+
+
+class ParserTest(unittest.TestCase):
+
+    def check_fast_load(self, text, expected, wrap_booleans=True):
+        result = parser.fast_load(text, wrap_booleans=wrap_booleans)
+        assert expected == result
+        assert list(expected.items()) == list(result.items())
+        assert yaml_load(text, wrap_booleans=wrap_booleans) == result
+
+    def test_fast_load_simple_fields(self):
+        test = (
+            'about_resource: .\n'
+            'name: AboutCode\n'
+            'version: 0.11.0\n'
+            '\n'
+            '# a comment\n'
+            'owner: nexB Inc.\n'
+            'download_url: http://example.com/a.zip\n'
+            'copyright:\n'
+        )
+        expected = {
+            'about_resource': '.',
+            'name': 'AboutCode',
+            'version': '0.11.0',
+            'owner': 'nexB Inc.',
+            'download_url': 'http://example.com/a.zip',
+            'copyright': '',
+        }
+        self.check_fast_load(test, expected)
+
+    def test_fast_load_quoted_values_and_booleans(self):
+        test = (
+            "name: 'it''s'\n"
+            'version: "1.0"\n'
+            'redistribute: yes\n'
+            'attribute: No\n'
+            'modified:\n'
+            'custom: True\n'
+            'other: off\n'
+        )
+        expected = {
+            'name': "it's",
+            'version': '1.0',
+            'redistribute': 'yes',
+            'attribute': 'No',
+            'modified': '',
+            'custom': True,
+            'other': False,
+        }
+        self.check_fast_load(test, expected)
+
+    def test_fast_load_does_not_wrap_booleans(self):
+        test = 'redistribute: yes\nattribute: False\n'
+        expected = {'redistribute': True, 'attribute': False}
+        self.check_fast_load(test, expected, wrap_booleans=False)
+
+    def test_fast_load_literal_block(self):
+        test = (
+            'name: foo\n'
+            'notes: |\n'
+            '    line1\n'
+            '\n'
+            '      indented\tline2\n'
+            '\n'
+            '\n'
+            'version: 1\n'
+        )
+        expected = {
+            'name': 'foo',
+            'notes': 'line1\n\n  indented    line2\n',
+            'version': '1',
+        }
+        self.check_fast_load(test, expected)
+
+    def test_fast_load_multi_line_plain_scalar(self):
+        test = (
+            'description: AboutCode is a tool \n'
+            ' to process ABOUT files. \n'
+            '\n'
+            '  An ABOUT file is a file.\n'
+            'name: foo\n'
+        )
+        expected = {
+            'description': 'AboutCode is a tool to process ABOUT files.\n'
+                           'An ABOUT file is a file.',
+            'name': 'foo',
+        }
+        self.check_fast_load(test, expected)
+
+    def test_fast_load_licenses_list(self):
+        test = (
+            'name: foo\n'
+            'licenses:\n'
+            '    - key: apache-2.0\n'
+            '      name: Apache 2.0\n'
+            '      file: apache-2.0.LICENSE\n'
+            '    -   key: mit\n'
+            '        name: MIT License\n'
+            'keywords:\n'
+            '- one\n'
+            "- 'two'\n"
+            'version: 1\n'
+        )
+        expected = {
+            'name': 'foo',
+            'licenses': [
+                {'key': 'apache-2.0', 'name': 'Apache 2.0',
+                 'file': 'apache-2.0.LICENSE'},
+                {'key': 'mit', 'name': 'MIT License'},
+            ],
+            'keywords': ['one', 'two'],
+            'version': '1',
+        }
+        self.check_fast_load(test, expected)
+
+    def test_fast_load_raises_UnsupportedSyntax(self):
+        tests = [
+            '',
+            '# only a comment\n',
+            'name: foo: bar\n',
+            'name: [foo]\n',
+            'name: &anchor foo\n',
+            'name: "escaped\\tvalue"\n',
+            'name: "multi\n  line"\n',
+            'notes: >\n  folded\n',
+            'notes: |-\n  stripped\n',
+            'name : foo\n',
+            'name: foo\nname: bar\n',
+            'name: foo # comment\n',
+            'yes: foo\n',
+            'redistribute: "yes"\n',
+            'licenses:\n    key: value\n',
+            'licenses:\n    - key: value\n        nested: value\n',
+            'licenses:\n    - key: value\n      key: value\n',
+            '---\nname: foo\n',
+            'name: foo\x01\n',
+        ]
+        for test in tests:
+            try:
+                parser.fast_load(test)
+                self.fail('UnsupportedSyntax not raised for: %(test)r' % locals())
+            except parser.UnsupportedSyntax:
+                pass
+
+    def test_load_falls_back_to_yaml(self):
+        test = 'name : foo\nnotes: >\n  folded\n  text\n'
+        expected = {'name': 'foo', 'notes': 'folded text\n'}
+        assert expected == parser.load(test)
+
+    def test_load_raises_on_duplicated_keys(self):
+        test = 'name: foo\nname: bar\n'
+        try:
+            parser.load(test)
+            self.fail('Exception not raised')
+        except Exception as e:
+            assert 'Duplicate key' in str(e)
+
+    def test_load_is_the_same_as_yaml_load_for_all_test_about_files(self):
+        test_dir = get_test_loc('.')
+        for base_dir, _dirs, files in os.walk(test_dir):
+            for name in files:
+                if not name.lower().endswith('.about'):
+                    continue
+                location = os.path.join(base_dir, name)
+                with open(location, encoding='utf-8', errors='replace') as f:
+                    text = f.read()
+                for wrap_booleans in (True, False):
+                    try:
+                        expected = yaml_load(text, wrap_booleans)
+                    except Exception:
+                        continue
+                    result = parser.load(text, wrap_booleans)
+                    assert (location, expected) == (location, result)
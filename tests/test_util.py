@@ -14,6 +14,7 @@
 #  limitations under the License.
 # ============================================================================
 
+import os
 import string
 import unittest
 
@@ -285,6 +286,108 @@ class TestGetLocations(unittest.TestCase):
         expected = 'get_about_locations/about.ABOUT'
         assert result[0].endswith(expected)
 
+    def test_get_about_locations_returns_the_same_order_as_os_walk(self):
+        test_dir = get_test_loc('test_model/inventory')
+        expected = []
+        for base_dir, _, files in os.walk(test_dir):
+            for name in files:
+                if name.lower().endswith('.about'):
+                    expected.append(util.to_posix(os.path.join(base_dir, name)))
+        assert expected == list(util.get_about_locations(test_dir))
+
+    def create_tree(self, paths):
+        """
+        Return the location of a new temporary directory tree with files at
+        `paths`.
+        """
+        test_dir = get_temp_dir()
+        for path in paths:
+            location = os.path.join(test_dir, path)
+            parent = os.path.dirname(location)
+            if not os.path.exists(parent):
+                os.makedirs(parent)
+            with open(location, 'w') as f:
+                f.write('about_resource: .\n')
+        return test_dir
+
+    def test_get_about_locations_with_exclude(self):
+        test_dir = self.create_tree([
+            'a.ABOUT',
+            '.git/objects/b.ABOUT',
+            'node_modules/c/c.ABOUT',
+            'src/build/d.ABOUT',
+            'build/e.ABOUT',
+            'src/f.ABOUT',
+            'src/g.txt.ABOUT',
+        ])
+        exclude = ['.git/', 'node_modules', 'src/build', '*.txt.ABOUT']
+        result = sorted(util.get_about_locations(test_dir, exclude=exclude))
+        result = [r.partition(util.to_posix(test_dir) + '/')[-1] for r in result]
+        expected = ['a.ABOUT', 'build/e.ABOUT', 'src/f.ABOUT']
+        assert expected == result
+
+    def test_get_about_locations_with_directory_only_exclude(self):
+        test_dir = self.create_tree([
+            'build/a.ABOUT',
+            'src/build.ABOUT',
+        ])
+        result = list(util.get_about_locations(test_dir, exclude=['build*/']))
+        assert 1 == len(result)
+        assert result[0].endswith('src/build.ABOUT')
+
+    def test_get_about_locations_with_aboutignore_file(self):
+        test_dir = self.create_tree([
+            'a.ABOUT',
+            'vendor/b.ABOUT',
+            'third/party/c.ABOUT',
+        ])
+        with open(os.path.join(test_dir, util.ABOUT_IGNORE_FILE), 'w') as f:
+            f.write('# vendored code\nvendor/\n\nthird/*\n')
+        result = list(util.get_about_locations(test_dir))
+        assert 1 == len(result)
+        assert result[0].endswith('/a.ABOUT')
+
+    def test_get_locations_with_exclude(self):
+        test_dir = get_test_loc('test_util/about_locations')
+        expected = sorted([
+            'file with_spaces.ABOUT',
+            'file1',
+            'file2',
+            'dir2/file1'])
+
+        result = sorted(util.get_locations(test_dir, exclude=['dir1']))
+        result = [l.partition('/about_locations/')[-1] for l in result]
+        assert expected == result
+
+    def test_PathIndex_exists(self):
+        test_dir = get_test_loc('test_util/about_locations')
+        path_index = util.PathIndex(test_dir)
+        root = util.to_posix(test_dir)
+        assert path_index.exists(root)
+        assert path_index.exists(root + '/dir1')
+        assert path_index.exists(root + '/dir1/dir2/file1.about')
+        assert path_index.exists(root + '/file with_spaces.ABOUT')
+        assert not path_index.exists(root + '/dir1/missing')
+        assert not path_index.exists(root + '/missing/file1')
+
+    def test_PathIndex_exists_falls_back_to_filesystem_outside_of_root(self):
+        test_dir = get_test_loc('test_util/about_locations/dir1')
+        path_index = util.PathIndex(test_dir)
+        other = util.to_posix(get_test_loc('test_util/about_locations/file1'))
+        assert not path_index.is_indexed(other)
+        assert path_index.exists(other)
+        assert not path_index.exists(other + '.missing')
+
+    def test_PathIndex_lists_only_the_directories_of_checked_paths(self):
+        test_dir = get_test_loc('test_util/about_locations')
+        path_index = util.PathIndex(test_dir)
+        root = util.to_posix(test_dir)
+        assert path_index.exists(root + '/dir1/dir2/file1.about')
+        assert path_index.exists(root + '/dir1/file2')
+        assert not path_index.exists(root + '/dir1/missing')
+        expected = [root + '/dir1', root + '/dir1/dir2']
+        assert expected == sorted(path_index.directories)
+
     # FIXME: these are not very long/deep paths
     def test_get_locations_with_very_long_path(self):
         longpath = (
@@ -459,6 +562,116 @@ class TestJson(unittest.TestCase):
         result = util.load_scancode_json(test_file)
         assert expected == result
 
+    def test_JSONStreamReader_decodes_values_across_chunks(self):
+        import io
+        import json
+        data = {
+            'headers': [{'tool_name': 'scancode-toolkit', 'count': 12345}],
+            'count': 1234567,
+            'files': [{'path': 'a/b.c', 'size': 987654, 'x': [1.5, None, True]}] * 3,
+            'empty': [],
+        }
+        stream = io.StringIO(json.dumps(data, indent=2))
+        reader = util.JSONStreamReader(stream, chunk_size=3)
+        result = {}
+        for key in reader.iter_object():
+            if key == 'files':
+                result[key] = list(reader.iter_array())
+            else:
+                result[key] = reader.value()
+        assert data == result
+
+    def test_JSONStreamReader_raises_ValueError_on_truncated_json(self):
+        import io
+        stream = io.StringIO('{"files": [{"path": "a"}, {"path": ')
+        reader = util.JSONStreamReader(stream, chunk_size=4)
+        try:
+            for key in reader.iter_object():
+                list(reader.iter_array())
+            self.fail('ValueError not raised')
+        except ValueError:
+            pass
+
+    def test_iter_scancode_json_drops_matched_text(self):
+        import json
+        test_file = os.path.join(get_temp_dir(), 'scan.json')
+        match = {'license_expression': 'mit', 'score': 100.0, 'matched_text': 'MIT text'}
+        scan = {
+            'headers': [],
+            'files': [{
+                'path': 'dir/lic.txt',
+                'license_detections': [{'license_expression': 'mit', 'matches': [dict(match)]}],
+                'license_clues': [dict(match)],
+            }],
+        }
+        with open(test_file, 'w') as out:
+            json.dump(scan, out)
+
+        expected = [{
+            'about_resource': 'dir/lic.txt',
+            'name': 'lic.txt',
+            'license_detections': [{
+                'license_expression': 'mit',
+                'matches': [{'license_expression': 'mit', 'score': 100.0}]}],
+            'license_clues': [{'license_expression': 'mit', 'score': 100.0}],
+        }]
+        assert expected == list(util.iter_scancode_json(test_file))
+        assert expected == list(util.ScancodeFiles(test_file))
+
+    def test_aggregate_scancode_files_by_package_and_directory(self):
+        packages = {
+            'pkg:pypi/foo@1.0?uuid=1': {
+                'name': 'foo', 'version': '1.0', 'purl': 'pkg:pypi/foo@1.0',
+                'datafile_paths': ['project/foo/setup.py']},
+        }
+        files = [
+            {'about_resource': 'project', 'type': 'directory'},
+            {'about_resource': 'project/foo/a.py', 'type': 'file',
+             'for_packages': ['pkg:pypi/foo@1.0?uuid=1'],
+             'detected_license_expression': 'mit',
+             'license_detections': [{'license_expression': 'mit', 'matches': [
+                 {'license_expression': 'mit', 'score': 80.0}]}],
+             'copyrights': [{'copyright': 'Copyright Foo'}]},
+            {'about_resource': 'project/foo/b.py', 'type': 'file',
+             'for_packages': ['pkg:pypi/foo@1.0?uuid=1'],
+             'detected_license_expression': 'mit OR gpl-2.0',
+             'license_detections': [{'license_expression': 'mit', 'matches': [
+                 {'license_expression': 'mit', 'score': 100.0}]}],
+             'copyrights': [{'copyright': 'Copyright Foo'}]},
+            {'about_resource': 'project/lib/bar/c.c', 'type': 'file',
+             'detected_license_expression': 'bsd-new',
+             'license_detections': [{'license_expression': 'bsd-new', 'matches': [
+                 {'license_expression': 'bsd-new', 'score': 50.0}]}]},
+            {'about_resource': 'setup.py', 'type': 'file'},
+        ]
+        expected = [
+            {'about_resource': 'project/foo', 'name': 'foo', 'version': '1.0',
+             'package_url': 'pkg:pypi/foo@1.0',
+             'detected_license_expression': 'mit AND (mit OR gpl-2.0)',
+             'license_detections': [{'license_expression': 'mit', 'matches': [
+                 {'license_expression': 'mit', 'score': 100.0}]}],
+             'copyrights': [{'copyright': 'Copyright Foo'}], 'holders': [], 'authors': []},
+            {'about_resource': 'project/lib', 'name': 'lib',
+             'detected_license_expression': 'bsd-new',
+             'license_detections': [{'license_expression': 'bsd-new', 'matches': [
+                 {'license_expression': 'bsd-new', 'score': 50.0}]}],
+             'copyrights': [], 'holders': [], 'authors': []},
+            {'about_resource': 'setup.py', 'name': 'setup.py',
+             'detected_license_expression': '', 'license_detections': [],
+             'copyrights': [], 'holders': [], 'authors': []},
+        ]
+        assert expected == util.aggregate_scancode_files(files, packages, depth=2)
+
+        result = util.aggregate_scancode_files(files, depth=1)
+        assert ['project', 'setup.py'] == [r['about_resource'] for r in result]
+        assert 'mit AND (mit OR gpl-2.0) AND bsd-new' == result[0]['detected_license_expression']
+
+    def test_load_scancode_packages(self):
+        test_file = get_test_loc('test_gen/load/scancode-packages.json')
+        packages = util.load_scancode_packages(test_file)
+        assert ['pkg:pypi/foo@1.0?uuid=1'] == list(packages)
+        assert 'foo' == packages['pkg:pypi/foo@1.0?uuid=1']['name']
+
     def test_format_about_dict_for_json_output(self):
         about = [dict([
             (u'about_file_path', u'/input/about1.ABOUT'),